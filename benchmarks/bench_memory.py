@@ -0,0 +1,48 @@
+"""
+Сравнение памяти: DataFrame с object-столбцами и список словарей
+против типизированной схемы и списка записей Transaction.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_memory 1000000
+"""
+
+import gc
+import sys
+import tracemalloc
+from typing import Any, Callable
+
+from benchmarks.synthetic import make_operations
+from src.schema import apply_schema, to_transactions
+
+
+def traced(build: Callable[[], Any]) -> tuple[Any, int]:
+    """Результат функции и объем выделенной при ее выполнении памяти (байты)"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def main(n_rows: int = 100_000) -> None:
+    df = make_operations(n_rows)
+    typed = apply_schema(df)
+
+    frame_bytes = df.memory_usage(deep=True).sum()
+    typed_bytes = typed.memory_usage(deep=True).sum()
+    records, records_bytes = traced(lambda: df.to_dict("records"))
+    del records
+    transactions, transactions_bytes = traced(lambda: to_transactions(typed))
+    del transactions
+
+    mb = 1024 * 1024
+    print(f"Строк: {n_rows}")
+    print(f"DataFrame (object):      {frame_bytes / mb:8.1f} МБ")
+    print(f"DataFrame (схема):       {typed_bytes / mb:8.1f} МБ  (x{frame_bytes / typed_bytes:.1f})")
+    print(f"Список словарей:         {records_bytes / mb:8.1f} МБ")
+    print(f"Список Transaction:      {transactions_bytes / mb:8.1f} МБ  (x{records_bytes / transactions_bytes:.1f})")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,37 @@
+"""
+Сравнение режимов сериализации ответа simple_search и записи отчета.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_serialization 200000
+"""
+
+import io
+import logging
+import sys
+import timeit
+
+from benchmarks.synthetic import make_operations
+from src.schema import apply_schema
+from src.serialization import JSON_MODES, write_report_json
+from src.services import simple_search
+from src.store import TransactionStore
+
+
+def main(n_rows: int = 100_000, repeat: int = 3) -> None:
+    logging.disable(logging.CRITICAL)
+    df = apply_schema(make_operations(n_rows))
+    store = TransactionStore(df)
+    # Словари хранилища материализуются заранее: сравнивается только сериализация
+    store.records
+
+    print(f"Строк: {n_rows}")
+    for mode in JSON_MODES:
+        seconds = min(timeit.repeat(lambda: simple_search("", store, json_mode=mode), number=1, repeat=repeat))
+        print(f"simple_search, {mode:8} {seconds * 1000:8.1f} мс")
+    for mode in JSON_MODES:
+        seconds = min(timeit.repeat(lambda: write_report_json(df, io.StringIO(), mode), number=1, repeat=repeat))
+        print(f"отчет,         {mode:8} {seconds * 1000:8.1f} мс")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
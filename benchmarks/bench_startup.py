@@ -0,0 +1,58 @@
+"""
+Время холодного запуска меню по выводу python -X importtime.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_startup
+Код возврата 1 — импорт src.main дольше STARTUP_BUDGET_MS
+или при запуске загружаются тяжелые зависимости.
+"""
+
+import subprocess
+import sys
+from typing import Dict
+
+STARTUP_BUDGET_MS = 100.0
+HEAVY_MODULES = ("pandas", "numpy", "requests", "dotenv", "openpyxl")
+
+# Модули, импортируемые при первом выборе пунктов меню
+COMMAND_MODULES = ("src.services", "src.reports", "src.views")
+
+
+def import_times(module: str) -> Dict[str, float]:
+    """Накопленное время импорта (мс) каждого модуля при импорте module в новом процессе"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines()[1:]:
+        if line.startswith("import time:"):
+            _, cumulative, name = line.split("|")
+            times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+def best_of(module: str, repeat: int) -> Dict[str, float]:
+    """Замер с наименьшим временем импорта module из repeat запусков"""
+    return min((import_times(module) for _ in range(repeat)), key=lambda times: times[module])
+
+
+def main(repeat: int = 5) -> int:
+    times = best_of("src.main", repeat)
+    startup = times["src.main"]
+    heavy = [name for name in HEAVY_MODULES if name in times]
+    print(f"import src.main: {startup:8.1f} мс (бюджет {STARTUP_BUDGET_MS:.0f} мс)")
+    for name, ms in sorted(times.items(), key=lambda item: -item[1]):
+        if name.startswith("src.") and name != "src.main":
+            print(f"    {name:30} {ms:8.1f} мс")
+    for module in COMMAND_MODULES:
+        print(f"import {module}: {best_of(module, repeat)[module]:8.1f} мс (при первом выборе пункта меню)")
+
+    if heavy:
+        print(f"При запуске загружаются: {', '.join(heavy)}")
+    if heavy or startup > STARTUP_BUDGET_MS:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
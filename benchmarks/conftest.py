@@ -0,0 +1,90 @@
+"""
+Общие данные для бенчмарков pytest-benchmark.
+
+Размеры выгрузок задаются переменной окружения BENCH_ROWS
+(через запятую из 10k, 100k, 1m, 10m; по умолчанию 10k,100k).
+Запуск с сохранением результатов и сравнением с предыдущим запуском:
+    BENCH_ROWS=10k,100k,1m python -m pytest benchmarks --benchmark-autosave \
+        --benchmark-compare --benchmark-compare-fail=mean:15%
+Результаты хранятся в .benchmarks/ с идентификатором коммита.
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import Iterator
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_operations
+from src.report_writer import ReportWriter, set_report_writer
+from src.schema import apply_schema
+from src.store import TransactionStore
+
+ROW_COUNTS = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000, "10m": 10_000_000}
+DEFAULT_ROWS = "10k,100k"
+
+
+def selected_sizes() -> list[str]:
+    """Размеры из BENCH_ROWS в порядке перечисления"""
+    sizes = [size.strip().lower() for size in os.environ.get("BENCH_ROWS", DEFAULT_ROWS).split(",") if size.strip()]
+    unknown = [size for size in sizes if size not in ROW_COUNTS]
+    if unknown:
+        raise ValueError(f"Неизвестные размеры в BENCH_ROWS: {', '.join(unknown)}")
+    return sizes
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    if "n_rows" in metafunc.fixturenames:
+        sizes = selected_sizes()
+        metafunc.parametrize("n_rows", [ROW_COUNTS[size] for size in sizes], ids=sizes, scope="session")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def quiet_logging() -> Iterator[None]:
+    """Логи INFO на каждый вызов искажают время"""
+    logging.disable(logging.CRITICAL)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def report_writer(tmp_path_factory: pytest.TempPathFactory) -> Iterator[ReportWriter]:
+    """Отчеты бенчмарков пишутся во временную директорию"""
+    writer = ReportWriter(tmp_path_factory.mktemp("reports"))
+    set_report_writer(writer)
+    yield writer
+    writer.close()
+    set_report_writer(None)
+
+
+@pytest.fixture(scope="session")
+def raw_operations(n_rows: int) -> pd.DataFrame:
+    """Синтетическая выгрузка в том виде, в каком ее читает pandas"""
+    return make_operations(n_rows)
+
+
+@pytest.fixture(scope="session")
+def operations(raw_operations: pd.DataFrame) -> pd.DataFrame:
+    """Выгрузка с типизированной схемой"""
+    return apply_schema(raw_operations)
+
+
+@pytest.fixture(scope="session")
+def store(operations: pd.DataFrame) -> TransactionStore:
+    """Хранилище с уже построенными индексами и сводными таблицами (установившийся режим)"""
+    store = TransactionStore(operations)
+    store.lowered("Описание")
+    store.lowered("Категория")
+    store.daily_rollup()
+    store.category_timeline()
+    return store
+
+
+@pytest.fixture(scope="session")
+def operations_csv(raw_operations: pd.DataFrame, n_rows: int, tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Выгрузка, записанная в CSV"""
+    path = tmp_path_factory.mktemp("operations") / f"operations_{n_rows}.csv"
+    raw_operations.to_csv(path, index=False)
+    return path
@@ -0,0 +1,128 @@
+"""
+Нагрузочный тест HTTP API (src.server).
+
+Без --url сервер запускается в этом же процессе на свободном порту
+с синтетической выгрузкой на --rows строк (или с файлом --file).
+Клиенты — потоки с постоянными соединениями (keep-alive).
+
+Запуск из корня проекта:
+    python -m benchmarks.load_test --rows 100000 --concurrency 16 --requests 4000
+    python -m benchmarks.load_test --url http://127.0.0.1:8080 --requests 10000
+"""
+
+import argparse
+import asyncio
+import http.client
+import logging
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+from urllib.parse import quote, urlsplit
+
+# Смесь запросов по умолчанию (без /events: он обращается к внешним API)
+DEFAULT_PATHS = [
+    "/search?q=" + quote("пятёрочка"),
+    "/search?q=" + quote("аптеки"),
+    "/search?q=" + quote("каршеринг"),
+    "/transfers",
+    "/spending?category=" + quote("Супермаркеты") + "&date=30.12.2021",
+    "/spending?category=" + quote("Фастфуд") + "&date=30.06.2020",
+    "/health",
+]
+
+
+def start_local_server(rows: int, file_path: Optional[str]) -> Tuple[str, asyncio.AbstractEventLoop]:
+    """Запускает ApiServer в фоновом потоке; возвращает базовый URL и цикл событий"""
+    from benchmarks.synthetic import make_operations
+    from src.schema import apply_schema
+    from src.server import ApiServer
+    from src.store import TransactionStore
+
+    store = (
+        TransactionStore.from_file(file_path) if file_path else TransactionStore(apply_schema(make_operations(rows)))
+    )
+    api = ApiServer(store)
+    api.warm_up()
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    address: List[str] = []
+
+    async def serve() -> None:
+        server = await api.serve("127.0.0.1", 0)
+        host, port = server.sockets[0].getsockname()[:2]
+        address.append(f"http://{host}:{port}")
+        started.set()
+        await server.serve_forever()
+
+    threading.Thread(target=lambda: loop.run_until_complete(serve()), daemon=True).start()
+    started.wait()
+    return address[0], loop
+
+
+def client(base_url: str, paths: List[str], count: int, offset: int, etags: bool) -> Tuple[List[float], Counter]:
+    """Выполняет count запросов по кругу через одно соединение; задержки (с) и коды ответов"""
+    url = urlsplit(base_url)
+    connection = http.client.HTTPConnection(url.hostname or "127.0.0.1", url.port or 80, timeout=60)
+    known: dict = {}
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    for i in range(count):
+        path = paths[(offset + i) % len(paths)]
+        headers = {"If-None-Match": known[path]} if etags and path in known else {}
+        start = time.perf_counter()
+        connection.request("GET", path, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        statuses[response.status] += 1
+        etag = response.getheader("ETag")
+        if etag:
+            known[path] = etag
+    connection.close()
+    return latencies, statuses
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Нагрузочный тест HTTP API")
+    parser.add_argument("--url", help="адрес запущенного сервера; без него сервер запускается локально")
+    parser.add_argument(
+        "--rows", type=int, default=100_000, help="строк синтетической выгрузки для локального сервера"
+    )
+    parser.add_argument("--file", help="выгрузка для локального сервера вместо синтетической")
+    parser.add_argument("--concurrency", type=int, default=16, help="одновременных клиентов")
+    parser.add_argument("--requests", type=int, default=2000, help="всего запросов")
+    parser.add_argument("--etags", action="store_true", help="условные запросы If-None-Match (ответы 304)")
+    args = parser.parse_args(argv)
+    logging.disable(logging.CRITICAL)
+
+    base_url = args.url or start_local_server(args.rows, args.file)[0]
+    per_client = max(1, args.requests // args.concurrency)
+    # Прогрев: первый запрос каждого вида заполняет кэш ответов сервера
+    client(base_url, DEFAULT_PATHS, len(DEFAULT_PATHS), 0, False)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(
+            executor.map(lambda i: client(base_url, DEFAULT_PATHS, per_client, i, args.etags), range(args.concurrency))
+        )
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for result in results for latency in result[0])
+    statuses: Counter = sum((result[1] for result in results), Counter())
+    print(f"Сервер: {base_url}, клиентов: {args.concurrency}, запросов: {len(latencies)}")
+    print(f"Пропускная способность: {len(latencies) / elapsed:8.0f} запросов/с")
+    print(
+        f"Задержка, мс: p50 {percentile(latencies, 0.5) * 1000:.1f}, "
+        f"p95 {percentile(latencies, 0.95) * 1000:.1f}, max {latencies[-1] * 1000:.1f}"
+    )
+    print(f"Коды ответов: {dict(sorted(statuses.items()))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Детерминированный генератор синтетических выгрузок операций
+со всеми 15 столбцами operations.xlsx. Описания — тысячи различных точек сетей
+и получателей переводов со степенным распределением частот, как в реальных выгрузках.
+
+Запись CSV из корня проекта:
+    python -m benchmarks.synthetic data/synthetic_1m.csv 1000000
+"""
+
+import sys
+from pathlib import Path
+from typing import Dict, Union
+
+import numpy as np
+import pandas as pd
+
+CARDS = ["*7197", "*4556", "*5091", "Нет данных"]
+
+# Сети и сервисы по категориям; описание операции — название с номером точки
+MERCHANTS = {
+    "Супермаркеты": ["Пятёрочка", "Магнит", "Перекрёсток", "ВкусВилл", "Лента", "Ашан", "Дикси", "SPAR"],
+    "Фастфуд": ["Вкусно и точка", "Додо Пицца", "KFC", "Burger King", "Теремок", "Шоколадница"],
+    "Каршеринг": ["Ситидрайв", "Делимобиль", "Яндекс Драйв", "BelkaCar"],
+    "Аптеки": ["Ригла", "Горздрав", "Аптека 36.6", "Столички", "Linzomat"],
+    "Пополнения": ["Пополнение через банкомат", "Пополнение через Альфа-Банк", "Пополнение через СБП"],
+}
+CATEGORIES = ["Супермаркеты", "Переводы", "Фастфуд", "Каршеринг", "Аптеки", "Пополнения"]
+
+# Переводы физическим лицам: «Фамилия И.» (формат PHYSICAL_PERSON_PATTERN)
+SURNAMES = [
+    "Иванов", "Петров", "Сидоров", "Смирнов", "Кузнецов", "Попов", "Васильев", "Соколов", "Михайлов", "Новиков",
+    "Федоров", "Морозов", "Волков", "Алексеев", "Лебедев", "Семенов", "Егоров", "Павлов", "Козлов", "Степанов",
+    "Николаев", "Орлов", "Андреев", "Макаров", "Никитин", "Захаров", "Зайцев", "Соловьев", "Борисов", "Яковлев",
+    "Григорьев", "Романов", "Воробьев", "Сергеев", "Кузьмин", "Фролов", "Александров", "Дмитриев", "Королев",
+    "Гусев", "Киселев", "Ильин", "Максимов", "Поляков", "Сорокин", "Виноградов", "Ковалев", "Белов",
+]  # fmt: skip
+INITIALS = "АБВГДЕЖЗИКЛМНОПРСТУФХЦЧШЭЮЯ"
+TRANSFER_DESCRIPTION = "Перевод с карты"
+
+# Размер пулов описаний (различных строк) в выгрузке
+MERCHANT_COUNT = 5000
+PERSON_COUNT = 2000
+
+# Показатель степенного распределения популярности описаний: немногие точки
+# и получатели встречаются часто, большинство — редко
+POPULARITY_EXPONENT = 1.1
+
+# Операции равномерно распределены по четырем годам начиная с START_DATE
+START_DATE = pd.Timestamp("2018-01-01")
+PERIOD_SECONDS = 4 * 365 * 86400
+
+
+def _popularity(size: int) -> np.ndarray:
+    """Вероятности элементов пула по рангу: p ~ 1 / rank ** POPULARITY_EXPONENT"""
+    weights = 1.0 / np.arange(1, size + 1) ** POPULARITY_EXPONENT
+    return np.asarray(weights / weights.sum())
+
+
+def make_description_pools(rng: np.random.Generator) -> Dict[str, np.ndarray]:
+    """
+    Пулы различных описаний по категориям: MERCHANT_COUNT точек сетей
+    («Пятёрочка 1234») и PERSON_COUNT получателей переводов («Иванова А.»)
+    """
+    merchant_categories = list(MERCHANTS)
+    per_category = MERCHANT_COUNT // len(merchant_categories)
+    pools: Dict[str, np.ndarray] = {}
+    for category in merchant_categories:
+        chains = np.asarray(MERCHANTS[category], dtype=object)
+        branches = rng.choice(9000, per_category, replace=False) + 1000
+        # Точки более популярных сетей идут в пуле раньше и встречаются чаще
+        chain_ids = np.sort(rng.choice(len(chains), per_category, p=_popularity(len(chains))))
+        pools[category] = np.asarray(chains[chain_ids] + " " + branches.astype(str), dtype=object)
+
+    surnames = SURNAMES + [surname + "а" for surname in SURNAMES]
+    people = np.asarray([f"{surname} {initial}." for surname in surnames for initial in INITIALS], dtype=object)
+    persons = people[rng.choice(len(people), min(PERSON_COUNT, len(people)), replace=False)]
+    pools["Переводы"] = np.concatenate([[TRANSFER_DESCRIPTION], persons])
+    return pools
+
+
+def make_operations(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Синтетическая выгрузка: одинаковые n_rows и seed дают одинаковые данные"""
+    rng = np.random.default_rng(seed)
+    pools = make_description_pools(rng)
+    categories = rng.choice(CATEGORIES, n_rows)
+    descriptions = np.empty(n_rows, dtype=object)
+    for category, pool in pools.items():
+        positions = np.flatnonzero(categories == category)
+        descriptions[positions] = pool[rng.choice(len(pool), len(positions), p=_popularity(len(pool)))]
+
+    amounts = rng.uniform(-5000, 5000, n_rows).round(2)
+    dates = START_DATE + pd.to_timedelta(rng.integers(0, PERIOD_SECONDS, n_rows), unit="s")
+    date_strings = dates.strftime("%d.%m.%Y %H:%M:%S")
+    return pd.DataFrame(
+        {
+            "Дата операции": date_strings,
+            "Дата платежа": dates.strftime("%d.%m.%Y"),
+            "Номер карты": rng.choice(CARDS, n_rows),
+            "Статус": rng.choice(["OK", "FAILED"], n_rows, p=[0.98, 0.02]),
+            "Сумма операции": amounts,
+            "Валюта операции": rng.choice(["RUB", "USD", "EUR"], n_rows, p=[0.96, 0.02, 0.02]),
+            "Сумма платежа": amounts,
+            "Валюта платежа": "RUB",
+            "Кэшбэк": 0.0,
+            "Категория": categories,
+            "MCC": rng.choice([5411.0, 5814.0, 7512.0, 0.0], n_rows),
+            "Описание": descriptions,
+            "Бонусы (включая кэшбэк)": rng.integers(0, 100, n_rows),
+            "Округление на инвесткопилку": 0,
+            "Сумма операции с округлением": np.abs(amounts),
+        }
+    )
+
+
+def write_operations_csv(path: Union[str, Path], n_rows: int, seed: int = 0) -> Path:
+    """Записывает синтетическую выгрузку в CSV (формат iter_operation_chunks)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    make_operations(n_rows, seed).to_csv(path, index=False)
+    return path
+
+
+if __name__ == "__main__":
+    write_operations_csv(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 100_000)
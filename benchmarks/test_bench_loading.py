@@ -0,0 +1,38 @@
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import pytest
+
+from src.df_reader import iter_operation_chunks
+from src.schema import apply_schema
+from src.store import TransactionStore
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.mark.benchmark(group="loading")
+def test_read_csv_chunks(benchmark: Any, operations_csv: Path) -> None:
+    def load() -> pd.DataFrame:
+        return pd.concat(iter_operation_chunks(str(operations_csv)), ignore_index=True)
+
+    df = benchmark(load)
+    assert len(df) == len(pd.read_csv(operations_csv, usecols=[0]))
+
+
+@pytest.mark.benchmark(group="loading")
+def test_apply_schema(benchmark: Any, raw_operations: pd.DataFrame) -> None:
+    typed = benchmark(apply_schema, raw_operations)
+    assert len(typed) == len(raw_operations)
+
+
+@pytest.mark.benchmark(group="loading")
+def test_build_store(benchmark: Any, operations: pd.DataFrame) -> None:
+    # Разбор дат и построение сводной таблицы по дням — первое обращение к хранилищу
+    def build() -> TransactionStore:
+        store = TransactionStore(operations)
+        store.daily_rollup()
+        return store
+
+    store = benchmark(build)
+    assert len(store) == len(operations)
@@ -0,0 +1,15 @@
+from typing import Any
+
+import pytest
+
+from src.reports import spending_by_category
+from src.store import TransactionStore
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.mark.benchmark(group="reports")
+@pytest.mark.parametrize("category", ["Супермаркеты", "апт"], ids=["exact", "partial"])
+def test_spending_by_category(benchmark: Any, store: TransactionStore, category: str) -> None:
+    result = benchmark(spending_by_category, store, category, "15.06.2020")
+    assert not result.empty
@@ -0,0 +1,29 @@
+import json
+from typing import Any
+
+import pytest
+
+from src.services import search_physical_person_transfers, simple_search
+from src.store import TransactionStore
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.mark.benchmark(group="search")
+@pytest.mark.parametrize("query", ["пятёрочка", "каршеринг", "нет такого"], ids=["frequent", "category", "missing"])
+def test_simple_search(benchmark: Any, store: TransactionStore, query: str) -> None:
+    result = benchmark(simple_search, query, store, json_mode="compact")
+    assert isinstance(json.loads(result), list)
+
+
+@pytest.mark.benchmark(group="search")
+def test_simple_search_index(benchmark: Any, store: TransactionStore) -> None:
+    store.search_index()
+    result = benchmark(simple_search, "пятёрочка", store, use_index=True, json_mode="compact")
+    assert len(json.loads(result)) > 0
+
+
+@pytest.mark.benchmark(group="transfers")
+def test_physical_person_transfers(benchmark: Any, store: TransactionStore) -> None:
+    result = benchmark(search_physical_person_transfers, store, json_mode="compact")
+    assert json.loads(result)["Итого"] > 0
@@ -0,0 +1,32 @@
+from typing import Any, Callable
+
+import pytest
+
+from src.store import TransactionStore
+from src.utils import filter_by_range, get_expenses_summary, get_incomes_summary, get_range_summaries
+
+pytest.importorskip("pytest_benchmark")
+
+DATE = "18.06.2020"
+
+
+@pytest.mark.benchmark(group="range")
+@pytest.mark.parametrize("range_type", ["W", "M", "Y", "ALL"])
+def test_filter_by_range(benchmark: Any, store: TransactionStore, range_type: str) -> None:
+    result = benchmark(filter_by_range, store, DATE, range_type)
+    assert not result.empty
+
+
+@pytest.mark.benchmark(group="summaries")
+@pytest.mark.parametrize("summary", [get_expenses_summary, get_incomes_summary], ids=["expenses", "incomes"])
+def test_summary(benchmark: Any, store: TransactionStore, summary: Callable) -> None:
+    month = filter_by_range(store, DATE, "M")
+    result = benchmark(summary, month)
+    assert next(iter(result.values()))["Общая сумма"] > 0
+
+
+@pytest.mark.benchmark(group="summaries")
+@pytest.mark.parametrize("range_type", ["M", "ALL"])
+def test_range_summaries(benchmark: Any, store: TransactionStore, range_type: str) -> None:
+    expenses, incomes = benchmark(get_range_summaries, store, DATE, range_type)
+    assert expenses["expenses"]["Общая сумма"] > 0 and incomes["incomes"]["Общая сумма"] > 0
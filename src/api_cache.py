@@ -0,0 +1,108 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent / "data" / ".cache" / "api_cache.sqlite"
+
+# Время жизни записей за текущий день и текущих цен (секунды)
+SHORT_TTL = 15 * 60
+
+
+class ApiCache:
+    """
+    Постоянный кэш ответов внешних API в SQLite.
+
+    Ключ — (endpoint, date, symbol). Данные за прошедшие даты не меняются
+    и хранятся бессрочно (ttl=None), для текущего дня задается короткий TTL.
+    Счетчики попаданий и промахов доступны через stats().
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_CACHE_PATH) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._connection:
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS api_cache (
+                    endpoint TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    symbol TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    expires_at REAL,
+                    PRIMARY KEY (endpoint, date, symbol)
+                )
+                """)
+
+    def get(self, endpoint: str, date: str, symbol: str) -> Optional[Any]:
+        """Значение из кэша или None, если записи нет или она устарела"""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, expires_at FROM api_cache WHERE endpoint = ? AND date = ? AND symbol = ?",
+                (endpoint, date, symbol),
+            ).fetchone()
+            if row is not None and (row[1] is None or row[1] > time.time()):
+                self.hits += 1
+                return json.loads(row[0])
+            self.misses += 1
+            return None
+
+    def set(self, endpoint: str, date: str, symbol: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Сохраняет значение; ttl=None — хранить бессрочно"""
+        expires_at = None if ttl is None else time.time() + ttl
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO api_cache (endpoint, date, symbol, value, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (endpoint, date, symbol, json.dumps(value), expires_at),
+            )
+
+    def clear(self) -> None:
+        """Удаляет все записи и обнуляет счетчики"""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM api_cache")
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Счетчики попаданий и промахов"""
+        return {"hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        """Закрывает соединение с базой"""
+        with self._lock:
+            self._connection.close()
+
+
+_cache: Optional[ApiCache] = None
+_cache_enabled = True
+_cache_lock = threading.Lock()
+
+
+def get_api_cache() -> Optional[ApiCache]:
+    """Общий кэш процесса (None, если кэш отключен или недоступен)"""
+    global _cache, _cache_enabled
+    if _cache is None and _cache_enabled:
+        with _cache_lock:
+            if _cache is None and _cache_enabled:
+                try:
+                    _cache = ApiCache()
+                except Exception as e:
+                    logger.warning(f"Кэш API недоступен: {e}")
+                    _cache_enabled = False
+    return _cache
+
+
+def set_api_cache(cache: Optional[ApiCache]) -> None:
+    """Подменяет общий кэш; None отключает кэширование"""
+    global _cache, _cache_enabled
+    with _cache_lock:
+        _cache = cache
+        _cache_enabled = cache is not None
@@ -0,0 +1,197 @@
+"""
+Пакетный режим без интерактивного меню: данные загружаются один раз,
+запросы читаются из аргументов, файла или stdin, результаты выводятся
+в stdout в формате JSON Lines (строка на запрос).
+
+Запуск из корня проекта:
+    python -m src.cli search Пятёрочка Аптеки
+    python -m src.cli search --input queries.txt > results.jsonl
+    printf 'Супермаркеты\t30.12.2021\n' | python -m src.cli spending
+    python -m src.cli events --input dates.txt
+    python -m src.cli transfers
+    python -m src.cli --db data/operations.sqlite search Аптеки   (база, пополняемая src.ingest)
+
+Строка запроса — значения через табуляцию или JSON-объект:
+    search     query
+    spending   category[\tdate]          (дата ДД.ММ.ГГГГ, по умолчанию текущая)
+    events     date[\trange]             (диапазон W/M/Y/ALL, по умолчанию M)
+"""
+
+import argparse
+import json
+import logging
+import sys
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from src.config import configure
+from src.operations_db import load_store
+from src.serialization import COMPACT, ORJSON, dumps
+from src.store import TransactionStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FILE_PATH = Path(__file__).parent.parent / "data" / "operations.xlsx"
+
+# Поля строки запроса каждой команды (обязательное — первое)
+COMMAND_FIELDS = {
+    "search": ("query",),
+    "transfers": (),
+    "spending": ("category", "date"),
+    "events": ("date", "range"),
+}
+
+Handler = Callable[[TransactionStore, Dict[str, str], str], str]
+
+
+def parse_request(line: str, fields: Iterable[str]) -> Dict[str, str]:
+    """
+    Разбирает строку запроса: JSON-объект или значения через табуляцию
+    в порядке fields. Пустые значения не включаются.
+    """
+    fields = tuple(fields)
+    if line.lstrip().startswith("{"):
+        data = json.loads(line)
+        if not isinstance(data, dict):
+            raise ValueError("Запрос должен быть JSON-объектом")
+        request = {field: str(data[field]) for field in fields if data.get(field) not in (None, "")}
+    else:
+        values = line.split("\t")
+        request = {field: value.strip() for field, value in zip(fields, values) if value.strip()}
+    if fields and fields[0] not in request:
+        raise ValueError(f"Не указано поле {fields[0]}")
+    return request
+
+
+def read_requests(queries: List[str], input_file: Optional[TextIO]) -> Iterator[str]:
+    """Строки запросов: аргументы командной строки, затем файл (пустые строки пропускаются)"""
+    yield from queries
+    if input_file is not None:
+        for line in input_file:
+            line = line.rstrip("\r\n")
+            if line.strip():
+                yield line
+
+
+def _search(store: TransactionStore, request: Dict[str, str], json_mode: str) -> str:
+    from src.services import simple_search
+
+    # Индекс n-грамм строится один раз и ускоряет все последующие запросы
+    return simple_search(request["query"], store, use_index=True, json_mode=json_mode)
+
+
+def _transfers(store: TransactionStore, request: Dict[str, str], json_mode: str) -> str:
+    from src.services import search_physical_person_transfers
+
+    return search_physical_person_transfers(store, json_mode=json_mode)
+
+
+def _spending(store: TransactionStore, request: Dict[str, str], json_mode: str) -> str:
+    from src.reports import spending_by_category
+
+    report = spending_by_category(store, request["category"], request.get("date"), save_report=False)
+    return str(report.to_json(orient="records", force_ascii=False, date_format="iso"))
+
+
+def _events(store: TransactionStore, request: Dict[str, str], json_mode: str) -> str:
+    from src.views import get_events
+
+    return get_events(request["date"], request.get("range", "M").upper(), store=store, json_mode=json_mode)
+
+
+HANDLERS: Dict[str, Handler] = {
+    "search": _search,
+    "transfers": _transfers,
+    "spending": _spending,
+    "events": _events,
+}
+
+
+def _result_error(result: str) -> Optional[str]:
+    """Сообщение об ошибке, если команда вернула JSON {"error": ...} вместо исключения"""
+    if not result.lstrip().startswith('{"error"'):
+        return None
+    data = json.loads(result)
+    return str(data["error"]) if isinstance(data, dict) and "error" in data else None
+
+
+def run_batch(
+    command: str, store: TransactionStore, lines: Iterable[str], out: TextIO, json_mode: str = ORJSON
+) -> int:
+    """
+    Выполняет запросы команды и пишет строку JSON Lines на каждый:
+    {"input": {...}, "result": ...} или {"input": ..., "error": "..."}.
+    Ошибка в одном запросе не прерывает остальные. Возвращает число ошибок.
+    """
+    handler = HANDLERS[command]
+    fields = COMMAND_FIELDS[command]
+    errors = 0
+    for line in lines:
+        try:
+            request = parse_request(line, fields)
+        except ValueError as e:
+            errors += 1
+            out.write(dumps({"input": line, "error": str(e)}, json_mode) + "\n")
+            continue
+        try:
+            # Печать внутри команд (например, spending_by_category) не должна попасть в поток JSON Lines
+            with redirect_stdout(sys.stderr):
+                result = handler(store, request, json_mode)
+            error = _result_error(result)
+            if error is not None:
+                raise RuntimeError(error)
+            # Ответ команды уже сериализован — вставляется в строку без повторного разбора
+            out.write('{"input":' + dumps(request, json_mode) + ',"result":' + result + "}\n")
+        except Exception as e:
+            errors += 1
+            logger.error(f"Ошибка запроса {request}: {e}")
+            out.write(dumps({"input": request, "error": str(e)}, json_mode) + "\n")
+    out.flush()
+    return errors
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Пакетная обработка запросов к выгрузке операций (вывод JSON Lines)")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--file", default=str(DEFAULT_FILE_PATH), help="выгрузка операций (xlsx)")
+    source.add_argument("--db", help="база операций SQLite (src.ingest) вместо файла выгрузки")
+    parser.add_argument(
+        "--json-mode", choices=(COMPACT, ORJSON), default=ORJSON, help="режим сериализации результатов"
+    )
+    parser.add_argument("--quiet", action="store_true", help="выводить в лог только ошибки")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for command in ("search", "spending", "events"):
+        subparser = subparsers.add_parser(command, help=f"запросы {command}: " + ", ".join(COMMAND_FIELDS[command]))
+        subparser.add_argument("queries", nargs="*", help="строки запросов")
+        subparser.add_argument(
+            "-i", "--input", help="файл со строками запросов ('-' — stdin; по умолчанию stdin, если нет аргументов)"
+        )
+    subparsers.add_parser("transfers", help="переводы физическим лицам")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    configure(logging.ERROR if args.quiet else logging.INFO)
+
+    # База операций (пополняется src.ingest) или файл выгрузки
+    store = load_store(args.db) if args.db else TransactionStore.from_file(args.file)
+    if args.command == "transfers":
+        return 1 if run_batch("transfers", store, [""], sys.stdout, args.json_mode) else 0
+
+    input_path = args.input if args.input is not None else (None if args.queries else "-")
+    if input_path is None:
+        errors = run_batch(args.command, store, args.queries, sys.stdout, args.json_mode)
+    elif input_path == "-":
+        errors = run_batch(args.command, store, read_requests(args.queries, sys.stdin), sys.stdout, args.json_mode)
+    else:
+        with open(input_path, encoding="utf-8") as f:
+            errors = run_batch(args.command, store, read_requests(args.queries, f), sys.stdout, args.json_mode)
+    if errors:
+        logger.error(f"Запросов с ошибками: {errors}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
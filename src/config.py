@@ -0,0 +1,45 @@
+import logging
+import os
+import threading
+from typing import Optional
+
+LOG_LEVEL = logging.INFO
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+_env_loaded = False
+_configured = False
+_lock = threading.Lock()
+
+
+def load_env() -> None:
+    """Загружает переменные из .env-файла (один раз за процесс)"""
+    global _env_loaded
+    if _env_loaded:
+        return
+    with _lock:
+        if not _env_loaded:
+            from dotenv import load_dotenv
+
+            load_dotenv()
+            _env_loaded = True
+
+
+def get_env(name: str) -> Optional[str]:
+    """Значение переменной окружения с учетом .env-файла"""
+    load_env()
+    return os.getenv(name)
+
+
+def configure(level: int = LOG_LEVEL) -> None:
+    """
+    Настройка процесса для точек входа (меню, CLI, запуск модулей):
+    логирование и переменные из .env. Повторные вызовы ничего не меняют.
+    Модули пакета при импорте ничего не настраивают.
+    """
+    global _configured
+    with _lock:
+        if _configured:
+            return
+        logging.basicConfig(level=level, format=LOG_FORMAT)
+        _configured = True
+    load_env()
@@ -0,0 +1,175 @@
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Поддерживаемые форматы: ДД.ММ.ГГГГ, ДД-ММ-ГГГГ, ДД/ММ/ГГГГ, ГГГГ-ММ-ДД, ГГГГ/ММ/ДД
+# и необязательное время ЧЧ:ММ или ЧЧ:ММ:СС через пробел или «T»
+_DATE_RE = re.compile(
+    r"^(?:(?P<day>\d{1,2})(?P<sep>[.\-/])(?P<month>\d{1,2})(?P=sep)(?P<year>\d{4})"
+    r"|(?P<iso_year>\d{4})(?P<iso_sep>[-/])(?P<iso_month>\d{1,2})(?P=iso_sep)(?P<iso_day>\d{1,2}))"
+    r"(?:(?P<time_sep>[ T])(?P<hour>\d{1,2}):(?P<minute>\d{2})(?::(?P<second>\d{2}))?)?$"
+)
+
+PARSE_CACHE_SIZE = 4096
+
+# Поля с фиксированной шириной для векторного разбора: директива -> (компонент, ширина)
+_FIXED_FIELDS = {
+    "%d": ("day", 2),
+    "%m": ("month", 2),
+    "%Y": ("year", 4),
+    "%H": ("hour", 2),
+    "%M": ("minute", 2),
+    "%S": ("second", 2),
+}
+
+
+def _fallback_parse(date_str: str) -> pd.Timestamp:
+    """
+    Разбор произвольной строки pandas: dayfirst определяется по положению года.
+    """
+    # YYYY-MM-DD или YYYY/MM/DD (дефис или слэш на позиции 4)
+    if ("-" in date_str and date_str.index("-") == 4) or ("/" in date_str and date_str.index("/") == 4):
+        return pd.to_datetime(date_str, dayfirst=False)
+    # Всё остальное — dayfirst: ДД.ММ.ГГГГ, ДД-ММ-ГГГГ, ДД/ММ/ГГГГ и т.п.
+    return pd.to_datetime(date_str, dayfirst=True)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_date(date_str: str) -> pd.Timestamp:
+    """
+    Разбор даты пользователя с запоминанием результата.
+    Поддерживаемые форматы разбираются напрямую, без определения формата pandas;
+    остальные строки передаются pandas с dayfirst (кроме ГГГГ-ММ-ДД).
+    """
+    match = _DATE_RE.match(date_str.strip())
+    if match is not None:
+        parts = match.groupdict()
+        if parts["year"] is not None:
+            year, month, day = parts["year"], parts["month"], parts["day"]
+        else:
+            year, month, day = parts["iso_year"], parts["iso_month"], parts["iso_day"]
+        try:
+            return pd.Timestamp(
+                datetime(
+                    int(year),
+                    int(month),
+                    int(day),
+                    int(parts["hour"] or 0),
+                    int(parts["minute"] or 0),
+                    int(parts["second"] or 0),
+                )
+            )
+        except ValueError:
+            # Несуществующая дата — сообщение об ошибке сформирует pandas
+            pass
+    return _fallback_parse(date_str)
+
+
+def infer_date_format(date_str: str) -> Optional[str]:
+    """Явный формат strftime для строки поддерживаемого вида или None"""
+    match = _DATE_RE.match(date_str.strip())
+    if match is None:
+        return None
+    parts = match.groupdict()
+    if parts["year"] is not None:
+        sep = parts["sep"]
+        fmt = f"%d{sep}%m{sep}%Y"
+    else:
+        sep = parts["iso_sep"]
+        fmt = f"%Y{sep}%m{sep}%d"
+    if parts["hour"] is not None:
+        fmt += f"{parts['time_sep']}%H:%M"
+        if parts["second"] is not None:
+            fmt += ":%S"
+    return fmt
+
+
+def _fixed_width_layout(date_format: str) -> Optional[Tuple[int, List[Tuple[str, int, int]], List[Tuple[int, str]]]]:
+    """
+    Разметка формата из полей фиксированной ширины: длина строки,
+    позиции полей и позиции разделителей. None — если формат не такой.
+    """
+    fields: List[Tuple[str, int, int]] = []
+    literals: List[Tuple[int, str]] = []
+    position = 0
+    i = 0
+    while i < len(date_format):
+        end = i + 2
+        directive = date_format[i:end] if date_format[i] == "%" else None
+        if directive is not None:
+            if directive not in _FIXED_FIELDS:
+                return None
+            name, width = _FIXED_FIELDS[directive]
+            fields.append((name, position, width))
+            position += width
+            i += 2
+        else:
+            literals.append((position, date_format[i]))
+            position += 1
+            i += 1
+    return position, fields, literals
+
+
+def _parse_fixed_width(column: pd.Series, date_format: str) -> Optional[pd.Series]:
+    """
+    Векторный разбор строк одинаковой длины с нулями впереди (например, «05.01.2018 09:03:00»):
+    цифры извлекаются из массива кодов символов без построчного strptime.
+    None — если столбец не подходит под формат (пропуски, другая длина, лишние символы).
+    """
+    layout = _fixed_width_layout(date_format)
+    if layout is None or len(column) == 0 or column.dtype != object or column.isna().any():
+        return None
+    length, fields, literals = layout
+    try:
+        values = np.asarray(column.to_numpy(), dtype=f"U{length + 1}")
+    except (TypeError, ValueError):
+        return None
+    if not (np.char.str_len(values) == length).all():
+        return None
+
+    codes = values.view(np.uint32).reshape(len(values), length + 1)[:, :length].astype(np.int64)
+    for position, char in literals:
+        if not (codes[:, position] == ord(char)).all():
+            return None
+    digits = codes - ord("0")
+    components = {}
+    for name, start, width in fields:
+        end = start + width
+        field = digits[:, start:end]
+        if ((field < 0) | (field > 9)).any():
+            return None
+        components[name] = field @ (10 ** np.arange(width - 1, -1, -1))
+    try:
+        parsed = pd.to_datetime(pd.DataFrame(components))
+    except ValueError:
+        # Несуществующие даты — разбор и сообщение об ошибке остаются за pandas
+        return None
+    parsed.index = column.index
+    parsed.name = column.name
+    return parsed
+
+
+def parse_date_column(column: pd.Series, date_format: Optional[str] = None) -> pd.Series:
+    """
+    Векторный разбор столбца дат.
+    Пробуется формат date_format, затем формат, определенный по первому непустому значению;
+    строки фиксированной ширины разбираются без strptime. Если ни один формат
+    не подходит всем строкам, столбец разбирается pandas с dayfirst.
+    """
+    valid = np.flatnonzero(column.notna().to_numpy())
+    first = column.iloc[valid[0]] if len(valid) else None
+    inferred = infer_date_format(first) if isinstance(first, str) else None
+
+    for fmt in dict.fromkeys(f for f in (date_format, inferred) if f is not None):
+        parsed = _parse_fixed_width(column, fmt)
+        if parsed is not None:
+            return parsed
+        try:
+            return pd.to_datetime(column, format=fmt)
+        except (ValueError, TypeError):
+            continue
+    return pd.to_datetime(column, dayfirst=True)
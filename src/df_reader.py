@@ -1,5 +1,111 @@
+import hashlib
+import logging
+import os
+import pickle
+from typing import Iterator, Optional
+
+import numpy as np
+import openpyxl
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
+# Версия формата кэша: при изменении структуры кэш пересобирается
+CACHE_VERSION = 1
+CACHE_DIR_NAME = ".cache"
+
+# Значения для заполнения пропусков в выгрузке
+FILL_VALUES = {"Номер карты": "Нет данных", "Кэшбэк": 0, "MCC": 0}
+
+# Типы числовых столбцов — как их определяет pandas.read_excel для полной выгрузки
+FLOAT_COLUMNS = ("Сумма операции", "Сумма платежа", "Кэшбэк", "MCC", "Сумма операции с округлением")
+INT_COLUMNS = ("Бонусы (включая кэшбэк)", "Округление на инвесткопилку")
+
+# Размер части при потоковом чтении (строк)
+CHUNK_SIZE = 50_000
+
+
+def _cache_path(file_path: str, cache_dir: Optional[str] = None) -> str:
+    """
+    Возвращает путь к файлу кэша для исходного Excel-файла
+    """
+    abs_path = os.path.abspath(file_path)
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(abs_path), CACHE_DIR_NAME)
+    digest = hashlib.sha1(abs_path.encode("utf-8")).hexdigest()[:16]
+    name = os.path.splitext(os.path.basename(abs_path))[0]
+    return os.path.join(cache_dir, f"{name}.{digest}.pkl")
+
+
+def file_version(file_path: str) -> tuple:
+    """
+    Версия исходного файла: абсолютный путь, размер и время изменения
+    """
+    stat = os.stat(file_path)
+    return os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns
+
+
+def _read_cache(cache_path: str, key: tuple) -> Optional[pd.DataFrame]:
+    """
+    Читает кэш, если он существует и соответствует исходному файлу
+    """
+    try:
+        with open(cache_path, "rb") as f:
+            payload = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Не удалось прочитать кэш {cache_path}: {e}")
+        return None
+
+    if payload.get("version") != CACHE_VERSION or tuple(payload.get("key", ())) != key:
+        return None
+    df: pd.DataFrame = payload["data"]
+    return df
+
+
+def _write_cache(cache_path: str, key: tuple, df: pd.DataFrame) -> None:
+    """
+    Атомарно записывает кэш: сначала во временный файл, затем переименовывает
+    """
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"version": CACHE_VERSION, "key": key, "data": df}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+        logger.info(f"Кэш сохранен: {cache_path}")
+    except Exception as e:
+        logger.warning(f"Не удалось сохранить кэш {cache_path}: {e}")
+
+
+def read_operations(file_path: str, use_cache: bool = True, cache_dir: Optional[str] = None) -> pd.DataFrame:
+    """
+    Загружает Excel-файл с операциями через бинарный кэш.
+
+    Кэш хранит DataFrame с уже определенными типами столбцов и привязан
+    к пути, размеру и времени изменения файла: при изменении исходного
+    файла кэш пересобирается. Ошибки чтения исходного файла пробрасываются.
+    """
+    try:
+        key = file_version(file_path)
+    except OSError:
+        # Файл недоступен для stat — читаем напрямую, ошибка придет из read_excel
+        return pd.read_excel(file_path)
+
+    if not use_cache:
+        return pd.read_excel(file_path)
+
+    cache_path = _cache_path(file_path, cache_dir)
+    df = _read_cache(cache_path, key)
+    if df is not None:
+        logger.info(f"Данные загружены из кэша: {cache_path}")
+        return df
+
+    df = pd.read_excel(file_path)
+    _write_cache(cache_path, key, df)
+    return df
+
 
 def load_and_convert_excel_to_dict(file_path: str) -> list[dict]:
     """
@@ -8,10 +114,10 @@ def load_and_convert_excel_to_dict(file_path: str) -> list[dict]:
 
     """
     try:
-        # Читаем Excel файл
-        df = pd.read_excel(file_path)
+        # Читаем Excel файл (через кэш)
+        df = read_operations(file_path)
         # Обрабатываем пропущенные значения
-        df = df.fillna({"Номер карты": "Нет данных", "Кэшбэк": 0, "MCC": 0})
+        df = df.fillna(FILL_VALUES)
 
         # Преобразуем в список словарей
         result = df.to_dict("records")
@@ -24,3 +130,75 @@ def load_and_convert_excel_to_dict(file_path: str) -> list[dict]:
     except Exception as e:
         print(f"Произошла ошибка: {str(e)}")
         return []
+
+
+def _normalize_chunk(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Приводит типы числовых столбцов части выгрузки к типам полной выгрузки
+    и заполняет пропуски
+    """
+    for column in FLOAT_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], errors="coerce").astype("float64")
+    for column in INT_COLUMNS:
+        if column in df.columns and df[column].notna().all():
+            df[column] = pd.to_numeric(df[column]).astype("int64")
+    # Пустые ячейки openpyxl возвращает как None, pandas.read_excel — как NaN
+    for column in df.columns[df.dtypes == object]:
+        df[column] = df[column].where(df[column].notna(), np.nan)
+    return df.fillna(FILL_VALUES)
+
+
+def _iter_excel_rows(file_path: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Читает Excel-файл в режиме read-only, не загружая лист целиком"""
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheet = workbook.active
+        if sheet is None or not hasattr(sheet, "iter_rows"):
+            return
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        buffer: list = []
+        offset = 0
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            buffer.append(row)
+            if len(buffer) == chunk_size:
+                yield pd.DataFrame(buffer, columns=header, index=pd.RangeIndex(offset, offset + len(buffer)))
+                offset += len(buffer)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame(buffer, columns=header, index=pd.RangeIndex(offset, offset + len(buffer)))
+    finally:
+        workbook.close()
+
+
+def iter_operation_chunks(file_path: str, chunk_size: int = CHUNK_SIZE, sep: str = ",") -> Iterator[pd.DataFrame]:
+    """
+    Потоково читает выгрузку операций частями по chunk_size строк.
+
+    Excel-файл читается openpyxl в режиме read-only, CSV — pandas.read_csv
+    с chunksize, поэтому в памяти одновременно находится только одна часть.
+    Типы столбцов и заполнение пропусков совпадают с load_and_convert_excel_to_dict.
+    """
+    if chunk_size <= 0:
+        raise ValueError("Размер части должен быть положительным")
+
+    if file_path.lower().endswith(".csv"):
+        chunks: Iterator[pd.DataFrame] = pd.read_csv(file_path, chunksize=chunk_size, sep=sep)
+    else:
+        chunks = _iter_excel_rows(file_path, chunk_size)
+
+    for chunk in chunks:
+        yield _normalize_chunk(chunk)
+
+
+def iter_transactions(file_path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[list[dict]]:
+    """
+    Потоково читает выгрузку и возвращает транзакции списками словарей по chunk_size штук
+    """
+    for chunk in iter_operation_chunks(file_path, chunk_size):
+        yield chunk.to_dict("records")
@@ -0,0 +1,118 @@
+import logging
+import threading
+from types import TracebackType
+from typing import Any, Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import ConnectionPool
+from urllib3.exceptions import InvalidHeader, MaxRetryError, ResponseError
+from urllib3.response import BaseHTTPResponse
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Таймауты (секунды): на установку соединения и на чтение ответа
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10.0
+DEFAULT_TIMEOUT = (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+# Размер пула keep-alive соединений на один хост
+POOL_SIZE = 10
+
+# Повторы с экспоненциальной задержкой: backoff_factor * 2 ** (номер попытки - 1)
+RETRY_TOTAL = 3
+BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Наибольшая задержка из заголовка Retry-After (секунды), которую стоит выждать;
+# если сервер просит ждать дольше, запрос не повторяется (квота API не тратится впустую,
+# а ответ «Событий» все равно ограничен сроком EVENTS_TIMEOUT)
+RETRY_AFTER_LIMIT = 5.0
+
+
+class LimitedRetry(Retry):
+    """
+    Повторы с учетом Retry-After: задержка из заголовка выдерживается,
+    но если она больше RETRY_AFTER_LIMIT, повтора нет и возвращается ответ сервера
+    """
+
+    def increment(
+        self,
+        method: Optional[str] = None,
+        url: Optional[str] = None,
+        response: Optional[BaseHTTPResponse] = None,
+        error: Optional[Exception] = None,
+        _pool: Optional[ConnectionPool] = None,
+        _stacktrace: Optional[TracebackType] = None,
+    ) -> "LimitedRetry":
+        if response is not None and self.respect_retry_after_header:
+            try:
+                retry_after = self.get_retry_after(response)
+            except InvalidHeader:
+                retry_after = None
+            if retry_after is not None and retry_after > RETRY_AFTER_LIMIT:
+                logger.warning(f"Сервер просит повторить запрос через {retry_after:.0f} с, повтора не будет: {url}")
+                # При raise_on_status=False пул соединений вернет этот ответ
+                reason = ResponseError(f"Retry-After {retry_after:.0f} с")
+                raise MaxRetryError(_pool, url or "", reason)  # type: ignore[arg-type]
+        return super().increment(method, url, response, error, _pool, _stacktrace)
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def create_session(
+    pool_size: int = POOL_SIZE, retries: int = RETRY_TOTAL, backoff_factor: float = BACKOFF_FACTOR
+) -> requests.Session:
+    """
+    Создает сессию с пулом соединений и повторами запросов при 429/5xx
+    и ошибках соединения. Зависший ответ не повторяется — срабатывает таймаут чтения.
+    Задержка из заголовка Retry-After выдерживается, если она не больше
+    RETRY_AFTER_LIMIT; при большей задержке запрос не повторяется (см. LimitedRetry).
+    """
+    retry = LimitedRetry(
+        total=retries,
+        connect=retries,
+        read=False,
+        status=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry, pool_block=True)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Общая сессия процесса (создается при первом обращении)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def close_session() -> None:
+    """Закрывает общую сессию и освобождает соединения"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def http_get(
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, Any]] = None,
+    timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+) -> requests.Response:
+    """GET-запрос через общую сессию с таймаутами по умолчанию"""
+    return get_session().get(url, params=params, headers=headers, timeout=timeout)
@@ -0,0 +1,47 @@
+"""
+Пополнение постоянного хранилища операций новыми выгрузками.
+
+Запуск из корня проекта:
+    python -m src.ingest data/operations.xlsx data/new_export.csv
+"""
+
+import argparse
+import logging
+from typing import List, Optional
+
+from src.config import configure
+from src.df_reader import CHUNK_SIZE
+from src.operations_db import DEFAULT_DB_PATH, OperationsDB
+
+logger = logging.getLogger(__name__)
+
+
+def ingest_files(file_paths: List[str], db: OperationsDB, chunk_size: int = CHUNK_SIZE) -> int:
+    """Добавляет операции из файлов в хранилище; возвращает число новых операций"""
+    added = 0
+    for file_path in file_paths:
+        file_added = db.append_file(file_path, chunk_size)
+        logger.info(f"{file_path}: добавлено {file_added} операций")
+        print(f"{file_path}: добавлено операций: {file_added}")
+        added += file_added
+    return added
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Добавление выгрузок операций (xlsx/csv) в хранилище")
+    parser.add_argument("files", nargs="+", help="файлы выгрузок")
+    parser.add_argument("--db", default=str(DEFAULT_DB_PATH), help="путь к базе SQLite")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="размер части при чтении")
+    args = parser.parse_args(argv)
+    configure()
+
+    db = OperationsDB(args.db)
+    try:
+        added = ingest_files(args.files, db, args.chunk_size)
+        print(f"Всего добавлено: {added}, операций в хранилище: {len(db)}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
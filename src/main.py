@@ -2,20 +2,46 @@ import json
 import logging
 import os
 from datetime import datetime
+from typing import TYPE_CHECKING, Optional
 
-import pandas as pd
+from src.config import configure, get_env
 
-from src.df_reader import load_and_convert_excel_to_dict
-from src.reports import spending_by_category
-from src.services import search_physical_person_transfers, simple_search
-from src.views import get_events
+if TYPE_CHECKING:
+    from src.store import TransactionStore
 
-# Настройка логирования
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+# Переменная окружения (или .env) с путем к базе операций SQLite, пополняемой src.ingest;
+# если задана, меню работает с базой вместо файла выгрузки
+OPERATIONS_DB_VAR = "OPERATIONS_DB"
+
+# Модули с pandas, requests и прочими тяжелыми зависимостями импортируются
+# при первом использовании соответствующего пункта меню, а не при запуске
+
+
+class LazyStore:
+    """Хранилище транзакций, загружаемое из файла (или базы операций) при первом обращении"""
+
+    def __init__(self, file_path: str, db_path: Optional[str] = None) -> None:
+        self.file_path = file_path
+        self.db_path = db_path
+        self._store: Optional["TransactionStore"] = None
+
+    def get(self) -> "TransactionStore":
+        if self._store is None:
+            if self.db_path:
+                from src.operations_db import load_store
+
+                self._store = load_store(self.db_path)
+            else:
+                from src.store import TransactionStore
+
+                self._store = TransactionStore.from_file(self.file_path)
+        return self._store
+
 
 def main() -> None:
+    configure()
     print("\nДобро пожаловать в систему анализа транзакций!")
     print("Доступные команды:")
     print("1. Простой поиск по описанию или категории")
@@ -25,14 +51,16 @@ def main() -> None:
     print("0. Выход")
 
     try:
-        # Загрузка данных из Excel
+        # Загрузка данных из Excel или из базы операций
         file_path = os.path.join("../data", "operations.xlsx")
+        db_path = get_env(OPERATIONS_DB_VAR)
 
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"Файл {file_path} не найден")
+        source_path = db_path or file_path
+        if not os.path.exists(source_path):
+            raise FileNotFoundError(f"Файл {source_path} не найден")
 
-        df = pd.read_excel(file_path)
-        transactions_list = load_and_convert_excel_to_dict(file_path)
+        # Данные загружаются один раз при первой команде и переиспользуются остальными
+        store = LazyStore(file_path, db_path)
 
         while True:
             choice = input("\nВыберите действие (0-4): ").strip()
@@ -42,13 +70,17 @@ def main() -> None:
                 break
 
             elif choice == "1":
+                from src.services import simple_search
+
                 search = input("Введите строку для поиска: ").strip()
-                result = simple_search(search, transactions_list)
+                result = simple_search(search, store.get(), use_index=True)
                 print("\nРезультаты поиска:")
                 print(result)
 
             elif choice == "2":
-                result = search_physical_person_transfers(transactions_list)
+                from src.services import search_physical_person_transfers
+
+                result = search_physical_person_transfers(store.get())
                 print("\nПереводы физическим лицам:")
                 print(result)
 
@@ -57,7 +89,9 @@ def main() -> None:
                 date = input("Введите дату (ДД.ММ.ГГГГ) или Enter для текущей даты: ").strip()
                 if not date:
                     date = datetime.now().strftime("%d.%m.%Y")
-                result = spending_by_category(df, category, date)
+                from src.reports import spending_by_category
+
+                result = spending_by_category(store.get(), category, date)
                 print("\nОтчет по тратам:")
                 print(result)
 
@@ -76,7 +110,9 @@ def main() -> None:
                     range_type = "M"
 
                 logger.info(f"Запуск get_events для даты {date_str}, диапазон {range_type}")
-                result_json = get_events(date_str, range_type)
+                from src.views import get_events
+
+                result_json = get_events(date_str, range_type, store=store.get())
 
                 try:
                     result = json.loads(result_json)
@@ -0,0 +1,179 @@
+import atexit
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Deque, Dict, Iterator, Optional, TypeVar, Union, cast
+
+# Число последних замеров каждого этапа, по которым считаются перцентили
+SAMPLE_SIZE = 10_000
+
+# Квантили в выгрузке Prometheus
+QUANTILES = (0.5, 0.95)
+
+PROMETHEUS_METRIC = "project_stage_duration_seconds"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_DISABLED = nullcontext()
+
+
+def _quantile(sorted_values: list[float], q: float) -> float:
+    """Квантиль по методу ближайшего ранга"""
+    index = max(0, math.ceil(q * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+class StageStats:
+    """Счетчик, сумма, максимум и последние замеры длительности одного этапа"""
+
+    __slots__ = ("count", "total", "max", "samples")
+
+    def __init__(self, sample_size: int = SAMPLE_SIZE) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples: Deque[float] = deque(maxlen=sample_size)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.samples.append(seconds)
+
+    def summary(self) -> Dict[str, float]:
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "p50": _quantile(ordered, 0.5),
+            "p95": _quantile(ordered, 0.95),
+            "max": self.max,
+        }
+
+
+class Metrics:
+    """
+    Замеры длительности этапов (загрузка, фильтрация, агрегация, запросы к API, сериализация).
+
+    По умолчанию выключены: span() возвращает пустой контекстный менеджер,
+    а функции под timed() вызываются напрямую. Имена этапов имеют вид
+    «этап.операция», например «load.read» или «fetch.exchange_rates».
+    """
+
+    def __init__(self, enabled: bool = False, sample_size: int = SAMPLE_SIZE) -> None:
+        self.enabled = enabled
+        self.sample_size = sample_size
+        self._stages: Dict[str, StageStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float) -> None:
+        """Добавляет замер длительности этапа (секунды)"""
+        with self._lock:
+            stats = self._stages.get(name)
+            if stats is None:
+                stats = self._stages[name] = StageStats(self.sample_size)
+            stats.add(seconds)
+
+    def span(self, name: str) -> ContextManager[None]:
+        """Контекстный менеджер, замеряющий длительность блока"""
+        if not self.enabled:
+            return _DISABLED
+        return self._span(name)
+
+    @contextmanager
+    def _span(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Сводка по этапам: count, sum, p50, p95, max (секунды)"""
+        with self._lock:
+            return {name: stats.summary() for name, stats in sorted(self._stages.items())}
+
+    def reset(self) -> None:
+        """Удаляет все замеры"""
+        with self._lock:
+            self._stages.clear()
+
+    def export_jsonl(self, path: Union[str, Path]) -> None:
+        """Дописывает в файл JSON Lines по строке на этап с отметкой времени"""
+        timestamp = datetime.now().isoformat(timespec="seconds")
+        lines = [
+            json.dumps({"time": timestamp, "stage": name, **stats}, ensure_ascii=False)
+            for name, stats in self.summary().items()
+        ]
+        with open(path, "a", encoding="utf-8") as f:
+            f.writelines(line + "\n" for line in lines)
+
+    def prometheus_text(self) -> str:
+        """Сводка в текстовом формате Prometheus (тип summary с квантилями 0.5 и 0.95)"""
+        lines = [
+            f"# HELP {PROMETHEUS_METRIC} Длительность этапов обработки",
+            f"# TYPE {PROMETHEUS_METRIC} summary",
+        ]
+        for name, stats in self.summary().items():
+            for q in QUANTILES:
+                value = stats[f"p{int(q * 100)}"]
+                lines.append(f'{PROMETHEUS_METRIC}{{stage="{name}",quantile="{q}"}} {value:.6f}')
+            lines.append(f'{PROMETHEUS_METRIC}_sum{{stage="{name}"}} {stats["sum"]:.6f}')
+            lines.append(f'{PROMETHEUS_METRIC}_count{{stage="{name}"}} {stats["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: Union[str, Path]) -> None:
+        """Выгрузка по расширению файла: .prom — текст Prometheus (перезапись), иначе — JSON Lines (дозапись)"""
+        if Path(path).suffix == ".prom":
+            Path(path).write_text(self.prometheus_text(), encoding="utf-8")
+        else:
+            self.export_jsonl(path)
+
+
+# Замеры включаются переменной окружения METRICS_ENABLED=1 или вызовом enable_metrics()
+metrics = Metrics(enabled=os.getenv("METRICS_ENABLED", "") not in ("", "0"))
+
+
+def span(name: str) -> ContextManager[None]:
+    """Замер длительности блока общим объектом метрик: with span("load.read"): ..."""
+    return metrics.span(name)
+
+
+def timed(name: Optional[str] = None) -> Callable[[F], F]:
+    """Декоратор: замер длительности каждого вызова функции (имя этапа — name или имя функции)"""
+
+    def decorator(func: F) -> F:
+        stage = name or f"{func.__module__}.{func.__qualname__}"
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not metrics.enabled:
+                return func(*args, **kwargs)
+            with metrics._span(stage):
+                return func(*args, **kwargs)
+
+        return cast(F, wrapper)
+
+    return decorator
+
+
+def enable_metrics(enabled: bool = True) -> None:
+    """Включает или выключает замеры"""
+    metrics.enabled = enabled
+
+
+def _export_on_exit() -> None:
+    path = os.getenv("METRICS_FILE")
+    if path and metrics.enabled:
+        metrics.export(path)
+
+
+# При заданной переменной METRICS_FILE сводка выгружается при завершении программы
+atexit.register(_export_on_exit)
@@ -0,0 +1,243 @@
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.df_reader import CHUNK_SIZE, FLOAT_COLUMNS, INT_COLUMNS, iter_operation_chunks
+from src.schema import TRANSACTION_FIELDS, apply_schema
+from src.store import DATE_COLUMN, TransactionStore, parse_operation_dates
+from src.utils import get_expenses_summary_from_parts, get_incomes_summary_from_parts
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "data" / "operations.sqlite"
+
+# Поля, по которым операция считается уже загруженной
+DEDUP_FIELDS = ("operation_date", "card_number", "amount", "description")
+
+FIELDS = tuple(TRANSACTION_FIELDS)
+_INSERT_COLUMNS = FIELDS + ("operation_month", "dedup_key")
+
+
+def _sql_type(column: str) -> str:
+    """Тип столбца SQLite для столбца выгрузки"""
+    if column in FLOAT_COLUMNS:
+        return "REAL"
+    if column in INT_COLUMNS:
+        return "INTEGER"
+    return "TEXT"
+
+
+def _operation_dates(df: pd.DataFrame) -> pd.Series:
+    """Разобранные даты операций (NaT, если дату не удалось разобрать)"""
+    try:
+        return parse_operation_dates(df[DATE_COLUMN])
+    except (ValueError, TypeError):
+        return pd.to_datetime(df[DATE_COLUMN], dayfirst=True, errors="coerce")
+
+
+def _base_keys(df: pd.DataFrame, dates: pd.Series) -> pd.Series:
+    """
+    Ключ операции: дата (разобранная, чтобы xlsx и csv одной выгрузки совпадали),
+    карта, сумма с двумя знаками и описание
+    """
+    key = pd.Series("", index=df.index, dtype=object)
+    for i, field in enumerate(DEDUP_FIELDS):
+        column = TRANSACTION_FIELDS[field]
+        if field == "operation_date":
+            part = dates.dt.strftime("%Y-%m-%dT%H:%M:%S").where(dates.notna(), "")
+        else:
+            values = df[column] if column in df.columns else pd.Series(np.nan, index=df.index)
+            if field == "amount":
+                values = pd.to_numeric(values, errors="coerce").round(2)
+                part = values.map("{:.2f}".format).where(values.notna(), "")
+            else:
+                part = values.astype(str).where(values.notna(), "")
+        key = part if i == 0 else key + "\x1f" + part
+    return key
+
+
+def _dedup_keys(df: pd.DataFrame, dates: pd.Series, occurrences: Dict[str, int]) -> pd.Series:
+    """
+    Ключ дедупликации: ключ операции и номер ее повторения в загружаемой выгрузке.
+    Одинаковые операции внутри выгрузки (например, два одинаковых билета в одну секунду)
+    получают разные ключи, а повторная загрузка той же выгрузки — те же ключи.
+    occurrences — число уже встреченных повторений по ключу операции (для частей одного файла).
+    """
+    base = _base_keys(df, dates)
+    previous = base.map(occurrences).fillna(0).astype(int)
+    number = base.groupby(base, sort=False).cumcount() + previous
+    totals = (number + 1).groupby(base, sort=False).max()
+    occurrences.update({str(key): int(total) for key, total in totals.items()})
+    return base + "\x1f" + number.astype(str)
+
+
+def _rows(df: pd.DataFrame, occurrences: Dict[str, int]) -> Iterable[Tuple[Any, ...]]:
+    """Строки для вставки: значения Python, пропуски — None"""
+    frame = pd.DataFrame(
+        {field: df[column] if column in df.columns else None for field, column in TRANSACTION_FIELDS.items()},
+        index=df.index,
+    )
+    dates = _operation_dates(df)
+    # Месяц операции в формате YYYY-MM (None, если дату не удалось разобрать)
+    frame["operation_month"] = dates.dt.strftime("%Y-%m").where(dates.notna(), None)
+    frame["dedup_key"] = _dedup_keys(df, dates, occurrences)
+    frame = frame.astype(object).where(frame.notna(), None)
+    return frame.itertuples(index=False, name=None)
+
+
+class OperationsDB:
+    """
+    Постоянное хранилище операций в SQLite с пополнением новыми выгрузками.
+
+    Повторно загруженные операции (та же дата, карта, сумма и описание) пропускаются;
+    одинаковые операции внутри одной выгрузки сохраняются все.
+    Суммы по месяцу, категории, статусу и знаку операции хранятся в таблице
+    monthly_aggregates и обновляются только по новым строкам. Это библиотечный API
+    для сводок по целым месяцам: точки входа (--db) загружают операции в TransactionStore,
+    так как диапазоны W/M/Y страницы «События» не выровнены по месяцам.
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_DB_PATH) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        columns = ",\n".join(f"{field} {_sql_type(column)}" for field, column in TRANSACTION_FIELDS.items())
+        with self._connection:
+            self._connection.executescript(f"""
+                CREATE TABLE IF NOT EXISTS operations (
+                    {columns},
+                    operation_month TEXT,
+                    dedup_key TEXT NOT NULL UNIQUE
+                );
+                CREATE TABLE IF NOT EXISTS monthly_aggregates (
+                    month TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    total REAL NOT NULL,
+                    count INTEGER NOT NULL,
+                    PRIMARY KEY (month, category, kind, status)
+                );
+                CREATE TEMP TABLE IF NOT EXISTS staging (
+                    {columns},
+                    operation_month TEXT,
+                    dedup_key TEXT NOT NULL UNIQUE
+                );
+                """)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._connection.execute("SELECT COUNT(*) FROM operations").fetchone()[0])
+
+    def append(self, df: pd.DataFrame) -> int:
+        """
+        Добавляет операции из DataFrame со столбцами выгрузки.
+        Возвращает число новых операций; агрегаты пересчитываются только для них.
+        """
+        return self._append(df, {})
+
+    def _append(self, df: pd.DataFrame, occurrences: Dict[str, int]) -> int:
+        placeholders = ", ".join("?" * len(_INSERT_COLUMNS))
+        names = ", ".join(_INSERT_COLUMNS)
+        with self._lock, self._connection:
+            connection = self._connection
+            connection.execute("DELETE FROM staging")
+            connection.executemany(f"INSERT INTO staging ({names}) VALUES ({placeholders})", _rows(df, occurrences))
+            # Пропускаются только операции, загруженные ранее
+            connection.execute("DELETE FROM staging WHERE dedup_key IN (SELECT dedup_key FROM operations)")
+            connection.execute("""
+                INSERT INTO monthly_aggregates (month, category, kind, status, total, count)
+                SELECT operation_month, COALESCE(category, ''),
+                       CASE WHEN amount < 0 THEN 'expense' ELSE 'income' END,
+                       COALESCE(status, ''), SUM(amount), COUNT(*)
+                FROM staging
+                WHERE operation_month IS NOT NULL AND amount IS NOT NULL AND amount != 0
+                GROUP BY 1, 2, 3, 4
+                ON CONFLICT (month, category, kind, status)
+                DO UPDATE SET total = total + excluded.total, count = count + excluded.count
+                """)
+            added = connection.execute(f"INSERT INTO operations ({names}) SELECT {names} FROM staging").rowcount
+            connection.execute("DELETE FROM staging")
+        logger.info(f"Добавлено операций: {added} из {len(df)}")
+        return int(added)
+
+    def append_file(self, file_path: str, chunk_size: int = CHUNK_SIZE) -> int:
+        """Добавляет операции из выгрузки xlsx/csv, читая ее частями"""
+        # Повторения операции считаются по всему файлу, а не по отдельной части
+        occurrences: Dict[str, int] = {}
+        return sum(self._append(chunk, occurrences) for chunk in iter_operation_chunks(file_path, chunk_size))
+
+    def to_frame(self) -> pd.DataFrame:
+        """Все операции в порядке загрузки со столбцами выгрузки"""
+        with self._lock:
+            cursor = self._connection.execute(f"SELECT {', '.join(FIELDS)} FROM operations ORDER BY rowid")
+            rows = cursor.fetchall()
+        return pd.DataFrame(rows, columns=[TRANSACTION_FIELDS[field] for field in FIELDS])
+
+    def to_store(self) -> TransactionStore:
+        """Хранилище транзакций в памяти по всем загруженным операциям"""
+        return TransactionStore(apply_schema(self.to_frame()))
+
+    def monthly_aggregates(self) -> pd.DataFrame:
+        """Таблица агрегатов: месяц, категория, вид операции, статус, сумма и количество"""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT month, category, kind, status, total, count FROM monthly_aggregates ORDER BY 1, 2, 3, 4"
+            ).fetchall()
+        return pd.DataFrame(rows, columns=["month", "category", "kind", "status", "total", "count"])
+
+    def summary_parts(
+        self, kind: str, start_month: Optional[str] = None, end_month: Optional[str] = None
+    ) -> Tuple[float, pd.Series]:
+        """
+        Общая сумма и суммы по категориям успешных операций вида kind
+        ('expense' или 'income') за месяцы [start_month, end_month] в формате YYYY-MM.
+        Операции без категории входят только в общую сумму, как в get_expenses_summary.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                """
+                SELECT category, SUM(total) FROM monthly_aggregates
+                WHERE kind = ? AND status = 'OK' AND month >= ? AND month <= ?
+                GROUP BY category
+                """,
+                (kind, start_month or "", end_month or "9999-12"),
+            ).fetchall()
+        by_category = pd.Series(dict(rows), dtype="float64")
+        total = float(by_category.sum())
+        return total, by_category[by_category.index != ""]
+
+    def expenses_summary(self, start_month: Optional[str] = None, end_month: Optional[str] = None) -> Dict[str, Any]:
+        """Сводка расходов за месяцы в формате get_expenses_summary — по агрегатам, без чтения операций"""
+        return get_expenses_summary_from_parts(*self.summary_parts("expense", start_month, end_month))
+
+    def incomes_summary(self, start_month: Optional[str] = None, end_month: Optional[str] = None) -> Dict[str, Any]:
+        """Сводка поступлений за месяцы в формате get_incomes_summary"""
+        return get_incomes_summary_from_parts(*self.summary_parts("income", start_month, end_month))
+
+    def close(self) -> None:
+        """Закрывает соединение с базой"""
+        with self._lock:
+            self._connection.close()
+
+
+def load_store(path: Union[str, Path] = DEFAULT_DB_PATH) -> TransactionStore:
+    """
+    Хранилище транзакций в памяти из существующей базы (источник данных
+    точек входа вместо файла выгрузки). Пустая база по пути не создается.
+    """
+    if not Path(path).exists():
+        raise FileNotFoundError(f"База операций {path} не найдена")
+    db = OperationsDB(path)
+    try:
+        store = db.to_store()
+    finally:
+        db.close()
+    logger.info(f"Операции загружены из базы {path}: {len(store)} записей")
+    return store
@@ -0,0 +1,180 @@
+import atexit
+import importlib.util
+import logging
+import os
+import queue
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+import pandas as pd
+
+from src.metrics import span
+from src.serialization import PRETTY, write_report_json
+
+# Запись parquet через pandas требует необязательного пакета pyarrow
+HAS_PARQUET = importlib.util.find_spec("pyarrow") is not None
+
+logger = logging.getLogger(__name__)
+
+REPORTS_DIR = Path(__file__).parent / "reports"
+
+# Форматы файлов отчетов
+JSON = "json"
+JSONL = "jsonl"
+PARQUET = "parquet"
+REPORT_FORMATS = (JSON, JSONL, PARQUET)
+
+
+def _check_format(fmt: str) -> None:
+    if fmt not in REPORT_FORMATS:
+        raise ValueError(f"Неизвестный формат отчета: {fmt}")
+    if fmt == PARQUET and not HAS_PARQUET:
+        raise ValueError("Для отчетов в формате parquet требуется пакет pyarrow")
+
+
+def write_report_file(df: pd.DataFrame, path: Union[str, Path], fmt: str = JSON, json_mode: str = PRETTY) -> Path:
+    """
+    Записывает отчет атомарно: во временный файл в той же директории,
+    затем переименование. Читатель видит либо прежний файл, либо новый целиком.
+    """
+    _check_format(fmt)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        if fmt == PARQUET:
+            os.close(fd)
+            df.to_parquet(tmp_name, index=False)
+        else:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                if fmt == JSONL:
+                    df.to_json(f, orient="records", lines=True, force_ascii=False, date_format="iso")
+                else:
+                    write_report_json(df, f, json_mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+        raise
+    return path
+
+
+class ReportWriter:
+    """
+    Запись отчетов в фоновом потоке.
+
+    submit() ставит копию DataFrame в очередь и сразу возвращает путь будущего файла;
+    файлы пишутся по одному в порядке постановки. flush() дожидается записи
+    всех поставленных отчетов. С background=False отчет пишется сразу в submit().
+    Ошибки записи логируются и учитываются в счетчике errors.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path] = REPORTS_DIR,
+        fmt: str = JSON,
+        json_mode: str = PRETTY,
+        background: bool = True,
+    ) -> None:
+        _check_format(fmt)
+        self.directory = Path(directory)
+        self.fmt = fmt
+        self.json_mode = json_mode
+        self.background = background
+        self.written = 0
+        self.errors = 0
+        self._queue: "queue.Queue[Optional[Tuple[pd.DataFrame, Path, str, str]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def path_for(self, name: str, fmt: Optional[str] = None) -> Path:
+        """Путь файла отчета; расширение добавляется, если в имени его нет"""
+        path = self.directory / name
+        return path if path.suffix else path.with_suffix(f".{fmt or self.fmt}")
+
+    def submit(self, df: pd.DataFrame, name: str, fmt: Optional[str] = None, json_mode: Optional[str] = None) -> Path:
+        """Ставит отчет в очередь записи и возвращает путь файла"""
+        fmt = fmt or self.fmt
+        _check_format(fmt)
+        path = self.path_for(name, fmt)
+        # Копия: вызывающий код может изменить DataFrame до фактической записи
+        task = (df.copy(), path, fmt, json_mode or self.json_mode)
+        if not self.background:
+            self._write(*task)
+            return path
+        self._ensure_thread()
+        self._queue.put(task)
+        return path
+
+    def flush(self) -> None:
+        """Дожидается записи всех поставленных отчетов"""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        """Записывает оставшиеся отчеты и останавливает поток"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="report-writer", daemon=True)
+                    self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            task = self._queue.get()
+            try:
+                if task is None:
+                    return
+                self._write(*task)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, df: pd.DataFrame, path: Path, fmt: str, json_mode: str) -> None:
+        try:
+            with span("serialize.report"):
+                write_report_file(df, path, fmt, json_mode)
+            self.written += 1
+            logger.info(f"Отчет успешно сохранен в файл: {path}")
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Ошибка при сохранении отчета: {str(e)}")
+
+
+_writer: Optional[ReportWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_report_writer() -> ReportWriter:
+    """Общий объект записи отчетов процесса (по умолчанию — JSON в src/reports)"""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = ReportWriter()
+    return _writer
+
+
+def set_report_writer(writer: Optional[ReportWriter]) -> None:
+    """Подменяет общий объект записи; None — вернуть объект по умолчанию при следующем обращении"""
+    global _writer
+    with _writer_lock:
+        _writer = writer
+
+
+def flush_reports() -> None:
+    """Дожидается записи всех отчетов общего объекта записи"""
+    if _writer is not None:
+        _writer.flush()
+
+
+# Отчеты, поставленные в очередь перед завершением программы, дописываются
+atexit.register(flush_reports)
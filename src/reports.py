@@ -1,47 +1,44 @@
-import json
 import logging
-import os
 from datetime import datetime, time, timedelta
 from functools import wraps
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Optional, Union
 
 import pandas as pd
 
-# Настройка логирования
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+from src.metrics import span, timed
+from src.report_writer import get_report_writer
+from src.serialization import PRETTY
+from src.store import TransactionStore, as_store
 
 
-def report_decorator(filename: Optional[str] = None) -> Callable:
+def report_decorator(
+    filename: Optional[str] = None, json_mode: str = PRETTY, report_format: Optional[str] = None
+) -> Callable:
+    """
+    Сохраняет результат отчета в файл в фоновом потоке (src.report_writer):
+    функция возвращает DataFrame сразу после расчета, запись идет атомарно.
+    Директория и формат по умолчанию задаются общим ReportWriter.
+    """
+
     def decorator(func: Callable[[pd.DataFrame, str, Optional[str]], pd.DataFrame]) -> Callable:
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> pd.DataFrame:
+            # Режим записи отчета можно задать и при вызове: json_mode=...;
+            # save_report=False — вернуть результат без сохранения файла
+            mode = kwargs.pop("json_mode", json_mode)
+            save_report = kwargs.pop("save_report", True)
             result = func(*args, **kwargs)
-
-            # Создаем путь к директории для отчетов
-            report_dir = r"..\src\reports"
-            if not os.path.exists(report_dir):
-                os.makedirs(report_dir)
+            if not save_report:
+                return result
 
             if filename is None:
-                report_name = f"report_{func.__name__}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+                report_name = f"report_{func.__name__}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
             else:
                 report_name = filename
 
             try:
-
-                def datetime_converter(obj: object) -> str:
-                    if isinstance(obj, pd._libs.tslibs.timestamps.Timestamp):
-                        return obj.strftime("%Y-%m-%d %H:%M:%S")
-                    raise TypeError
-
-                # Формируем полный путь к файлу
-                full_path = os.path.join(report_dir, report_name)
-
-                with open(full_path, "w", encoding="utf-8") as f:
-                    json.dump(
-                        result.to_dict(orient="records"), f, ensure_ascii=False, indent=4, default=datetime_converter
-                    )
-                logging.info(f"Отчет успешно сохранен в файл: {full_path}")
+                with span("report.submit"):
+                    get_report_writer().submit(result, report_name, report_format, mode)
             except Exception as e:
                 logging.error(f"Ошибка при сохранении отчета: {str(e)}")
 
@@ -53,10 +50,15 @@ def report_decorator(filename: Optional[str] = None) -> Callable:
 
 
 @report_decorator()
-def spending_by_category(transactions: pd.DataFrame, category: str, date: Optional[str] = None) -> pd.DataFrame:
-    # Преобразуем даты в DataFrame в правильный формат
-    transactions["Дата операции"] = pd.to_datetime(transactions["Дата операции"], format="%d.%m.%Y %H:%M:%S")
-
+@timed("aggregate.spending_by_category")
+def spending_by_category(
+    transactions: Union[pd.DataFrame, TransactionStore], category: str, date: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Траты по категории за три месяца до указанной даты.
+    Суммы берутся из заранее построенной таблицы по дате операции и категории
+    (TransactionStore.category_timeline), переданный DataFrame не изменяется.
+    """
     # Обработка переданной даты
     if date is None:
         end_date = datetime.now()
@@ -72,40 +74,38 @@ def spending_by_category(transactions: pd.DataFrame, category: str, date: Option
 
     # Рассчитываем начальную дату (3 месяца назад)
     start_date = end_date - timedelta(days=90)
-    # Приводим категории к нижнему регистру для поиска
-    transactions["Категория_lower"] = transactions["Категория"].str.lower()
     search_term = category.lower()
 
-    # Фильтрация с учетом частичного совпадения
-    filtered_df = transactions[
-        (transactions["Дата операции"] >= start_date)
-        & (transactions["Дата операции"] <= end_date)
-        & (transactions["Категория_lower"].str.contains(search_term, na=False))
-    ]
+    # Суммы по дате операции и категории рассчитаны хранилищем один раз,
+    # окно дат выбирается бинарным поиском, исходный DataFrame не изменяется
+    store = as_store(transactions)
+    window = store.timeline_window(start_date, end_date)
+    in_category = window["category"].str.lower().str.contains(search_term, na=False).to_numpy(dtype=bool)
+    filtered = window[in_category]
 
     logging.info(f"Исходная дата: {end_date}")
     logging.info(f"Начальная дата: {start_date}")
     logging.info(f"Категория поиска: {category}")
-    logging.info(f"Количество записей после фильтрации: {len(filtered_df)}")
+    logging.info(f"Количество записей после фильтрации: {filtered['rows'].sum()}")
 
-    if not filtered_df.empty:
-        result_df = (
-            filtered_df.groupby(["Дата операции", "Категория"])
-            .agg(ИТОГО=("Сумма операции", "sum"), ВСЕГО=("Сумма операции", "count"))
-            .reset_index()
-        )
+    if not filtered.empty:
+        result_df = pd.DataFrame(
+            {
+                "Дата операции": filtered["date"],
+                "Категория": filtered["category"],
+                "ИТОГО": filtered["total"],
+                "ВСЕГО": filtered["count"],
+            }
+        ).reset_index(drop=True)
         # Форматируем дату обратно в строку
         result_df["Дата операции"] = result_df["Дата операции"].dt.strftime("%d.%m.%Y %H:%M:%S")
         # Округление значений
         result_df["ИТОГО"] = result_df["ИТОГО"].round(2)
         result_df["ВСЕГО"] = result_df["ВСЕГО"].round(2)
 
-        # Удаляем вспомогательный столбец
-        result_df.drop(columns=["Категория_lower"], errors="ignore", inplace=True)
-
         # Создаем итоговую строку
-        total_spending = filtered_df["Сумма операции"].sum().round(2)
-        total_transactions = filtered_df.shape[0]
+        total_spending = filtered["total"].sum().round(2)
+        total_transactions = filtered["rows"].sum()
 
         total_row = pd.DataFrame(
             {
@@ -119,8 +119,8 @@ def spending_by_category(transactions: pd.DataFrame, category: str, date: Option
         # Добавляем итоговую строку в конец
         result_df = pd.concat([result_df, total_row], ignore_index=True)
 
-        print(f"Минимальная допустимая дата operations.xlsx: {transactions['Дата операции'].min()}")
-        print(f"Максимальная допустимая дата operations.xlsx: {transactions['Дата операции'].max()}")
+        print(f"Минимальная допустимая дата operations.xlsx: {store.min_date}")
+        print(f"Максимальная допустимая дата operations.xlsx: {store.max_date}")
         return result_df
     else:
         logging.warning("Фильтрация вернула пустой DataFrame")
@@ -0,0 +1,142 @@
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Столбцы с небольшим числом различных значений хранятся как category
+CATEGORICAL_COLUMNS = ("Категория", "Статус", "Валюта операции", "Валюта платежа", "Номер карты")
+
+# Сужение числовых типов только там, где значения не меняются:
+# целые бонусы и округления помещаются в int32, коды MCC точно представимы во float32.
+# Денежные суммы остаются float64 — во float32 копейки искажаются (73.06 -> 73.0599975...).
+NARROW_DTYPES = {
+    "Бонусы (включая кэшбэк)": "int32",
+    "Округление на инвесткопилку": "int32",
+    "MCC": "float32",
+}
+
+# Соответствие атрибутов Transaction столбцам выгрузки
+TRANSACTION_FIELDS = {
+    "operation_date": "Дата операции",
+    "payment_date": "Дата платежа",
+    "card_number": "Номер карты",
+    "status": "Статус",
+    "amount": "Сумма операции",
+    "currency": "Валюта операции",
+    "payment_amount": "Сумма платежа",
+    "payment_currency": "Валюта платежа",
+    "cashback": "Кэшбэк",
+    "category": "Категория",
+    "mcc": "MCC",
+    "description": "Описание",
+    "bonuses": "Бонусы (включая кэшбэк)",
+    "invest_rounding": "Округление на инвесткопилку",
+    "rounded_amount": "Сумма операции с округлением",
+}
+_COLUMN_TO_FIELD = {column: field for field, column in TRANSACTION_FIELDS.items()}
+
+
+def _narrow(column: pd.Series, dtype: str) -> pd.Series:
+    """Столбец в узком типе или исходный столбец, если значения изменились бы"""
+    if not pd.api.types.is_numeric_dtype(column) or column.dtype == np.dtype(dtype):
+        return column
+    try:
+        narrowed = column.astype(np.dtype(dtype))
+    except (ValueError, TypeError):
+        # Пропуски не помещаются в целочисленный тип
+        return column
+    if not narrowed.astype("float64").equals(column.astype("float64")):
+        return column
+    return narrowed
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Возвращает DataFrame с компактными типами столбцов:
+    category для низкокардинальных строковых столбцов и узкие числовые типы,
+    если значения при этом не меняются. Исходный DataFrame не изменяется.
+    """
+    typed = df.copy(deep=False)
+    for column in CATEGORICAL_COLUMNS:
+        if column in typed.columns and typed[column].dtype == object:
+            typed[column] = typed[column].astype("category")
+    for column, dtype in NARROW_DTYPES.items():
+        if column in typed.columns:
+            typed[column] = _narrow(typed[column], dtype)
+    return typed
+
+
+class Transaction:
+    """
+    Компактная запись транзакции: атрибуты в __slots__ вместо словаря
+    с 15 строковыми ключами. Поддерживает доступ по названию столбца
+    выгрузки (get, []), поэтому может использоваться вместо словаря.
+    """
+
+    __slots__ = tuple(TRANSACTION_FIELDS)
+
+    operation_date: Any
+    payment_date: Any
+    card_number: Any
+    status: Any
+    amount: Any
+    currency: Any
+    payment_amount: Any
+    payment_currency: Any
+    cashback: Any
+    category: Any
+    mcc: Any
+    description: Any
+    bonuses: Any
+    invest_rounding: Any
+    rounded_amount: Any
+
+    def __init__(self, **fields: Any) -> None:
+        for field in self.__slots__:
+            setattr(self, field, fields.get(field))
+
+    @classmethod
+    def from_dict(cls, record: Dict[str, Any]) -> "Transaction":
+        """Создает запись из словаря с названиями столбцов выгрузки"""
+        return cls(**{field: record.get(column) for field, column in TRANSACTION_FIELDS.items()})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Словарь с названиями столбцов выгрузки"""
+        return {column: getattr(self, field) for field, column in TRANSACTION_FIELDS.items()}
+
+    def get(self, column: str, default: Optional[Any] = None) -> Any:
+        """Значение по названию столбца выгрузки"""
+        field = _COLUMN_TO_FIELD.get(column)
+        return default if field is None else getattr(self, field)
+
+    def __getitem__(self, column: str) -> Any:
+        if column not in _COLUMN_TO_FIELD:
+            raise KeyError(column)
+        return getattr(self, _COLUMN_TO_FIELD[column])
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Transaction):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"Transaction({self.operation_date!r}, {self.category!r}, {self.amount!r})"
+
+
+def iter_transaction_records(df: pd.DataFrame) -> Iterator[Transaction]:
+    """Записи Transaction по строкам DataFrame"""
+    columns = [TRANSACTION_FIELDS[field] for field in Transaction.__slots__]
+    present = [column for column in columns if column in df.columns]
+    fields = [_COLUMN_TO_FIELD[column] for column in present]
+    for values in df[present].itertuples(index=False, name=None):
+        yield Transaction(**dict(zip(fields, values)))
+
+
+def to_transactions(df: pd.DataFrame) -> List[Transaction]:
+    """Список записей Transaction по DataFrame"""
+    return list(iter_transaction_records(df))
+
+
+def as_record(transaction: Any) -> Any:
+    """Словарь для JSON: Transaction преобразуется, остальное возвращается как есть"""
+    return transaction.to_dict() if isinstance(transaction, Transaction) else transaction
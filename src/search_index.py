@@ -0,0 +1,69 @@
+from functools import reduce
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+
+def _ngrams(text: str, n: int) -> set:
+    """Множество n-грамм строки"""
+    return {text[start:end] for start, end in zip(range(len(text) - n + 1), range(n, len(text) + 1))}
+
+
+class NgramIndex:
+    """
+    Инвертированный индекс n-грамм для поиска подстроки в текстовых столбцах.
+
+    Индексируются уникальные строки (в выгрузках описания сильно повторяются),
+    для каждой строки хранятся номера строк DataFrame, где она встречается.
+    Поиск: пересечение списков n-грамм запроса -> проверка подстроки
+    у кандидатов -> объединение номеров строк.
+    """
+
+    def __init__(self, columns: List[pd.Series], n: int = 3) -> None:
+        self.n = n
+        n_rows = len(columns[0]) if columns else 0
+        values = pd.concat(columns, ignore_index=True) if columns else pd.Series(dtype=object)
+        codes, uniques = pd.factorize(values)
+
+        self._strings: List[str] = [s if isinstance(s, str) else "" for s in uniques]
+        is_str = np.array([isinstance(s, str) for s in uniques], dtype=bool)
+
+        # Для каждой уникальной строки — отсортированные номера строк (формат CSR)
+        row_ids = np.tile(np.arange(n_rows), len(columns))
+        valid = codes >= 0
+        if len(uniques):
+            valid &= is_str[np.where(codes >= 0, codes, 0)]
+        order = np.argsort(codes[valid], kind="stable")
+        sorted_codes = codes[valid][order]
+        self._rows = row_ids[valid][order]
+        self._offsets = np.searchsorted(sorted_codes, np.arange(len(uniques) + 1))
+        self._valid_ids = np.flatnonzero(is_str)
+
+        grams: Dict[str, List[int]] = {}
+        for i in self._valid_ids:
+            s = self._strings[i]
+            for gram in _ngrams(s, n):
+                grams.setdefault(gram, []).append(int(i))
+        self._grams = {gram: np.array(ids, dtype=np.int64) for gram, ids in grams.items()}
+
+    def search(self, term: str) -> np.ndarray:
+        """Возвращает отсортированные номера строк, содержащих подстроку term"""
+        if len(term) >= self.n:
+            postings = []
+            for gram in _ngrams(term, self.n):
+                ids = self._grams.get(gram)
+                if ids is None:
+                    return np.empty(0, dtype=np.int64)
+                postings.append(ids)
+            postings.sort(key=len)
+            candidates = reduce(np.intersect1d, postings)
+        else:
+            candidates = self._valid_ids
+
+        matched = [i for i in candidates if term in self._strings[i]]
+        if not matched:
+            return np.empty(0, dtype=np.int64)
+        starts, ends = self._offsets[matched], self._offsets[np.asarray(matched) + 1]
+        rows = np.concatenate([self._rows[start:end] for start, end in zip(starts, ends)])
+        return np.unique(rows)
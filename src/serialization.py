@@ -0,0 +1,79 @@
+import json
+import logging
+from typing import Any, TextIO
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:  # pragma: no cover - orjson необязателен
+    HAS_ORJSON = False
+
+logger = logging.getLogger(__name__)
+
+# Режимы сериализации JSON:
+# PRETTY — как раньше (отступ 4, кириллица без экранирования), вывод не меняется;
+# COMPACT — без отступов и пробелов; ORJSON — компактный вывод через orjson (если установлен)
+PRETTY = "pretty"
+COMPACT = "compact"
+ORJSON = "orjson"
+JSON_MODES = (PRETTY, COMPACT, ORJSON)
+
+# Формат дат в отчетах в режиме PRETTY
+REPORT_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _check_mode(mode: str) -> None:
+    if mode not in JSON_MODES:
+        raise ValueError(f"Неизвестный режим сериализации: {mode}")
+
+
+def _default(obj: Any) -> Any:
+    """Значения numpy и pandas для компактных режимов"""
+    if isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Тип {type(obj).__name__} не сериализуется в JSON")
+
+
+def dumps(obj: Any, mode: str = PRETTY, sort_keys: bool = False) -> str:
+    """
+    Сериализует объект в JSON в выбранном режиме.
+    В режиме PRETTY результат совпадает с json.dumps(obj, ensure_ascii=False, indent=4).
+    В режимах COMPACT и ORJSON значения numpy и Timestamp преобразуются;
+    ORJSON без установленного orjson работает как COMPACT.
+    NaN в режиме ORJSON записывается как null, в остальных — как NaN.
+    """
+    _check_mode(mode)
+    if mode == PRETTY:
+        return json.dumps(obj, ensure_ascii=False, indent=4, sort_keys=sort_keys)
+    if mode == ORJSON and HAS_ORJSON:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=_default, option=option).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys, default=_default)
+
+
+def _report_datetime(obj: object) -> str:
+    if isinstance(obj, pd.Timestamp):
+        return obj.strftime(REPORT_DATE_FORMAT)
+    raise TypeError
+
+
+def write_report_json(df: pd.DataFrame, f: TextIO, mode: str = PRETTY) -> None:
+    """
+    Записывает DataFrame отчета как список записей.
+    PRETTY — прежний вывод через to_dict (даты в формате REPORT_DATE_FORMAT);
+    COMPACT и ORJSON — напрямую DataFrame.to_json без промежуточных словарей,
+    даты в формате ISO 8601.
+    """
+    _check_mode(mode)
+    if mode == PRETTY:
+        json.dump(df.to_dict(orient="records"), f, ensure_ascii=False, indent=4, default=_report_datetime)
+    else:
+        df.to_json(f, orient="records", force_ascii=False, date_format="iso")
@@ -0,0 +1,382 @@
+"""
+Локальный HTTP API для дашбордов: поиск, переводы физ лицам, отчет по тратам
+и страница «События». Данные загружаются один раз и остаются в памяти процесса.
+
+Запуск из корня проекта:
+    python -m src.server --port 8080
+    python -m src.server --db data/operations.sqlite     (база, пополняемая src.ingest)
+    curl 'http://127.0.0.1:8080/search?q=Пятёрочка'
+
+Маршруты (GET и HEAD):
+    /search?q=...                       simple_search (по индексу n-грамм)
+    /transfers                          search_physical_person_transfers
+    /spending?category=...&date=...     spending_by_category (дата ДД.ММ.ГГГГ, по умолчанию сегодня)
+    /events?date=...&range=M            get_events
+    /health, /metrics                   состояние сервера и замеры этапов (формат Prometheus)
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from src.config import configure
+from src.dates import parse_date
+from src.metrics import metrics
+from src.operations_db import load_store
+from src.serialization import ORJSON, dumps
+from src.store import TransactionStore
+from src.views import CACHE_LOCAL, EventsCache, get_events_async
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FILE_PATH = Path(__file__).parent.parent / "data" / "operations.xlsx"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+
+# Потоки для поиска и отчетов (вычисления не блокируют цикл событий)
+MAX_WORKERS = 4
+
+# Число запомненных ответов поиска, переводов и отчетов
+RESPONSE_CACHE_SIZE = 256
+
+# Время жизни ответа в кэше клиента (секунды): данные процесса не меняются,
+# ответы «Событий» зависят от курсов и котировок текущего дня
+DATA_MAX_AGE = 300
+EVENTS_MAX_AGE = 60
+
+# Ограничения запроса (тело не используется и читается только до MAX_BODY_SIZE байт)
+MAX_LINE_LENGTH = 8192
+MAX_HEADERS = 100
+MAX_BODY_SIZE = MAX_LINE_LENGTH
+
+# Форматы даты, которые принимает spending_by_category
+SPENDING_DATE_FORMATS = ("%d.%m.%Y %H:%M:%S", "%d.%m.%Y")
+
+
+class Response:
+    """Ответ HTTP: статус, тело и заголовки"""
+
+    __slots__ = ("status", "body", "headers")
+
+    def __init__(self, status: int, body: bytes = b"", headers: Optional[Dict[str, str]] = None) -> None:
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+
+def json_response(body: str, max_age: int = 0, status: int = HTTPStatus.OK) -> Response:
+    """Ответ JSON с ETag по содержимому и заголовком Cache-Control"""
+    data = body.encode("utf-8")
+    headers = {
+        "Content-Type": "application/json; charset=utf-8",
+        "ETag": '"' + hashlib.sha1(data).hexdigest() + '"',
+        "Cache-Control": f"max-age={max_age}" if max_age else "no-cache",
+    }
+    return Response(status, data, headers)
+
+
+def error_response(status: int, message: str) -> Response:
+    return Response(
+        status,
+        dumps({"error": message}, ORJSON).encode("utf-8"),
+        {"Content-Type": "application/json; charset=utf-8", "Cache-Control": "no-store"},
+    )
+
+
+class BadRequest(Exception):
+    """Ошибка параметров запроса (ответ 400)"""
+
+
+class PayloadTooLarge(BadRequest):
+    """Тело запроса больше MAX_BODY_SIZE (ответ 413)"""
+
+
+def _param(params: Dict[str, List[str]], name: str, default: Optional[str] = None) -> str:
+    values = params.get(name)
+    if values and values[0].strip():
+        return values[0].strip()
+    if default is None:
+        raise BadRequest(f"Не указан параметр {name}")
+    return default
+
+
+def _matches_format(value: str, date_format: str) -> bool:
+    try:
+        datetime.strptime(value, date_format)
+    except ValueError:
+        return False
+    return True
+
+
+class ApiServer:
+    """
+    Асинхронный HTTP-сервер поверх asyncio (HTTP/1.1, keep-alive).
+
+    Поиск, переводы и отчеты выполняются в пуле потоков; их ответы запоминаются
+    в LRU-кэше по маршруту и параметрам (хранилище в процессе не меняется).
+    У «Событий» get_events кэширует только сводки, курсы и котировки запрашиваются
+    заново (их кэширует кэш API). Клиент получает ETag и Cache-Control;
+    запрос с совпадающим If-None-Match получает 304 без тела.
+    """
+
+    def __init__(
+        self,
+        store: TransactionStore,
+        max_workers: int = MAX_WORKERS,
+        cache_size: int = RESPONSE_CACHE_SIZE,
+        json_mode: str = ORJSON,
+    ) -> None:
+        self.store = store
+        self.json_mode = json_mode
+        self.responses = EventsCache(cache_size)
+        self.requests = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="api")
+        self._routes: Dict[str, Callable[[Dict[str, List[str]]], Awaitable[Response]]] = {
+            "/search": self._search,
+            "/transfers": self._transfers,
+            "/spending": self._spending,
+            "/events": self._events,
+            "/health": self._health,
+            "/metrics": self._metrics,
+        }
+
+    def warm_up(self) -> None:
+        """Строит индексы и сводные таблицы хранилища до приема запросов"""
+        self.store.search_index()
+        self.store.daily_rollup()
+        self.store.category_timeline()
+        logger.info(f"Хранилище готово: {len(self.store)} записей")
+
+    async def _run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: func(*args, **kwargs))
+
+    async def _cached(self, key: Tuple[str, ...], build: Callable[[], str], max_age: int) -> Response:
+        cached = self.responses.get(key)
+        if isinstance(cached, Response):
+            return cached
+        response = json_response(await self._run(build), max_age)
+        self.responses.set(key, response)
+        return response
+
+    async def _search(self, params: Dict[str, List[str]]) -> Response:
+        from src.services import simple_search
+
+        query = _param(params, "q")
+        return await self._cached(
+            ("search", query.lower()),
+            lambda: simple_search(query, self.store, use_index=True, json_mode=self.json_mode),
+            DATA_MAX_AGE,
+        )
+
+    async def _transfers(self, params: Dict[str, List[str]]) -> Response:
+        from src.services import search_physical_person_transfers
+
+        return await self._cached(
+            ("transfers",),
+            lambda: search_physical_person_transfers(self.store, json_mode=self.json_mode),
+            DATA_MAX_AGE,
+        )
+
+    async def _spending(self, params: Dict[str, List[str]]) -> Response:
+        from src.reports import spending_by_category
+
+        category = _param(params, "category")
+        # Без даты — отчет по сегодняшний день включительно: ответ одинаков в течение дня
+        date = _param(params, "date", datetime.now().strftime("%d.%m.%Y"))
+        if not any(_matches_format(date, date_format) for date_format in SPENDING_DATE_FORMATS):
+            raise BadRequest("Дата должна быть в формате ДД.ММ.ГГГГ или ДД.ММ.ГГГГ ЧЧ:ММ:СС")
+
+        def build() -> str:
+            try:
+                report = spending_by_category(self.store, category, date, save_report=False)
+            except (ValueError, re.error) as e:
+                # Например, категория с символами регулярного выражения: «(»
+                raise BadRequest(f"Некорректные параметры отчета: {e}") from None
+            return str(report.to_json(orient="records", force_ascii=False, date_format="iso"))
+
+        return await self._cached(("spending", category.lower(), date), build, DATA_MAX_AGE)
+
+    async def _events(self, params: Dict[str, List[str]]) -> Response:
+        date = _param(params, "date", datetime.now().strftime("%d.%m.%Y"))
+        range_type = _param(params, "range", "M").upper()
+        if range_type not in ("W", "M", "Y", "ALL"):
+            raise BadRequest("Диапазон должен быть одним из W, M, Y, ALL")
+        try:
+            parse_date(date)
+        except ValueError:
+            raise BadRequest(f"Некорректная дата: {date}") from None
+        body = await get_events_async(
+            date, range_type, store=self.store, cache_mode=CACHE_LOCAL, json_mode=self.json_mode
+        )
+        # get_events сообщает об ошибке телом {"error": ...}, а не исключением
+        if body.startswith('{"error"'):
+            raise RuntimeError(json.loads(body)["error"])
+        return json_response(body, EVENTS_MAX_AGE)
+
+    async def _health(self, params: Dict[str, List[str]]) -> Response:
+        body = dumps(
+            {"status": "ok", "records": len(self.store), "requests": self.requests, "cache": self.responses.info()},
+            self.json_mode,
+        )
+        return json_response(body)
+
+    async def _metrics(self, params: Dict[str, List[str]]) -> Response:
+        return Response(
+            HTTPStatus.OK,
+            metrics.prometheus_text().encode("utf-8"),
+            {"Content-Type": "text/plain; version=0.0.4; charset=utf-8", "Cache-Control": "no-store"},
+        )
+
+    async def respond(self, method: str, target: str, headers: Dict[str, str]) -> Response:
+        """Ответ на запрос без учета соединения: маршрут, параметры, условный запрос"""
+        self.requests += 1
+        if method not in ("GET", "HEAD"):
+            response = error_response(HTTPStatus.METHOD_NOT_ALLOWED, "Поддерживаются только GET и HEAD")
+            response.headers["Allow"] = "GET, HEAD"
+            return response
+        url = urlsplit(target)
+        route = self._routes.get(url.path.rstrip("/") or "/")
+        if route is None:
+            return error_response(HTTPStatus.NOT_FOUND, f"Неизвестный маршрут: {url.path}")
+        try:
+            response = await route(parse_qs(url.query))
+        except BadRequest as e:
+            return error_response(HTTPStatus.BAD_REQUEST, str(e))
+        except Exception as e:
+            logger.error(f"Ошибка обработки {target}: {e}")
+            return error_response(HTTPStatus.INTERNAL_SERVER_ERROR, "Внутренняя ошибка сервера")
+
+        etag = response.headers.get("ETag")
+        if etag is not None and etag in headers.get("if-none-match", ""):
+            return Response(
+                HTTPStatus.NOT_MODIFIED, b"", {k: v for k, v in response.headers.items() if k != "Content-Type"}
+            )
+        return response
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Обслуживает соединение: запросы по очереди, пока клиент держит keep-alive"""
+        try:
+            while True:
+                try:
+                    request_line = await reader.readline()
+                    if not request_line:
+                        break
+                    # Цель запроса может содержать UTF-8 без процентного кодирования
+                    method, target, version = request_line.decode("utf-8").split()
+                    headers = await self._read_headers(reader)
+                    length = self._content_length(headers)
+                except PayloadTooLarge as e:
+                    await self._write(writer, error_response(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, str(e)), False)
+                    break
+                except (ValueError, BadRequest):
+                    # ValueError — в том числе строка длиннее лимита потока
+                    await self._write(writer, error_response(HTTPStatus.BAD_REQUEST, "Некорректный запрос"), False)
+                    break
+                # Тело запроса не используется, но должно быть прочитано
+                if length:
+                    await reader.readexactly(length)
+
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                response = await self.respond(method, target, headers)
+                await self._write(writer, response, keep_alive, head=method == "HEAD")
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    @staticmethod
+    async def _read_headers(reader: asyncio.StreamReader) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        for _ in range(MAX_HEADERS):
+            line = await reader.readline()
+            if len(line) > MAX_LINE_LENGTH:
+                raise BadRequest("Слишком длинный заголовок")
+            if line in (b"\r\n", b"\n", b""):
+                return headers
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        raise BadRequest("Слишком много заголовков")
+
+    @staticmethod
+    def _content_length(headers: Dict[str, str]) -> int:
+        try:
+            length = int(headers.get("content-length", "0") or 0)
+        except ValueError:
+            raise BadRequest("Некорректный заголовок Content-Length") from None
+        if length < 0:
+            raise BadRequest("Некорректный заголовок Content-Length")
+        if length > MAX_BODY_SIZE:
+            raise PayloadTooLarge(f"Тело запроса больше {MAX_BODY_SIZE} байт")
+        return length
+
+    @staticmethod
+    async def _write(writer: asyncio.StreamWriter, response: Response, keep_alive: bool, head: bool = False) -> None:
+        status = HTTPStatus(response.status)
+        lines = [f"HTTP/1.1 {status.value} {status.phrase}"]
+        lines += [f"{name}: {value}" for name, value in response.headers.items()]
+        lines.append(f"Content-Length: {len(response.body)}")
+        lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if not head:
+            writer.write(response.body)
+        await writer.drain()
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.Server:
+        """Запускает прием соединений и возвращает объект сервера"""
+        server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_LINE_LENGTH * 2)
+        for sock in server.sockets:
+            logger.info(f"HTTP API слушает http://{sock.getsockname()[0]}:{sock.getsockname()[1]}")
+        return server
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def run_server(store: TransactionStore, host: str, port: int, max_workers: int = MAX_WORKERS) -> None:
+    api = ApiServer(store, max_workers=max_workers)
+    api.warm_up()
+    server = await api.serve(host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        api.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="HTTP API поиска, отчетов и страницы «События»")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--file", default=str(DEFAULT_FILE_PATH), help="выгрузка операций (xlsx)")
+    source.add_argument("--db", help="база операций SQLite (src.ingest) вместо файла выгрузки")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="адрес")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="порт")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="потоков для поиска и отчетов")
+    args = parser.parse_args(argv)
+    configure()
+
+    # База операций (пополняется src.ingest) или файл выгрузки
+    store = load_store(args.db) if args.db else TransactionStore.from_file(args.file)
+    try:
+        asyncio.run(run_server(store, args.host, args.port, args.workers))
+    except KeyboardInterrupt:
+        logger.info("Сервер остановлен")
+
+
+if __name__ == "__main__":
+    main()
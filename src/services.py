@@ -2,21 +2,54 @@ import json
 import logging
 import os
 import re
-from typing import Dict, List
+from typing import Dict, Iterable, List, Union
 
+import numpy as np
+import pandas as pd
+
+from src.config import configure
 from src.df_reader import load_and_convert_excel_to_dict
+from src.metrics import span
+from src.schema import Transaction, as_record
+from src.serialization import PRETTY, dumps
+from src.store import SEARCH_COLUMNS, TransactionStore
+
+# Имя и первая буква фамилии с точкой: «Иван П.»
+PHYSICAL_PERSON_PATTERN = re.compile(r"^[А-Я][а-я]+\s[А-Я]\.$")
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
+def _search_positions(search_term: str, store: TransactionStore, use_index: bool) -> np.ndarray:
+    """
+    Номера строк хранилища, в описании или категории которых есть подстрока
+    """
+    if use_index:
+        return store.search_index().search(search_term)
 
-def simple_search(search: str, transactions: list[dict]) -> str:
-    """Поиск транзакций по ключевому слову в описании или категории"""
+    mask = np.zeros(len(store), dtype=bool)
+    for column in SEARCH_COLUMNS:
+        mask |= store.lowered(column).str.contains(search_term, regex=False, na=False).to_numpy(dtype=bool)
+    return np.flatnonzero(mask)
+
+
+def simple_search(
+    search: str,
+    transactions: Union[list[dict], list[Transaction], TransactionStore],
+    use_index: bool = False,
+    json_mode: str = PRETTY,
+) -> str:
+    """
+    Поиск транзакций по ключевому слову в описании или категории.
+    Список может содержать словари или записи Transaction.
+    Для хранилища транзакций поиск выполняется векторно по заранее
+    приведенным к нижнему регистру столбцам, при use_index=True — по индексу n-грамм.
+    json_mode — режим сериализации ответа (см. src.serialization).
+    """
     # Проверка входных данных
     if not isinstance(search, str):
         logging.error("Неверный тип запроса")
         raise ValueError("Запрос должен быть строкой")
 
-    if not isinstance(transactions, list):
+    if not isinstance(transactions, (list, TransactionStore)):
         logging.error("Неверный тип данных транзакций")
         raise ValueError("Транзакции должны быть списком словарей")
 
@@ -26,27 +59,37 @@ def simple_search(search: str, transactions: list[dict]) -> str:
         # Приведение запроса к нижнему регистру
         search_term = search.lower()
 
+        if isinstance(transactions, TransactionStore):
+            with span("filter.search"):
+                positions = _search_positions(search_term, transactions, use_index)
+                records = transactions.take_records(positions)
+            logging.info(f"Найдено {len(records)} совпадений")
+            with span("serialize.search"):
+                return dumps(records, json_mode, sort_keys=True)
+
         # Фильтрация транзакций с проверкой типов
-        results = [
-            transaction
-            for transaction in transactions
-            if isinstance(transaction, dict)
-            and (
-                (
-                    isinstance(transaction.get("Описание"), str)
-                    and search_term in transaction.get("Описание", "").lower()
-                )
-                or (
-                    isinstance(transaction.get("Категория"), str)
-                    and search_term in transaction.get("Категория", "").lower()
+        with span("filter.search"):
+            results = [
+                transaction
+                for transaction in transactions
+                if isinstance(transaction, (dict, Transaction))
+                and (
+                    (
+                        isinstance(transaction.get("Описание"), str)
+                        and search_term in transaction.get("Описание", "").lower()
+                    )
+                    or (
+                        isinstance(transaction.get("Категория"), str)
+                        and search_term in transaction.get("Категория", "").lower()
+                    )
                 )
-            )
-        ]
+            ]
 
         logging.info(f"Найдено {len(results)} совпадений")
 
         # Конвертация в JSON
-        return json.dumps(results, ensure_ascii=False, indent=4, sort_keys=True)
+        with span("serialize.search"):
+            return dumps([as_record(result) for result in results], json_mode, sort_keys=True)
 
     except Exception as e:
         logging.error(f"Произошла ошибка: {str(e)}")
@@ -57,15 +100,41 @@ def is_physical_person_transfer(description: str) -> bool:
     """
     Проверяет, соответствует ли описание транзакции формату перевода физ лицу
     """
-    # Регулярное выражение для поиска имени и первой буквы фамилии с точкой
-    pattern = r"^[А-Я][а-я]+\s[А-Я]\.$"
-    return bool(re.match(pattern, description))
+    return bool(PHYSICAL_PERSON_PATTERN.match(description))
 
 
-def filter_transfers_to_physical_persons(transactions: List[Dict]) -> List[Dict]:
+def physical_transfer_positions(df: pd.DataFrame) -> np.ndarray:
+    """
+    Векторно находит номера строк с переводами физ лицам.
+    Регулярное выражение применяется только к уникальным описаниям
+    строк категории «Переводы», результат переносится на строки по кодам.
+    """
+    positions = np.flatnonzero((df["Категория"] == "Переводы").to_numpy(dtype=bool))
+    codes, uniques = pd.factorize(df["Описание"].iloc[positions])
+    matched_uniques = np.array(
+        [isinstance(value, str) and is_physical_person_transfer(value) for value in uniques] + [False], dtype=bool
+    )
+    # Код -1 (пропуск) указывает на последний элемент — False
+    result: np.ndarray = positions[matched_uniques[codes]]
+    return result
+
+
+def filter_transfers_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Возвращает переводы физ лицам в виде DataFrame
+    """
+    return df.iloc[physical_transfer_positions(df)]
+
+
+def filter_transfers_to_physical_persons(
+    transactions: Union[List[Dict], List[Transaction], TransactionStore],
+) -> List[Dict]:
     """
     Фильтрует транзакции по критериям переводов физ лицам
     """
+    if isinstance(transactions, TransactionStore):
+        return transactions.take_records(physical_transfer_positions(transactions.df))
+
     filtered_transactions = []
 
     for transaction in transactions:
@@ -74,26 +143,76 @@ def filter_transfers_to_physical_persons(transactions: List[Dict]) -> List[Dict]
             if transaction.get("Категория") == "Переводы" and is_physical_person_transfer(
                 transaction.get("Описание", "")
             ):
-                filtered_transactions.append(transaction)
+                filtered_transactions.append(as_record(transaction))
         except Exception as e:
             logging.error(f"Ошибка при обработке транзакции: {e}")
 
     return filtered_transactions
 
 
-def search_physical_person_transfers(transactions: List[Dict]) -> str:
+def search_physical_person_transfers(
+    transactions: Union[List[Dict], List[Transaction], TransactionStore], json_mode: str = PRETTY
+) -> str:
     """
     Основная функция поиска переводов физ лицам с формированием JSON-ответа
     """
     try:
         # Фильтруем транзакции
-        filtered_transactions = filter_transfers_to_physical_persons(transactions)
+        with span("filter.transfers"):
+            filtered_transactions = filter_transfers_to_physical_persons(transactions)
 
         # Формируем JSON-ответ
         result = {"transactions": filtered_transactions, "Итого": len(filtered_transactions)}
 
         logging.info(f"Найдено {len(filtered_transactions)} переводов физ лицам")
-        return json.dumps(result, ensure_ascii=False, indent=4)
+        with span("serialize.transfers"):
+            return dumps(result, json_mode)
+
+    except Exception as e:
+        logging.error(f"Критическая ошибка: {e}")
+        return json.dumps({"error": str(e)})
+
+
+def simple_search_chunked(search: str, chunks: Iterable[pd.DataFrame], json_mode: str = PRETTY) -> str:
+    """
+    Поиск по ключевому слову в описании или категории по частям данных
+    (например, из iter_operation_chunks): в памяти хранится одна часть и найденные транзакции
+    """
+    if not isinstance(search, str):
+        logging.error("Неверный тип запроса")
+        raise ValueError("Запрос должен быть строкой")
+
+    try:
+        logging.info(f"Начат поиск по частям по запросу: {search}")
+        search_term = search.lower()
+
+        results: List[Dict] = []
+        for chunk in chunks:
+            store = TransactionStore(chunk)
+            results.extend(store.take_records(_search_positions(search_term, store, use_index=False)))
+
+        logging.info(f"Найдено {len(results)} совпадений")
+        return dumps(results, json_mode, sort_keys=True)
+
+    except Exception as e:
+        logging.error(f"Произошла ошибка: {str(e)}")
+        return json.dumps({"error": "Произошла ошибка при обработке запроса"})
+
+
+def search_physical_person_transfers_chunked(chunks: Iterable[pd.DataFrame], json_mode: str = PRETTY) -> str:
+    """
+    Поиск переводов физ лицам по частям данных с формированием JSON-ответа
+    """
+    try:
+        filtered_transactions: List[Dict] = []
+        for chunk in chunks:
+            filtered_transactions.extend(filter_transfers_frame(chunk).to_dict("records"))
+
+        result = {"transactions": filtered_transactions, "Итого": len(filtered_transactions)}
+
+        logging.info(f"Найдено {len(filtered_transactions)} переводов физ лицам")
+        with span("serialize.transfers"):
+            return dumps(result, json_mode)
 
     except Exception as e:
         logging.error(f"Критическая ошибка: {e}")
@@ -102,6 +221,7 @@ def search_physical_person_transfers(transactions: List[Dict]) -> str:
 
 # Пример использования
 if __name__ == "__main__":
+    configure()
     file_path = os.path.join("..", "data", "operations.xlsx")
     df_dict = load_and_convert_excel_to_dict(file_path)
     print(search_physical_person_transfers(df_dict))
@@ -0,0 +1,81 @@
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+SETTINGS_KEYS = ("user_currencies", "user_stocks")
+
+
+def validate_settings(settings: Any) -> Dict[str, Any]:
+    """
+    Проверяет структуру настроек: списки строк user_currencies и user_stocks.
+    Отсутствующие списки заменяются пустыми.
+    """
+    if not isinstance(settings, dict):
+        raise ValueError("Настройки должны быть JSON-объектом")
+
+    validated = dict(settings)
+    for key in SETTINGS_KEYS:
+        values = settings.get(key, [])
+        if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+            raise ValueError(f"Поле {key} должно быть списком строк")
+        validated[key] = [value.strip().upper() for value in values]
+    return validated
+
+
+class SettingsManager:
+    """
+    Настройки пользователя из user_settings.json.
+
+    Файл читается и проверяется один раз, затем настройки берутся из памяти;
+    повторное чтение происходит только при изменении времени изменения или размера файла.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self._settings: Optional[Dict[str, Any]] = None
+        self._version: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> Optional[Tuple[int, int]]:
+        """Версия загруженных настроек: (время изменения, размер) файла"""
+        return self._version
+
+    def file_version(self) -> Optional[Tuple[int, int]]:
+        """Текущая версия файла настроек без его чтения (None, если файл недоступен)"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self) -> Dict[str, Any]:
+        """Актуальные настройки; ошибки чтения и проверки пробрасываются"""
+        stat = os.stat(self.path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            settings = self._settings
+            if settings is None or version != self._version:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    settings = validate_settings(json.load(f))
+                self._settings, self._version = settings, version
+                logger.info(f"Настройки загружены: {self.path}")
+        return settings
+
+
+_managers: Dict[Path, SettingsManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_settings_manager(path: Union[str, Path]) -> SettingsManager:
+    """Общий менеджер настроек для файла (один на процесс)"""
+    path = Path(path)
+    with _managers_lock:
+        if path not in _managers:
+            _managers[path] = SettingsManager(path)
+        return _managers[path]
@@ -0,0 +1,247 @@
+import itertools
+import logging
+from datetime import datetime
+from typing import Dict, Hashable, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from src.dates import parse_date_column
+from src.df_reader import FILL_VALUES, file_version, read_operations
+from src.metrics import span
+from src.schema import apply_schema
+from src.search_index import NgramIndex
+
+logger = logging.getLogger(__name__)
+
+DATE_COLUMN = "Дата операции"
+DATE_FORMAT = "%d.%m.%Y %H:%M:%S"
+SEARCH_COLUMNS = ("Описание", "Категория")
+AMOUNT_COLUMN = "Сумма операции"
+
+# Версии хранилищ, созданных не из файла
+_store_versions = itertools.count(1)
+
+
+def parse_operation_dates(column: pd.Series) -> pd.Series:
+    """
+    Преобразует столбец дат операций в datetime.
+    Сначала пробует точный формат выгрузки, затем — формат,
+    определенный по первому значению, и разбор с dayfirst (см. src.dates.parse_date_column).
+    """
+    return parse_date_column(column, DATE_FORMAT)
+
+
+class TransactionStore:
+    """
+    Единое хранилище транзакций в памяти.
+
+    Данные загружаются один раз, DataFrame хранится в единственном экземпляре,
+    а производные представления (даты, список словарей) вычисляются лениво
+    и переиспользуются всеми функциями.
+
+    version — версия данных для ключей кэша: для загруженного из файла хранилища
+    это путь, размер и время изменения файла, иначе — уникальный номер хранилища.
+    """
+
+    def __init__(self, df: pd.DataFrame, version: Optional[Hashable] = None) -> None:
+        self._df = df
+        self.version: Hashable = version if version is not None else ("store", next(_store_versions))
+        self._records: Optional[list[dict]] = None
+        self._dates: Optional[pd.Series] = None
+        self._lowered: Dict[str, pd.Series] = {}
+        self._date_order: Optional[np.ndarray] = None
+        self._sorted_dates: Optional[np.ndarray] = None
+        self._search_index: Optional[NgramIndex] = None
+        self._daily_rollup: Optional[pd.DataFrame] = None
+        self._category_timeline: Optional[pd.DataFrame] = None
+
+    @classmethod
+    def from_file(cls, file_path: str) -> "TransactionStore":
+        """
+        Загружает транзакции из Excel-файла (через кэш).
+        Столбцы приводятся к компактным типам схемы (см. src.schema).
+        """
+        try:
+            version: Optional[Hashable] = file_version(file_path)
+        except OSError:
+            # Ошибку недоступного файла сообщит read_operations
+            version = None
+        with span("load.read"):
+            df = read_operations(file_path)
+        logger.info(f"Данные загружены в хранилище: {len(df)} записей")
+        with span("load.schema"):
+            df = apply_schema(df.fillna(FILL_VALUES))
+        return cls(df, version=version)
+
+    def __len__(self) -> int:
+        return len(self._df)
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """Канонический DataFrame (не изменять!)"""
+        return self._df
+
+    def view(self) -> pd.DataFrame:
+        """
+        Поверхностная копия DataFrame без копирования данных:
+        замена или добавление столбцов не затрагивает хранилище
+        """
+        return self._df.copy(deep=False)
+
+    @property
+    def dates(self) -> pd.Series:
+        """Даты операций, преобразованные в datetime один раз"""
+        if self._dates is None:
+            with span("load.dates"):
+                self._dates = parse_operation_dates(self._df[DATE_COLUMN])
+        return self._dates
+
+    def _date_index(self) -> tuple[np.ndarray, np.ndarray]:
+        """Порядок сортировки строк по дате и отсортированные даты (строятся один раз)"""
+        if self._date_order is None or self._sorted_dates is None:
+            values = self.dates.to_numpy(dtype="datetime64[ns]")
+            self._date_order = np.argsort(values, kind="stable")
+            self._sorted_dates = values[self._date_order]
+        return self._date_order, self._sorted_dates
+
+    def _valid_sorted_dates(self) -> np.ndarray:
+        """Отсортированные даты без пропусков (NaT при сортировке оказываются в конце)"""
+        sorted_dates = self._date_index()[1]
+        valid: np.ndarray = sorted_dates[~np.isnat(sorted_dates)]
+        return valid
+
+    @property
+    def min_date(self) -> pd.Timestamp:
+        """Самая ранняя дата операции"""
+        valid = self._valid_sorted_dates()
+        return pd.Timestamp(valid[0] if len(valid) else np.datetime64("NaT"))
+
+    @property
+    def max_date(self) -> pd.Timestamp:
+        """Самая поздняя дата операции"""
+        valid = self._valid_sorted_dates()
+        return pd.Timestamp(valid[-1] if len(valid) else np.datetime64("NaT"))
+
+    def date_range_positions(self, start: datetime, end: datetime) -> np.ndarray:
+        """
+        Позиции строк с датой операции в интервале [start, end].
+        Границы ищутся бинарным поиском по отсортированным датам,
+        позиции возвращаются в исходном порядке строк.
+        """
+        order, sorted_dates = self._date_index()
+        lo = np.searchsorted(sorted_dates, pd.Timestamp(start).to_datetime64(), side="left")
+        hi = np.searchsorted(sorted_dates, pd.Timestamp(end).to_datetime64(), side="right")
+        return np.sort(order[lo:hi])
+
+    def date_window(self, positions: Union[Sequence[int], np.ndarray]) -> pd.DataFrame:
+        """Строки с указанными позициями, столбец даты операции — в формате datetime"""
+        positions = np.asarray(positions, dtype=np.int64)
+        window = self._df.iloc[positions].copy(deep=False)
+        window[DATE_COLUMN] = self.dates.to_numpy()[positions]
+        return window
+
+    @property
+    def records(self) -> list[dict]:
+        """Список словарей, формируемый при первом обращении"""
+        if self._records is None:
+            self._records = self._df.to_dict("records")
+        return self._records
+
+    def take_records(self, positions: Union[Sequence[int], np.ndarray]) -> list[dict]:
+        """Словари для строк с указанными позициями (без материализации всего списка)"""
+        if self._records is not None:
+            return [self._records[i] for i in positions]
+        return self._df.iloc[np.asarray(positions, dtype=np.int64)].to_dict("records")
+
+    def lowered(self, column: str) -> pd.Series:
+        """
+        Столбец, приведенный к нижнему регистру (вычисляется один раз).
+        Нестроковые значения становятся NaN.
+        """
+        if column not in self._lowered:
+            if column in self._df.columns:
+                try:
+                    lowered = self._df[column].str.lower()
+                except AttributeError:
+                    # В столбце нет строк
+                    lowered = pd.Series(np.nan, index=self._df.index, dtype=object)
+            else:
+                lowered = pd.Series(np.nan, index=self._df.index, dtype=object)
+            self._lowered[column] = lowered
+        return self._lowered[column]
+
+    def search_index(self) -> NgramIndex:
+        """Индекс n-грамм по описанию и категории (строится при первом обращении)"""
+        if self._search_index is None:
+            self._search_index = NgramIndex([self.lowered(column) for column in SEARCH_COLUMNS])
+            logger.info("Построен поисковый индекс")
+        return self._search_index
+
+    def daily_rollup(self) -> pd.DataFrame:
+        """
+        Сводная таблица: суммы и количество ненулевых операций по дню, категории,
+        знаку суммы и статусу, отсортированная по дню (строится один раз).
+        Столбцы: day, category, sign, status, total, count.
+        """
+        if self._daily_rollup is None:
+            amounts = self._df[AMOUNT_COLUMN]
+            valid = (self.dates.notna() & amounts.notna() & (amounts != 0)).to_numpy(dtype=bool)
+            frame = pd.DataFrame(
+                {
+                    "day": self.dates[valid].dt.normalize(),
+                    "category": self._df["Категория"][valid],
+                    "sign": np.sign(amounts[valid]).astype("int8"),
+                    "status": self._df["Статус"][valid],
+                    "amount": amounts[valid],
+                }
+            )
+            self._daily_rollup = (
+                frame.groupby(["day", "category", "sign", "status"], observed=True, dropna=False)["amount"]
+                .agg(total="sum", count="count")
+                .reset_index()
+            )
+            logger.info(f"Построена сводная таблица по дням: {len(self._daily_rollup)} строк")
+        return self._daily_rollup
+
+    def category_timeline(self) -> pd.DataFrame:
+        """
+        Суммы операций по дате операции и категории в порядке дат (строится один раз).
+        Столбцы: date, category, total, count (непустые суммы), rows (все строки).
+        """
+        if self._category_timeline is None:
+            grouped = self._df[AMOUNT_COLUMN].groupby([self.dates, self._df["Категория"]], observed=True)
+            timeline = grouped.agg(total="sum", count="count", rows="size")
+            timeline.index.names = ["date", "category"]
+            self._category_timeline = timeline.reset_index()
+        return self._category_timeline
+
+    @staticmethod
+    def _slice_by(column: pd.Series, start: datetime, end: datetime, inclusive_end: bool) -> tuple[int, int]:
+        """Границы строк отсортированного столбца дат в интервале [start, end] или [start, end)"""
+        values = column.to_numpy(dtype="datetime64[ns]")
+        lo = np.searchsorted(values, pd.Timestamp(start).to_datetime64(), side="left")
+        hi = np.searchsorted(values, pd.Timestamp(end).to_datetime64(), side="right" if inclusive_end else "left")
+        return int(lo), int(hi)
+
+    def rollup_days(self, start: datetime, stop: datetime) -> pd.DataFrame:
+        """Строки сводной таблицы по дням в интервале [start, stop)"""
+        rollup = self.daily_rollup()
+        lo, hi = self._slice_by(rollup["day"], start, stop, inclusive_end=False)
+        return rollup.iloc[lo:hi]
+
+    def timeline_window(self, start: datetime, end: datetime) -> pd.DataFrame:
+        """Строки category_timeline с датой операции в интервале [start, end]"""
+        timeline = self.category_timeline()
+        lo, hi = self._slice_by(timeline["date"], start, end, inclusive_end=True)
+        return timeline.iloc[lo:hi]
+
+
+def as_store(transactions: Union[pd.DataFrame, TransactionStore]) -> TransactionStore:
+    """
+    Возвращает хранилище для DataFrame (без копирования данных) или само хранилище.
+    Производные столбцы хранятся в хранилище, исходный DataFrame не изменяется.
+    """
+    if isinstance(transactions, TransactionStore):
+        return transactions
+    return TransactionStore(transactions)
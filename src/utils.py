@@ -1,103 +1,174 @@
-import json
 import logging
-import os
-from datetime import timedelta
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 import pandas as pd
-import requests
-from dotenv import load_dotenv
 
-# Загрузка переменных из .env-файла
-load_dotenv()
+from src.api_cache import SHORT_TTL, get_api_cache
+from src.config import get_env
+from src.dates import parse_date
+from src.http_client import POOL_SIZE, http_get
+from src.metrics import timed
+from src.settings import get_settings_manager
+from src.store import TransactionStore, as_store
 
-API_KEY = os.getenv("APILAYER_KEY")
-API_NINJAS_KEY = os.getenv("API_NINJAS_KEY")
+# Имена переменных окружения (или .env-файла) с ключами API
+API_KEY_VAR = "APILAYER_KEY"
+API_NINJAS_KEY_VAR = "API_NINJAS_KEY"
+
+EXCHANGE_RATES_URL = "https://api.apilayer.com/exchangerates_data"
+STOCK_HISTORY_URL = "https://api.api-ninjas.com/v1/stockpricehistorical"
+STOCK_PRICE_URL = "https://api.api-ninjas.com/v1/stockprice"
+
+EXCHANGE_RATES_ENDPOINT = "exchangerates"
+STOCK_HISTORY_ENDPOINT = "stockpricehistorical"
+
+# Максимальная длина периода одного запроса timeseries (дней)
+TIMESERIES_MAX_DAYS = 365
+
+# Максимум одновременных запросов котировок (не больше пула соединений)
+QUOTES_MAX_WORKERS = POOL_SIZE
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
 
-def parse_date(date_str: str) -> pd.Timestamp:
+def settings_path() -> Path:
+    """Путь к файлу настроек пользователя"""
+    return Path(__file__).parent.parent / "data" / "user_settings.json"
+
+
+def load_user_settings() -> Dict[str, Any]:
+    """
+    Настройки пользователя: файл читается один раз
+    и перечитывается только при его изменении.
+    """
+    return get_settings_manager(settings_path()).get()
+
+
+def settings_version() -> Optional[Tuple[int, int]]:
+    """Версия файла настроек пользователя (время изменения, размер) для ключей кэша"""
+    return get_settings_manager(settings_path()).file_version()
+
+
+def _range_start(date: pd.Timestamp, range_type: str, min_date: pd.Timestamp) -> pd.Timestamp:
     """
-    Универсальный парсер для дат: автоматически определяет dayfirst.
+    Начало диапазона дат для W/M/Y/ALL.
     """
-    # YYYY-MM-DD или YYYY/MM/DD (дефис или слэш на позиции 4)
-    if ("-" in date_str and date_str.index("-") == 4) or ("/" in date_str and date_str.index("/") == 4):
-        return pd.to_datetime(date_str, dayfirst=False)
-    # Всё остальное — dayfirst: ДД.ММ.ГГГГ, ДД-ММ-ГГГГ, ДД/ММ/ГГГГ и т.п.
-    return pd.to_datetime(date_str, dayfirst=True)
+    if range_type == "W":
+        return date - timedelta(days=date.weekday())  # Понедельник текущей недели
+    if range_type == "M":
+        return date.replace(day=1)  # Первый день месяца
+    if range_type == "Y":
+        return date.replace(month=1, day=1)  # Первый день года
+    if range_type == "ALL":
+        return min_date  # Минимальная дата
+    return date  # Просто сам день (fallback)
 
 
-def filter_by_range(df: pd.DataFrame, date_str: str, range_type: str = "M") -> pd.DataFrame:
+@timed("filter.range")
+def filter_by_range(df: Union[pd.DataFrame, TransactionStore], date_str: str, range_type: str = "M") -> pd.DataFrame:
     """
     Фильтрует DataFrame по диапазону дат.
+    Исходный DataFrame не изменяется: даты разбираются и сортируются
+    в хранилище транзакций, диапазон находится бинарным поиском.
     """
     logger.info(f"Фильтрация данных: date={date_str}, range_type={range_type}")
+    store = as_store(df)
     try:
         date = parse_date(date_str)
-        df["Дата операции"] = pd.to_datetime(
-            df["Дата операции"], dayfirst=True
-        )  # Можно вынести в parse_date, если надо
-        if range_type == "W":
-            start = date - timedelta(days=date.weekday())  # Понедельник текущей недели
-        elif range_type == "M":
-            start = date.replace(day=1)  # Первый день месяца
-        elif range_type == "Y":
-            start = date.replace(month=1, day=1)  # Первый день года
-        elif range_type == "ALL":
-            start = df["Дата операции"].min()  # Минимальная дата
-        else:
-            start = date  # Просто сам день (fallback)
+        start = _range_start(date, range_type, store.min_date)
         end = date
         logger.info(f"Диапазон дат: {start} - {end}")
-        return df.loc[(df["Дата операции"] >= start) & (df["Дата операции"] <= end)]
+        return store.date_window(store.date_range_positions(start, end))
     except Exception as e:
         logger.error(f"Ошибка фильтрации по дате: {e}")
-        return df.iloc[0:0]  # Возвращаем пустой DataFrame, если ошибка
+        return store.df.iloc[0:0]  # Возвращаем пустой DataFrame, если ошибка
+
+
+def _expense_parts(df: pd.DataFrame) -> Tuple[float, pd.Series]:
+    """
+    Частичные суммы расходов: общая и по категориям (со знаком)
+    """
+    exp = df[(df["Сумма операции"] < 0) & (df["Статус"] == "OK")]
+    return exp["Сумма операции"].sum(), exp.groupby("Категория", observed=True)["Сумма операции"].sum()
+
+
+def _income_parts(df: pd.DataFrame) -> Tuple[float, pd.Series]:
+    """
+    Частичные суммы поступлений: общая и по категориям
+    """
+    inc = df[(df["Сумма операции"] > 0) & (df["Статус"] == "OK")]
+    return inc["Сумма операции"].sum(), inc.groupby("Категория", observed=True)["Сумма операции"].sum()
+
+
+def _combine_parts(parts: Iterable[Tuple[float, pd.Series]]) -> Tuple[float, pd.Series]:
+    """
+    Складывает частичные суммы, посчитанные по частям данных
+    """
+    total = 0.0
+    by_category = pd.Series(dtype="float64")
+    for part_total, part_by_category in parts:
+        total += part_total
+        by_category = by_category.add(part_by_category, fill_value=0)
+    return total, by_category
+
+
+def _expenses_result(total_sum: float, by_category: pd.Series) -> Dict[str, Any]:
+    """
+    Формирует ответ о расходах из общей суммы и сумм по категориям
+    """
+    total = round(abs(total_sum), 2)  # округление здесь
+
+    cat_exp = by_category.abs().sort_values(ascending=False)
+
+    # округляем значения прямо в comprehension
+    cats = {k: round(v, 2) for k, v in cat_exp.head(7).items()}
+    other = round(cat_exp.iloc[7:].sum(), 2)
+    if other > 0:
+        cats["Остальное"] = other
+
+    # округляем переводы и наличные также inline
+    cash_trans = by_category[by_category.index.isin(["Переводы", "Наличные"])]
+    trans_sum = {k: round(v, 2) for k, v in cash_trans.abs().sort_values(ascending=False).items()}
+
+    return {
+        "expenses": {
+            "Общая сумма": total,
+            "Основные": cats,
+            "Переводы и наличные": trans_sum,
+        }
+    }
+
+
+def _incomes_result(total_sum: float, by_category: pd.Series) -> Dict[str, Any]:
+    """
+    Формирует ответ о поступлениях из общей суммы и сумм по категориям
+    """
+    total = round(total_sum, 2)  # округление общей суммы
+
+    # все значения категорий округляются в comprehension
+    cats = {k: round(v, 2) for k, v in by_category.sort_values(ascending=False).items()}
 
+    return {"incomes": {"Общая сумма": total, "Основные": cats}}
 
+
+@timed("aggregate.expenses")
 def get_expenses_summary(df: pd.DataFrame) -> Dict[str, Any]:
     """
     Собирает данные о расходах согласно ТЗ и возвращает результат с ключом 'expenses'.
     """
     logger.info("Агрегация расходов...")
     try:
-        exp = df[(df["Сумма операции"] < 0) & (df["Статус"] == "OK")]
-        total = round(abs(exp["Сумма операции"].sum()), 2)  # округление здесь
-
-        cat_exp = exp.groupby("Категория")["Сумма операции"].sum().abs().sort_values(ascending=False)
-
-        # округляем значения прямо в comprehension
-        cats = {k: round(v, 2) for k, v in cat_exp.head(7).items()}
-        other = round(cat_exp.iloc[7:].sum(), 2)
-        if other > 0:
-            cats["Остальное"] = other
-
-        # округляем переводы и наличные также inline
-        cash_trans = exp[exp["Категория"].isin(["Переводы", "Наличные"])]
-        trans_sum = {
-            k: round(v, 2)
-            for k, v in cash_trans.groupby("Категория")["Сумма операции"]
-            .sum()
-            .abs()
-            .sort_values(ascending=False)
-            .items()
-        }
-
-        return {
-            "expenses": {
-                "Общая сумма": total,
-                "Основные": cats,
-                "Переводы и наличные": trans_sum,
-            }
-        }
+        return _expenses_result(*_expense_parts(df))
     except Exception as e:
         logger.error("Ошибка агрегации расходов: %s", e)
         return {"expenses": {"Общая сумма": 0.0, "Основные": {}, "Переводы и наличные": {}}}
 
 
+@timed("aggregate.incomes")
 def get_incomes_summary(df: pd.DataFrame) -> Dict[str, Any]:
     """
     Собирает данные о поступлениях согласно ТЗ и возвращает
@@ -105,41 +176,155 @@ def get_incomes_summary(df: pd.DataFrame) -> Dict[str, Any]:
     """
     logger.info("Агрегация поступлений...")
     try:
-        inc = df[(df["Сумма операции"] > 0) & (df["Статус"] == "OK")]
-        total = round(inc["Сумма операции"].sum(), 2)  # округление общей суммы
+        return _incomes_result(*_income_parts(df))
+    except Exception as e:
+        logger.error("Ошибка агрегации поступлений: %s", e)
+        return {"incomes": {"Общая сумма": 0.0, "Основные": {}}}
+
+
+def get_expenses_summary_chunked(chunks: Iterable[pd.DataFrame]) -> Dict[str, Any]:
+    """
+    То же, что get_expenses_summary, но по частям данных (например, из iter_operation_chunks):
+    в памяти хранятся только суммы по категориям.
+    Для фильтрации по датам каждую часть можно пропустить через filter_by_range.
+    """
+    logger.info("Агрегация расходов по частям...")
+    try:
+        return _expenses_result(*_combine_parts(_expense_parts(chunk) for chunk in chunks))
+    except Exception as e:
+        logger.error("Ошибка агрегации расходов: %s", e)
+        return {"expenses": {"Общая сумма": 0.0, "Основные": {}, "Переводы и наличные": {}}}
+
+
+def get_incomes_summary_chunked(chunks: Iterable[pd.DataFrame]) -> Dict[str, Any]:
+    """
+    То же, что get_incomes_summary, но по частям данных
+    """
+    logger.info("Агрегация поступлений по частям...")
+    try:
+        return _incomes_result(*_combine_parts(_income_parts(chunk) for chunk in chunks))
+    except Exception as e:
+        logger.error("Ошибка агрегации поступлений: %s", e)
+        return {"incomes": {"Общая сумма": 0.0, "Основные": {}}}
+
+
+def _rollup_parts(rollup: pd.DataFrame, sign: int) -> Tuple[float, pd.Series]:
+    """
+    Частичные суммы по строкам сводной таблицы по дням (TransactionStore.daily_rollup)
+    """
+    rows = rollup[(rollup["sign"] == sign) & (rollup["status"] == "OK")]
+    by_category = rows.groupby("category", observed=True)["total"].sum()
+    by_category.index.name = "Категория"
+    return rows["total"].sum(), by_category
+
+
+@timed("aggregate.range_summaries")
+def get_range_summaries(
+    transactions: Union[pd.DataFrame, TransactionStore], date_str: str, range_type: str = "M"
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Сводки расходов и поступлений за диапазон W/M/Y/ALL, как
+    get_expenses_summary(filter_by_range(...)) и get_incomes_summary(filter_by_range(...)).
+    Полные дни диапазона берутся из сводной таблицы по дням,
+    исходные строки читаются только для неполных дней на границах.
+    """
+    store = as_store(transactions)
+    try:
+        date = parse_date(date_str)
+        start = _range_start(date, range_type, store.min_date)
+        end = date
+        logger.info(f"Сводки по сводной таблице: {start} - {end}")
+
+        # Полные дни: [first_day, stop_day)
+        first_day = start.normalize()
+        if first_day < start:
+            first_day += timedelta(days=1)
+        stop_day = (end + pd.Timedelta(1, "ns")).normalize()
+
+        if first_day >= stop_day:
+            boundaries = [(start, end)]
+            rollup = store.daily_rollup().iloc[0:0]
+        else:
+            boundaries = [(start, first_day - pd.Timedelta(1, "ns")), (stop_day, end)]
+            rollup = store.rollup_days(first_day, stop_day)
+
+        positions = [store.date_range_positions(lo, hi) for lo, hi in boundaries if lo <= hi]
+        raw = [store.date_window(window) for window in positions if len(window)]
+        expense_parts = [_rollup_parts(rollup, -1)] + [_expense_parts(window) for window in raw]
+        income_parts = [_rollup_parts(rollup, 1)] + [_income_parts(window) for window in raw]
+        return _expenses_result(*_combine_parts(expense_parts)), _incomes_result(*_combine_parts(income_parts))
+    except Exception as e:
+        logger.error(f"Ошибка сводок по сводной таблице: {e}")
+        df_filtered = filter_by_range(store, date_str, range_type)
+        return get_expenses_summary(df_filtered), get_incomes_summary(df_filtered)
+
+
+def get_expenses_summary_from_parts(total_sum: float, by_category: pd.Series) -> Dict[str, Any]:
+    """
+    То же, что get_expenses_summary, но по заранее посчитанным суммам
+    (например, из агрегатов OperationsDB.summary_parts)
+    """
+    try:
+        return _expenses_result(total_sum, by_category)
+    except Exception as e:
+        logger.error("Ошибка агрегации расходов: %s", e)
+        return {"expenses": {"Общая сумма": 0.0, "Основные": {}, "Переводы и наличные": {}}}
 
-        # все значения категорий округляются в comprehension
-        cats = {
-            k: round(v, 2)
-            for k, v in inc.groupby("Категория")["Сумма операции"].sum().sort_values(ascending=False).items()
-        }
 
-        return {"incomes": {"Общая сумма": total, "Основные": cats}}
+def get_incomes_summary_from_parts(total_sum: float, by_category: pd.Series) -> Dict[str, Any]:
+    """
+    То же, что get_incomes_summary, но по заранее посчитанным суммам
+    """
+    try:
+        return _incomes_result(total_sum, by_category)
     except Exception as e:
         logger.error("Ошибка агрегации поступлений: %s", e)
         return {"incomes": {"Общая сумма": 0.0, "Основные": {}}}
 
 
+def _cache_ttl(date: pd.Timestamp) -> Optional[float]:
+    """
+    Время жизни записи кэша: данные за прошедшие дни хранятся бессрочно,
+    за текущий день (и будущие даты) — недолго
+    """
+    return None if date.date() < datetime.now().date() else SHORT_TTL
+
+
+@timed("fetch.exchange_rates")
 def get_exchange_rates(date_str: str) -> Dict[str, Any]:
     """
     Получает курсы валют USD и EUR относительно RUB на дату date_str.
     """
-    settings_path = Path(__file__).parent.parent / "data" / "user_settings.json"
     try:
-        with open(settings_path, "r", encoding="utf-8") as f:
-            settings = json.load(f)
-        currencies = settings.get("user_currencies", [])
+        currencies = load_user_settings()["user_currencies"]
         if not currencies:
             raise ValueError("Нет валют в настройках")
-        symbols = ",".join(currencies)
-        date_iso = parse_date(date_str).strftime("%Y-%m-%d")
-        url = f"https://api.apilayer.com/exchangerates_data/{date_iso}"
-        params = {"base": "RUB", "symbols": symbols}
-        headers = {"apikey": API_KEY}
-        response = requests.get(url, params=params, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        rates = data.get("rates", {})
+        date = parse_date(date_str)
+        date_iso = date.strftime("%Y-%m-%d")
+
+        # Курсы за прошедшие даты берутся из кэша, запрашиваются только недостающие валюты
+        cache = get_api_cache()
+        rates = {}
+        if cache is not None:
+            for currency in currencies:
+                cached = cache.get(EXCHANGE_RATES_ENDPOINT, date_iso, currency)
+                if cached is not None:
+                    rates[currency] = cached
+        missing = [c for c in currencies if c not in rates]
+
+        if missing:
+            url = f"{EXCHANGE_RATES_URL}/{date_iso}"
+            params = {"base": "RUB", "symbols": ",".join(missing)}
+            headers = {"apikey": get_env(API_KEY_VAR)}
+            response = http_get(url, params=params, headers=headers)
+            response.raise_for_status()
+            data = response.json()
+            fetched = data.get("rates", {})
+            if cache is not None:
+                for currency, rate in fetched.items():
+                    cache.set(EXCHANGE_RATES_ENDPOINT, date_iso, currency, rate, ttl=_cache_ttl(date))
+            rates.update(fetched)
+
         result = [{"currency": c, "rate": round(1 / rates[c], 2)} for c in currencies if c in rates and rates[c]]
         logger.info(f"Курсы валют: {result}")
         return {"currency_rates": result}
@@ -148,52 +333,151 @@ def get_exchange_rates(date_str: str) -> Dict[str, Any]:
         return {"currency_rates": []}
 
 
-def get_sp500_quotes(date_str: str) -> Dict[str, Any]:
-    """Получает исторические котировки акций S&P500 (если доступно через API Ninjas)"""
-    settings_path = Path(__file__).parent.parent / "data" / "user_settings.json"
-    try:
-        with open(settings_path, "r", encoding="utf-8") as f:
-            settings = json.load(f)
-        tickers = settings.get("user_stocks", [])
-    except Exception as e:
-        logger.error("Ошибка чтения user_settings.json: %s", e)
-        return {"stock_prices": []}
+def _date_spans(dates: List[date]) -> List[Tuple[date, date]]:
+    """
+    Группирует отсортированные даты в периоды не длиннее TIMESERIES_MAX_DAYS
+    """
+    spans: List[Tuple[date, date]] = []
+    for day in sorted(dates):
+        if spans and (day - spans[-1][0]).days < TIMESERIES_MAX_DAYS:
+            spans[-1] = (spans[-1][0], day)
+        else:
+            spans.append((day, day))
+    return spans
 
-    # Форматируем дату и диапазон времени в часах (на всякий случай 6 часов)
-    start = int(parse_date(date_str).timestamp())
-    end = int((parse_date(date_str) + timedelta(hours=6)).timestamp())
 
-    url_hist = "https://api.api-ninjas.com/v1/stockpricehistorical"
-    url_now = "https://api.api-ninjas.com/v1/stockprice"
-    headers = {"X-Api-Key": API_NINJAS_KEY}
-    results = []
+def get_exchange_rates_batch(dates: Iterable[str], currencies: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Курсы валют к рублю сразу на набор дат.
 
-    for ticker in tickers:
+    Недостающие в кэше даты запрашиваются через timeseries-эндпоинт
+    (один запрос на период до года), курсы сохраняются в кэш API по тем же
+    ключам, что и у get_exchange_rates, поэтому последующие запросы
+    на эти даты не обращаются к сети.
+    Возвращает таблицу: индекс — даты, столбцы — валюты, значения — рублей за единицу валюты.
+    """
+    if currencies is None:
         try:
-            # Сначала пытаемся получить исторические данные
-            params = {"ticker": ticker, "period": "1h", "start": start, "end": end}
-            response = requests.get(url_hist, headers=headers, params=params)
+            currencies = load_user_settings()["user_currencies"]
+        except Exception as e:
+            logger.error("Ошибка чтения user_settings.json: %s", e)
+            currencies = []
+
+    days = sorted({parse_date(d).date() for d in dates})
+    cache = get_api_cache()
+    table: Dict[date, Dict[str, float]] = {day: {} for day in days}
 
-            if response.status_code == 400:
-                # Если исторические данные недоступны, берём текущую цену
-                response = requests.get(url_now, headers=headers, params={"ticker": ticker})
+    if cache is not None:
+        for day in days:
+            for currency in currencies:
+                cached = cache.get(EXCHANGE_RATES_ENDPOINT, day.isoformat(), currency)
+                if cached is not None:
+                    table[day][currency] = cached
 
+    missing_days = [day for day in days if any(c not in table[day] for c in currencies)]
+    spans = _date_spans(missing_days)
+    for start, end in spans:
+        try:
+            params = {
+                "start_date": start.isoformat(),
+                "end_date": end.isoformat(),
+                "base": "RUB",
+                "symbols": ",".join(currencies),
+            }
+            response = http_get(
+                f"{EXCHANGE_RATES_URL}/timeseries", params=params, headers={"apikey": get_env(API_KEY_VAR)}
+            )
             response.raise_for_status()
-            data = response.json()
+            for day_iso, rates in response.json().get("rates", {}).items():
+                day = date.fromisoformat(day_iso)
+                if cache is not None:
+                    for currency, rate in rates.items():
+                        cache.set(EXCHANGE_RATES_ENDPOINT, day_iso, currency, rate, ttl=_cache_ttl(pd.Timestamp(day)))
+                if day in table:
+                    table[day].update(rates)
+        except Exception as e:
+            logger.error("Ошибка получения курсов валют за %s - %s: %s", start, end, e)
 
-            # Если это исторические данные — берём 'close' последней записи
-            if isinstance(data, list) and len(data) > 0:
-                close = data[-1].get("close")
-                price = round(close, 2) if isinstance(close, (int, float)) else None
-            elif isinstance(data, dict) and "price" in data:
-                price = round(data["price"], 2)
-            else:
-                price = None
+    logger.info(f"Курсы валют получены для {len(days)} дат, запросов к API: {len(spans)}")
+    frame = pd.DataFrame(
+        [[table[day].get(currency) for currency in currencies] for day in days],
+        index=pd.DatetimeIndex(days, name="date"),
+        columns=currencies,
+        dtype=float,
+    )
+    # API отдает курс рубля к валюте, переводим в рубли за единицу валюты
+    return 1 / frame
 
-            results.append({"stock": ticker, "price": price})
-        except Exception as e:
-            logger.error("Ошибка при получении котировок %s: %s", ticker, e)
-            results.append({"stock": ticker, "price": None})
+
+def _fetch_stock_price(ticker: str, start: int, end: int) -> Dict[str, Any]:
+    """
+    Получает цену одной акции: сначала исторические данные, при их отсутствии — текущую цену.
+    Ошибка по одному тикеру не влияет на остальные.
+    """
+    headers = {"X-Api-Key": get_env(API_NINJAS_KEY_VAR)}
+    cache = get_api_cache()
+    if cache is not None:
+        cached = cache.get(STOCK_HISTORY_ENDPOINT, str(start), ticker)
+        if cached is not None:
+            return {"stock": ticker, "price": cached}
+
+    try:
+        # Сначала пытаемся получить исторические данные
+        params = {"ticker": ticker, "period": "1h", "start": start, "end": end}
+        response = http_get(STOCK_HISTORY_URL, headers=headers, params=params)
+        historical = True
+
+        if response.status_code == 400:
+            # Если исторические данные недоступны, берём текущую цену
+            response = http_get(STOCK_PRICE_URL, headers=headers, params={"ticker": ticker})
+            historical = False
+
+        response.raise_for_status()
+        data = response.json()
+
+        # Если это исторические данные — берём 'close' последней записи
+        if isinstance(data, list) and len(data) > 0:
+            close = data[-1].get("close")
+            price = round(close, 2) if isinstance(close, (int, float)) else None
+        elif isinstance(data, dict) and "price" in data:
+            price = round(data["price"], 2)
+        else:
+            price = None
+
+        if cache is not None and price is not None:
+            # Закрытая историческая цена не меняется, текущая — кэшируется ненадолго
+            ttl = None if historical and end < time.time() else SHORT_TTL
+            cache.set(STOCK_HISTORY_ENDPOINT, str(start), ticker, price, ttl=ttl)
+        return {"stock": ticker, "price": price}
+    except Exception as e:
+        logger.error("Ошибка при получении котировок %s: %s", ticker, e)
+        return {"stock": ticker, "price": None}
+
+
+@timed("fetch.sp500_quotes")
+def get_sp500_quotes(date_str: str, max_workers: int = QUOTES_MAX_WORKERS) -> Dict[str, Any]:
+    """
+    Получает исторические котировки акций S&P500 (если доступно через API Ninjas).
+    Тикеры запрашиваются параллельно, не более max_workers одновременно;
+    порядок результатов совпадает с порядком в настройках.
+    """
+    try:
+        tickers = load_user_settings()["user_stocks"]
+    except Exception as e:
+        logger.error("Ошибка чтения user_settings.json: %s", e)
+        return {"stock_prices": []}
+
+    # Форматируем дату и диапазон времени в часах (на всякий случай 6 часов)
+    date = parse_date(date_str)
+    start = int(date.timestamp())
+    end = int((date + timedelta(hours=6)).timestamp())
+
+    workers = max(1, min(max_workers, len(tickers)))
+    if workers == 1:
+        results = [_fetch_stock_price(ticker, start, end) for ticker in tickers]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="quotes") as executor:
+            results = list(executor.map(lambda ticker: _fetch_stock_price(ticker, start, end), tickers))
 
     logger.info(f"Котировки на {date_str} получены.")
     return {"stock_prices": results}
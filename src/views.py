@@ -1,48 +1,291 @@
+import asyncio
+import copy
 import json
 import logging
 import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
 
-import pandas as pd
+from src.api_cache import SHORT_TTL
+from src.config import configure
+from src.df_reader import file_version
+from src.metrics import span, timed
+from src.serialization import PRETTY, dumps
+from src.store import TransactionStore
+from src.utils import get_exchange_rates, get_range_summaries, get_sp500_quotes, parse_date, settings_version
 
-from src.utils import filter_by_range, get_exchange_rates, get_expenses_summary, get_incomes_summary, get_sp500_quotes
+logger = logging.getLogger(__name__)
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+FILE_PATH = os.path.join("..", "data", "operations.xlsx")
 
-logger = logging.getLogger(__name__)
+# Число запомненных ответов страницы «События»
+EVENTS_CACHE_SIZE = 64
+
+# Общий срок ожидания курсов и котировок (секунды) с момента отправки запросов;
+# по истечении ответ формируется с пустыми курсами или котировками
+EVENTS_TIMEOUT = 15.0
+
+# Ответы API при превышении срока (как при ошибке запроса)
+RATES_FALLBACK: Dict[str, Any] = {"currency_rates": []}
+QUOTES_FALLBACK: Dict[str, Any] = {"stock_prices": []}
+
+# Режимы кэша get_events: весь ответ, только локальные сводки, без кэша
+CACHE_FULL = "full"
+CACHE_LOCAL = "local"
+CACHE_NONE = "none"
+
+
+class EventsCache:
+    """
+    LRU-кэш ответов страницы «События» ограниченного размера.
+    Ключи включают версии данных и настроек, поэтому при изменении файлов
+    устаревшие записи не используются и со временем вытесняются.
+    Записи с ttl устаревают через ttl секунд.
+    """
+
+    def __init__(self, maxsize: int = EVENTS_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Значение по ключу или None, если записи нет или она устарела"""
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None and (item[1] is None or item[1] > time.time()):
+                self._items.move_to_end(key)
+                self.hits += 1
+                return item[0]
+            if item is not None:
+                del self._items[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Сохраняет значение (ttl=None — без срока), вытесняя самые давно использованные записи"""
+        expires_at = None if ttl is None else time.time() + ttl
+        with self._lock:
+            self._items[key] = (value, expires_at)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        """Удаляет все записи и обнуляет счетчики"""
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> Dict[str, int]:
+        """Размер кэша и счетчики попаданий и промахов"""
+        with self._lock:
+            return {"size": len(self._items), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+events_cache = EventsCache()
+
+
+def clear_events_cache() -> None:
+    """Явная очистка кэша страницы «События»"""
+    events_cache.clear()
+    logger.info("Кэш событий очищен")
+
+
+def _cache_keys(
+    date_str: str, range_type: str, store: Optional[TransactionStore], json_mode: str = PRETTY
+) -> Optional[Tuple[Tuple[Hashable, ...], Tuple[Hashable, ...]]]:
+    """
+    Ключи кэша всего ответа и локальных сводок: нормализованная дата, диапазон,
+    версия данных (для всего ответа — также версия настроек и режим сериализации).
+    None — если версию данных определить нельзя.
+    """
+    try:
+        date_iso = parse_date(date_str).isoformat()
+        data_version = store.version if store is not None else file_version(FILE_PATH)
+    except (ValueError, OSError):
+        return None
+    local_key = ("local", date_iso, range_type, data_version)
+    return ("events", date_iso, range_type, data_version, settings_version(), json_mode), local_key
+
+
+def _api_complete(exchange_rates: Dict, sp500_quotes: Dict) -> bool:
+    """Курсы и котировки получены полностью (нет пустых списков и цен None после сбоя API)"""
+    quotes = sp500_quotes.get("stock_prices") or []
+    return (
+        bool(exchange_rates.get("currency_rates"))
+        and bool(quotes)
+        and all(quote.get("price") is not None for quote in quotes)
+    )
+
+
+def _local_summaries(store: TransactionStore, date_str: str, range_type: str) -> Tuple[Dict, Dict]:
+    """
+    Локальная часть страницы «События»: расходы и поступления за диапазон дат
+    (по сводной таблице по дням хранилища)
+    """
+    logger.info(f"Данные считаны: {len(store)} записей")
+    return get_range_summaries(store, date_str, range_type)
+
+
+def _wait_result(future: "Future[Dict]", deadline: float, fallback: Dict, name: str) -> Dict:
+    """Результат запроса к API, если он готов до срока deadline (time.monotonic), иначе fallback"""
+    try:
+        return future.result(timeout=max(0.0, deadline - time.monotonic()))
+    except FutureTimeoutError:
+        logger.error(f"Превышено время ожидания ({EVENTS_TIMEOUT} с): {name}")
+        return copy.deepcopy(fallback)
+
+
+async def _fetch_async(func: Callable[[str], Dict], date_str: str, fallback: Dict, name: str) -> Dict:
+    """Запрос к API в потоке с общим сроком EVENTS_TIMEOUT; по истечении — fallback"""
+    try:
+        return await asyncio.wait_for(asyncio.to_thread(func, date_str), EVENTS_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.error(f"Превышено время ожидания ({EVENTS_TIMEOUT} с): {name}")
+        return copy.deepcopy(fallback)
 
 
-def get_events(date_str: str, range_type: str = "M") -> str:
+@timed("serialize.events")
+def _events_json(
+    expenses: Dict, incomes: Dict, exchange_rates: Dict, sp500_quotes: Dict, json_mode: str = PRETTY
+) -> str:
+    """Формирует JSON-ответ страницы «События»"""
+    result: Dict[str, Any] = {
+        "Расходы": expenses,
+        "Поступления": incomes,
+        "Курс валют": exchange_rates,
+        "Стоимость акций S&P 500": sp500_quotes,
+    }
+    logger.info("JSON-ответ сформирован")
+    return dumps(result, json_mode)
+
+
+@timed("events.total")
+def get_events(
+    date_str: str,
+    range_type: str = "M",
+    store: Optional[TransactionStore] = None,
+    cache_mode: str = CACHE_FULL,
+    json_mode: str = PRETTY,
+) -> str:
     """
     Главная функция страницы «События».
+    Если передано хранилище транзакций, данные повторно не загружаются.
+    Курсы валют и котировки запрашиваются в фоновых потоках,
+    пока выполняется локальная агрегация; ответы API ждут не дольше EVENTS_TIMEOUT.
+
+    cache_mode: CACHE_FULL — повторный запрос с теми же датой, диапазоном,
+    данными и настройками отдается из кэша; CACHE_LOCAL — из кэша берутся
+    только сводки расходов и поступлений, курсы и котировки запрашиваются заново;
+    CACHE_NONE — без кэша.
+    json_mode — режим сериализации ответа (см. src.serialization).
+    """
+    logger.info(f"Получение событий на дату {date_str}, диапазон {range_type}")
+    try:
+        keys = _cache_keys(date_str, range_type, store, json_mode) if cache_mode != CACHE_NONE else None
+        if keys is not None and cache_mode == CACHE_FULL:
+            cached = events_cache.get(keys[0])
+            if cached is not None:
+                logger.info("Ответ взят из кэша событий")
+                return str(cached)
+        local = events_cache.get(keys[1]) if keys is not None else None
+
+        if local is None and store is None:
+            store = TransactionStore.from_file(FILE_PATH)
+
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="events")
+        try:
+            deadline = time.monotonic() + EVENTS_TIMEOUT
+            rates_future = executor.submit(get_exchange_rates, date_str)
+            quotes_future = executor.submit(get_sp500_quotes, date_str)
+
+            if local is None and store is not None:
+                local = _local_summaries(store, date_str, range_type)
+            # Время ожидания API сверх локальной агрегации
+            with span("fetch.wait"):
+                exchange_rates = _wait_result(rates_future, deadline, RATES_FALLBACK, "курсы валют")
+                sp500_quotes = _wait_result(quotes_future, deadline, QUOTES_FALLBACK, "котировки S&P 500")
+        finally:
+            # Не ждем оставшиеся запросы, если произошла ошибка
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return _store_events(keys, local, exchange_rates, sp500_quotes, cache_mode, json_mode)
+    except Exception as e:
+        logger.error(f"Ошибка формирования событий: {e}")
+        return json.dumps({"error": str(e)}, ensure_ascii=False)
+
+
+def _store_events(
+    keys: Optional[Tuple[Tuple[Hashable, ...], Tuple[Hashable, ...]]],
+    local: Optional[Tuple[Dict, Dict]],
+    exchange_rates: Dict,
+    sp500_quotes: Dict,
+    cache_mode: str,
+    json_mode: str = PRETTY,
+) -> str:
+    """
+    Формирует ответ и запоминает его (и локальные сводки) в кэше.
+    Весь ответ запоминается на SHORT_TTL, только если курсы и котировки получены полностью:
+    иначе временный сбой API закрепился бы в кэше. Сводки хранятся без срока.
+    """
+    if local is None:
+        raise ValueError("Нет сводок расходов и поступлений")
+    result = _events_json(*local, exchange_rates, sp500_quotes, json_mode)
+    if keys is not None:
+        events_cache.set(keys[1], local)
+        if cache_mode == CACHE_FULL and _api_complete(exchange_rates, sp500_quotes):
+            # Не дольше SHORT_TTL и для прошедших дат: если исторической котировки нет,
+            # в ответе текущая цена, которую кэш API тоже хранит только SHORT_TTL
+            events_cache.set(keys[0], result, ttl=SHORT_TTL)
+    return result
+
+
+async def get_events_async(
+    date_str: str,
+    range_type: str = "M",
+    store: Optional[TransactionStore] = None,
+    cache_mode: str = CACHE_FULL,
+    json_mode: str = PRETTY,
+) -> str:
+    """
+    Асинхронный вариант get_events: загрузка, агрегация и запросы к API
+    выполняются в потоках, результат и правила кэширования те же.
     """
     logger.info(f"Получение событий на дату {date_str}, диапазон {range_type}")
-    file_path = os.path.join("..", "data", "operations.xlsx")
     try:
+        keys = _cache_keys(date_str, range_type, store, json_mode) if cache_mode != CACHE_NONE else None
+        if keys is not None and cache_mode == CACHE_FULL:
+            cached = events_cache.get(keys[0])
+            if cached is not None:
+                logger.info("Ответ взят из кэша событий")
+                return str(cached)
+        cached_local = events_cache.get(keys[1]) if keys is not None else None
+
+        if cached_local is None and store is None:
+            store = await asyncio.to_thread(TransactionStore.from_file, FILE_PATH)
 
-        df = pd.read_excel(file_path)
-
-        # Фильтрация дат
-        logger.info(f"Данные считаны: {len(df)} записей")
-        df_filtered = filter_by_range(df, date_str, range_type)
-
-        # Формирование данных
-        expenses = get_expenses_summary(df_filtered)
-        incomes = get_incomes_summary(df_filtered)
-        exchange_rates = get_exchange_rates(date_str)
-        sp500_quotes = get_sp500_quotes(date_str)
-
-        result = {
-            "Расходы": expenses,
-            "Поступления": incomes,
-            "Курс валют": exchange_rates,
-            "Стоимость акций S&P 500": sp500_quotes,
-        }
-        logger.info("JSON-ответ сформирован")
-        return json.dumps(result, ensure_ascii=False, indent=4)
+        if cached_local is not None or store is None:
+            local_task = asyncio.sleep(0, cached_local)
+        else:
+            local_task = asyncio.to_thread(_local_summaries, store, date_str, range_type)
+        local, exchange_rates, sp500_quotes = await asyncio.gather(
+            local_task,
+            _fetch_async(get_exchange_rates, date_str, RATES_FALLBACK, "курсы валют"),
+            _fetch_async(get_sp500_quotes, date_str, QUOTES_FALLBACK, "котировки S&P 500"),
+        )
+        return _store_events(keys, local, exchange_rates, sp500_quotes, cache_mode, json_mode)
     except Exception as e:
         logger.error(f"Ошибка формирования событий: {e}")
         return json.dumps({"error": str(e)}, ensure_ascii=False)
 
 
 if __name__ == "__main__":
+    configure()
     print(get_events("20-05-2019"))
@@ -1,9 +1,42 @@
 import json
 from pathlib import Path
+from typing import Iterator
 
 import pandas as pd
 import pytest
 
+from src.api_cache import ApiCache, set_api_cache
+from src.report_writer import ReportWriter, set_report_writer
+from src.views import clear_events_cache
+
+
+@pytest.fixture(autouse=True)
+def api_cache(tmp_path: Path) -> Iterator[ApiCache]:
+    """Отдельный кэш API для каждого теста"""
+    cache = ApiCache(tmp_path / "api_cache.sqlite")
+    set_api_cache(cache)
+    yield cache
+    set_api_cache(None)
+    cache.close()
+
+
+@pytest.fixture(autouse=True)
+def report_writer(tmp_path: Path) -> Iterator[ReportWriter]:
+    """Отчеты тестов пишутся во временную директорию"""
+    writer = ReportWriter(tmp_path / "reports")
+    set_report_writer(writer)
+    yield writer
+    writer.close()
+    set_report_writer(None)
+
+
+@pytest.fixture(autouse=True)
+def events_cache() -> Iterator[None]:
+    """Пустой кэш страницы «События» для каждого теста"""
+    clear_events_cache()
+    yield
+    clear_events_cache()
+
 
 @pytest.fixture
 def transactions() -> list:
@@ -0,0 +1,43 @@
+import time
+from pathlib import Path
+
+from src.api_cache import ApiCache
+
+
+def test_set_and_get(tmp_path: Path) -> None:
+    # Значение сохраняется и считается попаданием
+    cache = ApiCache(tmp_path / "cache.sqlite")
+    assert cache.get("exchangerates", "2019-05-20", "USD") is None
+    cache.set("exchangerates", "2019-05-20", "USD", 0.0154)
+
+    assert cache.get("exchangerates", "2019-05-20", "USD") == 0.0154
+    assert cache.stats() == {"hits": 1, "misses": 1}
+
+
+def test_persistent_between_instances(tmp_path: Path) -> None:
+    # Данные переживают перезапуск процесса
+    path = tmp_path / "cache.sqlite"
+    ApiCache(path).set("stockpricehistorical", "1558310400", "AAPL", 183.09)
+
+    assert ApiCache(path).get("stockpricehistorical", "1558310400", "AAPL") == 183.09
+
+
+def test_ttl_expired(tmp_path: Path) -> None:
+    # Устаревшая запись считается промахом
+    cache = ApiCache(tmp_path / "cache.sqlite")
+    cache.set("exchangerates", "2025-10-22", "USD", 0.0123, ttl=0.01)
+    time.sleep(0.02)
+
+    assert cache.get("exchangerates", "2025-10-22", "USD") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_clear(tmp_path: Path) -> None:
+    # Очистка удаляет записи и обнуляет счетчики
+    cache = ApiCache(tmp_path / "cache.sqlite")
+    cache.set("exchangerates", "2019-05-20", "USD", 0.0154)
+    cache.get("exchangerates", "2019-05-20", "USD")
+    cache.clear()
+
+    assert cache.stats() == {"hits": 0, "misses": 0}
+    assert cache.get("exchangerates", "2019-05-20", "USD") is None
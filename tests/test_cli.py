@@ -0,0 +1,127 @@
+import io
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest.mock import Mock, patch
+
+import pandas as pd
+import pytest
+
+from src.cli import main, parse_request, read_requests, run_batch
+from src.operations_db import OperationsDB
+from src.store import TransactionStore
+
+
+@pytest.fixture
+def store(transactions: List[Dict[str, Any]]) -> TransactionStore:
+    return TransactionStore(pd.DataFrame(transactions))
+
+
+def jsonl(text: str) -> List[Dict[str, Any]]:
+    return [json.loads(line) for line in text.splitlines()]
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        ("Супермаркеты\t30.12.2021", {"category": "Супермаркеты", "date": "30.12.2021"}),
+        ("Супермаркеты", {"category": "Супермаркеты"}),
+        ('{"category": "Фастфуд", "date": null}', {"category": "Фастфуд"}),
+    ],
+)
+def test_parse_request(line: str, expected: Dict[str, str]) -> None:
+    assert parse_request(line, ("category", "date")) == expected
+
+
+@pytest.mark.parametrize("line", ["\t30.12.2021", "{не json", '{"date": "30.12.2021"}'])
+def test_parse_request_invalid(line: str) -> None:
+    with pytest.raises(ValueError):
+        parse_request(line, ("category", "date"))
+
+
+def test_read_requests_skips_blank_lines() -> None:
+    lines = read_requests(["аргумент"], io.StringIO("первый\n\n  \nвторой\r\n"))
+    assert list(lines) == ["аргумент", "первый", "второй"]
+
+
+def test_run_batch_search(store: TransactionStore) -> None:
+    # По строке результата на запрос; ошибка в запросе не прерывает остальные
+    out = io.StringIO()
+    errors = run_batch("search", store, ["супер", "{}", "красота"], out, json_mode="compact")
+
+    lines = jsonl(out.getvalue())
+    assert errors == 1
+    assert [line["input"] for line in lines] == [{"query": "супер"}, "{}", {"query": "красота"}]
+    assert len(lines[0]["result"]) == 2 and len(lines[2]["result"]) == 2
+    assert "error" in lines[1]
+
+
+def test_run_batch_spending_keeps_stdout_clean(
+    df_transactions: dict, capsys: pytest.CaptureFixture, report_writer: Any
+) -> None:
+    # Печать внутри отчета уходит в stderr, файлы отчетов не создаются.
+    # Окно — 90 дней до 30.09.2025, операция от 01.07.2025 в него не входит
+    store = TransactionStore(pd.DataFrame(df_transactions))
+    out = io.StringIO()
+    assert run_batch("spending", store, ["Супермаркет\t30.09.2025", "Транспорт\t30.09.2025"], out) == 0
+
+    first, second = jsonl(out.getvalue())
+    assert first["result"][-1]["ИТОГО"] == 5600.0
+    assert second["result"] == []
+    assert capsys.readouterr().out == ""
+    report_writer.flush()
+    assert not report_writer.directory.exists()
+
+
+def test_run_batch_handler_error(store: TransactionStore) -> None:
+    out = io.StringIO()
+    with patch("src.views.get_events", side_effect=RuntimeError("нет сети")):
+        errors = run_batch("events", store, ["2018-01-04\tw"], out)
+    assert errors == 1
+    assert jsonl(out.getvalue()) == [{"input": {"date": "2018-01-04", "range": "w"}, "error": "нет сети"}]
+
+
+@patch("src.views.get_sp500_quotes", return_value={"stock_prices": []})
+@patch("src.views.get_exchange_rates", return_value={"currency_rates": []})
+def test_run_batch_error_payload(mock_rates: Mock, mock_quotes: Mock, store: TransactionStore) -> None:
+    # get_events сообщает об ошибке телом {"error": ...} — это тоже ошибка запроса
+    out = io.StringIO()
+    with patch("src.views.get_range_summaries", side_effect=[ValueError("нет сводок"), ({}, {})]):
+        errors = run_batch("events", store, ["2018-01-04", "2018-01-05"], out)
+    lines = jsonl(out.getvalue())
+    assert errors == 1
+    assert lines[0] == {"input": {"date": "2018-01-04"}, "error": "нет сводок"}
+    assert "result" in lines[1]
+
+
+@patch("src.cli.TransactionStore.from_file")
+def test_main_reads_stdin(
+    mock_from_file: Mock, store: TransactionStore, capsys: pytest.CaptureFixture, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Данные загружаются один раз на все запросы из stdin
+    mock_from_file.return_value = store
+    monkeypatch.setattr("sys.stdin", io.StringIO("супер\nтопливо\n"))
+
+    assert main(["--file", "operations.xlsx", "--quiet", "search"]) == 0
+    mock_from_file.assert_called_once_with("operations.xlsx")
+    lines = jsonl(capsys.readouterr().out)
+    assert [len(line["result"]) for line in lines] == [2, 1]
+
+
+@patch("src.cli.TransactionStore.from_file")
+def test_main_transfers(mock_from_file: Mock, store: TransactionStore, capsys: pytest.CaptureFixture) -> None:
+    mock_from_file.return_value = store
+    assert main(["--quiet", "transfers"]) == 0
+    (line,) = jsonl(capsys.readouterr().out)
+    assert line["result"]["Итого"] == 0
+
+
+def test_main_db_source(tmp_path: Path, transactions: List[Dict[str, Any]], capsys: pytest.CaptureFixture) -> None:
+    # Источник данных — база операций, пополняемая src.ingest
+    db = OperationsDB(tmp_path / "operations.sqlite")
+    db.append(pd.DataFrame(transactions))
+    db.close()
+
+    assert main(["--db", str(tmp_path / "operations.sqlite"), "--quiet", "search", "супер"]) == 0
+    (line,) = jsonl(capsys.readouterr().out)
+    assert len(line["result"]) == 2
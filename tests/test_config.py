@@ -0,0 +1,32 @@
+import logging
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+import src.config as config
+
+
+@pytest.fixture
+def fresh_config(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Состояние модуля настройки до первого вызова"""
+    monkeypatch.setattr(config, "_configured", False)
+    monkeypatch.setattr(config, "_env_loaded", False)
+
+
+@patch("src.config.logging.basicConfig")
+def test_configure_once(mock_basic_config: Mock, fresh_config: None) -> None:
+    # Логирование настраивается один раз, повторные вызовы ничего не меняют
+    config.configure()
+    config.configure(logging.DEBUG)
+    mock_basic_config.assert_called_once_with(level=logging.INFO, format=config.LOG_FORMAT)
+
+
+def test_get_env_reads_dotenv(fresh_config: None, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Переменные из .env загружаются при первом обращении к ключу
+    (tmp_path / ".env").write_text("PROJECT_TEST_KEY=secret\n", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("PROJECT_TEST_KEY", raising=False)
+    with patch("dotenv.main.find_dotenv", return_value=str(tmp_path / ".env")):
+        assert config.get_env("PROJECT_TEST_KEY") == "secret"
+    monkeypatch.delenv("PROJECT_TEST_KEY")
@@ -0,0 +1,79 @@
+import pandas as pd
+import pytest
+
+from src.dates import _fallback_parse, infer_date_format, parse_date, parse_date_column
+
+
+@pytest.mark.parametrize(
+    "date_str",
+    [
+        "20.05.2019",
+        "20-05-2019",
+        "20/05/2019",
+        "2019-05-20",
+        "2019/05/20",
+        "1.2.2025",
+        "01.02.2025 10:20",
+        "01.02.2025 10:20:30",
+        "2025-02-01T10:20:30",
+        " 01.02.2025 ",
+        "20 May 2019",
+    ],
+)
+def test_parse_date_matches_pandas(date_str: str) -> None:
+    # Быстрый разбор совпадает с разбором pandas
+    assert parse_date(date_str) == _fallback_parse(date_str)
+
+
+def test_parse_date_memoized() -> None:
+    # Повторный разбор той же строки берется из кэша
+    parse_date.cache_clear()
+    parse_date("20.05.2019")
+    parse_date("20.05.2019")
+    assert parse_date.cache_info().hits == 1
+
+
+@pytest.mark.parametrize("date_str", ["31.02.2025", "не дата"])
+def test_parse_date_invalid(date_str: str) -> None:
+    # Некорректная дата — ValueError, как у pandas
+    with pytest.raises(ValueError):
+        parse_date(date_str)
+
+
+@pytest.mark.parametrize(
+    "date_str, expected",
+    [
+        ("20.05.2019", "%d.%m.%Y"),
+        ("2019/05/20 10:20", "%Y/%m/%d %H:%M"),
+        ("2019-05-20T10:20:30", "%Y-%m-%dT%H:%M:%S"),
+        ("20 May 2019", None),
+    ],
+)
+def test_infer_date_format(date_str: str, expected: str) -> None:
+    assert infer_date_format(date_str) == expected
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        ["04.01.2018 15:00:41", "31.12.2021 23:59:59"],
+        ["2025-10-01", "2025-10-10"],
+        ["1.2.2025 10:00:00", "01.02.2025 10:00:00"],
+        ["01.02.2025 10:00:00", None],
+    ],
+)
+def test_parse_date_column(values: list) -> None:
+    # Векторный разбор совпадает с поэлементным и сохраняет индекс
+    column = pd.Series(values, index=[10, 20], name="Дата операции", dtype=object)
+    parsed = parse_date_column(column)
+
+    expected = [pd.NaT if value is None else parse_date(value) for value in values]
+    assert list(parsed) == expected
+    assert list(parsed.index) == [10, 20]
+    assert parsed.name == "Дата операции"
+
+
+def test_parse_date_column_invalid() -> None:
+    # Несуществующая дата в столбце — ValueError
+    with pytest.raises(ValueError):
+        parse_date_column(pd.Series(["01.02.2025", "31.02.2025"]), "%d.%m.%Y")
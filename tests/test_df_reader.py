@@ -1,8 +1,18 @@
+import os
+import time
+from pathlib import Path
 from unittest.mock import patch
 
 import pandas as pd
+import pytest
 
-from src.df_reader import load_and_convert_excel_to_dict
+from src.df_reader import (
+    FILL_VALUES,
+    iter_operation_chunks,
+    iter_transactions,
+    load_and_convert_excel_to_dict,
+    read_operations,
+)
 
 
 # Тест успешной загрузки и конвертации
@@ -36,3 +46,78 @@ def test_general_error() -> None:
         mock_read_excel.side_effect = Exception("Test exception")
         result = load_and_convert_excel_to_dict("test.xlsx")
         assert result == []
+
+
+# Тест повторной загрузки из кэша без чтения Excel
+def test_read_operations_uses_cache(tmp_path: Path, test_data: dict) -> None:
+    file_path = tmp_path / "operations.xlsx"
+    pd.DataFrame(test_data).to_excel(file_path, index=False)
+
+    first = read_operations(str(file_path))
+    assert (tmp_path / ".cache").is_dir()
+
+    with patch("pandas.read_excel") as mock_read_excel:
+        second = read_operations(str(file_path))
+        mock_read_excel.assert_not_called()
+
+    pd.testing.assert_frame_equal(first, second)
+
+
+# Тест пересборки кэша при изменении исходного файла
+def test_read_operations_rebuilds_cache_on_change(tmp_path: Path, test_data: dict) -> None:
+    file_path = tmp_path / "operations.xlsx"
+    pd.DataFrame(test_data).to_excel(file_path, index=False)
+    read_operations(str(file_path))
+
+    changed = pd.DataFrame(test_data).head(1)
+    changed.to_excel(file_path, index=False)
+    os.utime(file_path, ns=(time.time_ns(), time.time_ns() + 10**9))
+
+    result = read_operations(str(file_path))
+    assert len(result) == 1
+
+
+# Тест чтения без кэша
+def test_read_operations_without_cache(tmp_path: Path, test_data: dict) -> None:
+    file_path = tmp_path / "operations.xlsx"
+    pd.DataFrame(test_data).to_excel(file_path, index=False)
+
+    result = read_operations(str(file_path), use_cache=False)
+    assert len(result) == 3
+    assert not (tmp_path / ".cache").exists()
+
+
+# Тест потокового чтения Excel частями
+def test_iter_operation_chunks_excel(tmp_path: Path, transactions: list) -> None:
+    file_path = tmp_path / "operations.xlsx"
+    df = pd.DataFrame(transactions)
+    df.loc[1, "Номер карты"] = None
+    df.to_excel(file_path, index=False)
+
+    chunks = list(iter_operation_chunks(str(file_path), chunk_size=4))
+
+    assert [len(chunk) for chunk in chunks] == [4, 2]
+    assert list(chunks[1].index) == [4, 5]
+    pd.testing.assert_frame_equal(pd.concat(chunks), load_full(file_path), check_dtype=False)
+
+
+# Тест потокового чтения CSV частями
+def test_iter_operation_chunks_csv(tmp_path: Path, transactions: list) -> None:
+    file_path = tmp_path / "operations.csv"
+    pd.DataFrame(transactions).to_csv(file_path, index=False)
+
+    chunks = list(iter_transactions(str(file_path), chunk_size=5))
+
+    assert [len(chunk) for chunk in chunks] == [5, 1]
+    assert chunks[0][0] == transactions[0]
+
+
+# Тест некорректного размера части
+def test_iter_operation_chunks_invalid_size(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        next(iter_operation_chunks(str(tmp_path / "operations.xlsx"), chunk_size=0))
+
+
+def load_full(file_path: Path) -> pd.DataFrame:
+    # Полная загрузка для сравнения
+    return pd.read_excel(file_path).fillna(FILL_VALUES)
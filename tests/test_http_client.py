@@ -0,0 +1,142 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+import pytest
+import requests
+
+from src import http_client
+from src.http_client import create_session, get_session
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Локальный сервер-заглушка: keep-alive, задержки и ошибки 503"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        server = self.server
+        server.client_ports.add(self.client_address[1])  # type: ignore[attr-defined]
+        server.hits += 1  # type: ignore[attr-defined]
+
+        if self.path.startswith("/slow"):
+            time.sleep(1)
+        if self.path.startswith("/flaky") and server.hits <= 2:  # type: ignore[attr-defined]
+            self._reply(503, b'{"error": "busy"}')
+            return
+        if self.path.startswith("/throttled") and server.hits <= 1:  # type: ignore[attr-defined]
+            # /throttled/<секунды> — задержка в заголовке Retry-After
+            self._reply(429, b'{"error": "slow down"}', retry_after=self.path.rsplit("/", 1)[-1])
+            return
+        self._reply(200, b'{"ok": true}')
+
+    def _reply(self, status: int, body: bytes, retry_after: str = "") -> None:
+        self.send_response(status)
+        if retry_after:
+            self.send_header("Retry-After", retry_after)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def stub_server() -> Iterator[ThreadingHTTPServer]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.client_ports = set()  # type: ignore[attr-defined]
+    server.hits = 0  # type: ignore[attr-defined]
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _url(server: ThreadingHTTPServer, path: str) -> str:
+    host, port = server.server_address[:2]
+    return f"http://{host!s}:{port}{path}"
+
+
+def test_connection_reused(stub_server: ThreadingHTTPServer) -> None:
+    # Все запросы идут через одно keep-alive соединение
+    session = create_session()
+    for _ in range(5):
+        assert session.get(_url(stub_server, "/ok"), timeout=http_client.DEFAULT_TIMEOUT).status_code == 200
+    session.close()
+
+    assert stub_server.hits == 5  # type: ignore[attr-defined]
+    assert len(stub_server.client_ports) == 1  # type: ignore[attr-defined]
+
+
+def test_read_timeout(stub_server: ThreadingHTTPServer) -> None:
+    # Зависший ответ прерывается по таймауту чтения без повторов
+    session = create_session()
+    started = time.monotonic()
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        session.get(_url(stub_server, "/slow"), timeout=(1, 0.2))
+    session.close()
+
+    assert time.monotonic() - started < 1
+    assert stub_server.hits == 1  # type: ignore[attr-defined]
+
+
+def test_retry_on_503(stub_server: ThreadingHTTPServer) -> None:
+    # Ошибки 503 повторяются, пока сервер не ответит успешно
+    session = create_session(backoff_factor=0)
+    response = session.get(_url(stub_server, "/flaky"), timeout=http_client.DEFAULT_TIMEOUT)
+    session.close()
+
+    assert response.status_code == 200
+    assert stub_server.hits == 3  # type: ignore[attr-defined]
+
+
+def test_retry_after_respected(stub_server: ThreadingHTTPServer) -> None:
+    # Короткая задержка из Retry-After выдерживается перед повтором
+    session = create_session(backoff_factor=0)
+    started = time.monotonic()
+    response = session.get(_url(stub_server, "/throttled/1"), timeout=http_client.DEFAULT_TIMEOUT)
+    session.close()
+
+    assert response.status_code == 200
+    assert time.monotonic() - started >= 1
+    assert stub_server.hits == 2  # type: ignore[attr-defined]
+
+
+def test_long_retry_after_not_retried(stub_server: ThreadingHTTPServer) -> None:
+    # Задержка больше RETRY_AFTER_LIMIT: без повтора и ожидания возвращается ответ 429
+    session = create_session(backoff_factor=0)
+    started = time.monotonic()
+    response = session.get(_url(stub_server, "/throttled/30"), timeout=http_client.DEFAULT_TIMEOUT)
+    session.close()
+
+    assert response.status_code == 429
+    assert time.monotonic() - started < 1
+    assert stub_server.hits == 1  # type: ignore[attr-defined]
+
+
+def test_retries_exhausted(stub_server: ThreadingHTTPServer) -> None:
+    # После исчерпания повторов возвращается последний ответ с ошибкой
+    session = create_session(retries=1, backoff_factor=0)
+    response = session.get(_url(stub_server, "/flaky"), timeout=http_client.DEFAULT_TIMEOUT)
+    session.close()
+
+    assert response.status_code == 503
+    with pytest.raises(requests.exceptions.HTTPError):
+        response.raise_for_status()
+
+
+def test_shared_session(stub_server: ThreadingHTTPServer) -> None:
+    # Общая сессия создается один раз и пересоздается после закрытия
+    http_client.close_session()
+    session = get_session()
+    assert get_session() is session
+    assert http_client.http_get(_url(stub_server, "/ok")).json() == {"ok": True}
+
+    http_client.close_session()
+    assert get_session() is not session
+    http_client.close_session()
@@ -0,0 +1,48 @@
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from src.main import LazyStore
+
+ROOT = Path(__file__).parent.parent
+
+# Зависимости, которые не должны загружаться при запуске меню
+HEAVY_MODULES = ("pandas", "numpy", "requests", "dotenv", "openpyxl")
+
+
+def imported_modules(module: str) -> set:
+    """Модули, загруженные при импорте module в новом процессе (по выводу python -X importtime)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    lines = [line.split("|")[-1] for line in result.stderr.splitlines() if line.startswith("import time:")]
+    return {line.strip() for line in lines[1:]}
+
+
+def test_main_import_is_light() -> None:
+    modules = imported_modules("src.main")
+    assert "src.main" in modules
+    assert not modules & set(HEAVY_MODULES)
+
+
+@patch("src.store.TransactionStore.from_file")
+def test_lazy_store_loads_once(mock_from_file: Mock) -> None:
+    store = LazyStore("operations.xlsx")
+    mock_from_file.assert_not_called()
+    assert store.get() is store.get()
+    mock_from_file.assert_called_once_with("operations.xlsx")
+
+
+@patch("src.store.TransactionStore.from_file")
+@patch("src.operations_db.load_store")
+def test_lazy_store_db_source(mock_load_store: Mock, mock_from_file: Mock) -> None:
+    # С путем к базе операций данные берутся из базы, а не из файла выгрузки
+    store = LazyStore("operations.xlsx", "operations.sqlite")
+    assert store.get() is mock_load_store.return_value
+    mock_load_store.assert_called_once_with("operations.sqlite")
+    mock_from_file.assert_not_called()
@@ -0,0 +1,96 @@
+import json
+from pathlib import Path
+from typing import Iterator
+from unittest.mock import Mock, patch
+
+import pandas as pd
+import pytest
+
+from src.metrics import Metrics, enable_metrics, metrics, span, timed
+from src.services import simple_search
+from src.store import TransactionStore
+from src.views import get_events
+
+
+@pytest.fixture
+def enabled_metrics() -> Iterator[Metrics]:
+    """Включенные замеры общего объекта метрик на время теста"""
+    metrics.reset()
+    enable_metrics()
+    yield metrics
+    enable_metrics(False)
+    metrics.reset()
+
+
+def test_disabled_by_default() -> None:
+    # Выключенные замеры ничего не записывают
+    collector = Metrics()
+    with collector.span("load.read"):
+        pass
+    assert collector.summary() == {}
+
+
+def test_span_and_timed(enabled_metrics: Metrics) -> None:
+    @timed("aggregate.test")
+    def add(a: int, b: int) -> int:
+        return a + b
+
+    with span("load.test"):
+        assert add(1, 2) == 3
+    assert add.__name__ == "add"
+
+    summary = enabled_metrics.summary()
+    assert list(summary) == ["aggregate.test", "load.test"]
+    assert summary["aggregate.test"]["count"] == 1
+    assert summary["load.test"]["sum"] >= summary["aggregate.test"]["sum"]
+
+
+def test_span_records_on_error(enabled_metrics: Metrics) -> None:
+    with pytest.raises(ValueError):
+        with span("fetch.test"):
+            raise ValueError("ошибка")
+    assert enabled_metrics.summary()["fetch.test"]["count"] == 1
+
+
+def test_quantiles() -> None:
+    collector = Metrics(enabled=True)
+    for value in range(1, 101):
+        collector.record("filter.range", value / 1000)
+    stats = collector.summary()["filter.range"]
+    assert (stats["p50"], stats["p95"], stats["max"]) == (0.05, 0.095, 0.1)
+    assert stats["count"] == 100
+
+
+def test_exports(tmp_path: Path) -> None:
+    collector = Metrics(enabled=True)
+    collector.record("serialize.search", 0.25)
+
+    text = collector.prometheus_text()
+    assert "# TYPE project_stage_duration_seconds summary" in text
+    assert 'project_stage_duration_seconds{stage="serialize.search",quantile="0.95"} 0.250000' in text
+    assert 'project_stage_duration_seconds_count{stage="serialize.search"} 1' in text
+
+    path = tmp_path / "metrics.jsonl"
+    collector.export_jsonl(path)
+    collector.export_jsonl(path)
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert len(lines) == 2
+    assert lines[0]["stage"] == "serialize.search" and lines[0]["p50"] == 0.25
+
+    collector.export(tmp_path / "metrics.prom")
+    assert (tmp_path / "metrics.prom").read_text(encoding="utf-8") == text
+
+
+@patch("src.views.get_sp500_quotes", return_value={"stock_prices": []})
+@patch("src.views.get_exchange_rates", return_value={"currency_rates": []})
+def test_events_stage_breakdown(
+    mock_rates: Mock, mock_quotes: Mock, sample_df: pd.DataFrame, enabled_metrics: Metrics
+) -> None:
+    # Страница «События» и поиск раскладываются по этапам
+    store = TransactionStore(sample_df.astype({"Сумма операции": float}))
+    get_events("2025-10-02", "M", store=store)
+    simple_search("еда", store)
+
+    stages = set(enabled_metrics.summary())
+    assert {"events.total", "load.dates", "aggregate.range_summaries", "fetch.wait", "serialize.events"} <= stages
+    assert {"filter.search", "serialize.search"} <= stages
@@ -0,0 +1,117 @@
+from pathlib import Path
+from typing import Any, Iterator
+
+import pandas as pd
+import pytest
+
+from src.ingest import main
+from src.operations_db import OperationsDB, load_store
+from src.utils import get_expenses_summary, get_incomes_summary
+
+
+@pytest.fixture
+def db(tmp_path: Path) -> Iterator[OperationsDB]:
+    database = OperationsDB(tmp_path / "operations.sqlite")
+    yield database
+    database.close()
+
+
+def test_append_deduplicates(db: OperationsDB, transactions: list) -> None:
+    # Повторная загрузка не добавляет операций
+    df = pd.DataFrame(transactions)
+    assert db.append(df) == len(transactions)
+    assert db.append(df) == 0
+    assert db.append(df.head(2)) == 0
+    assert len(db) == len(transactions)
+
+
+def test_identical_rows_in_one_export(db: OperationsDB, tmp_path: Path, transactions: list) -> None:
+    # Одинаковые операции внутри выгрузки (два билета в одну секунду) сохраняются обе,
+    # в том числе если они попали в разные части файла; повторная загрузка файла ничего не добавляет
+    df = pd.DataFrame(transactions)
+    export = pd.concat([df, df.head(1)], ignore_index=True)
+    csv_path = tmp_path / "export.csv"
+    export.to_csv(csv_path, index=False)
+
+    assert db.append_file(str(csv_path), chunk_size=2) == len(export)
+    assert db.append_file(str(csv_path), chunk_size=4) == 0
+    assert db.append(export) == 0
+    assert len(db) == len(export)
+
+
+def test_keys_use_parsed_dates(db: OperationsDB, transactions: list) -> None:
+    # Та же операция с датой в другом текстовом виде (например, из CSV другой программы) не дублируется
+    df = pd.DataFrame(transactions)
+    db.append(df)
+    other = df.copy()
+    other["Дата операции"] = pd.to_datetime(df["Дата операции"], dayfirst=True).dt.strftime("%Y-%m-%d %H:%M:%S")
+    assert db.append(other) == 0
+
+
+def test_aggregates_updated_incrementally(db: OperationsDB, transactions: list) -> None:
+    # Агрегаты по частям совпадают с агрегатами, посчитанными за один раз
+    df = pd.DataFrame(transactions)
+    db.append(df.iloc[:5])
+    db.append(df.iloc[3:])
+
+    other = OperationsDB(db.path.with_name("other.sqlite"))
+    other.append(df)
+    pd.testing.assert_frame_equal(db.monthly_aggregates(), other.monthly_aggregates())
+    other.close()
+
+
+def test_summaries_match_dataframe(db: OperationsDB, transactions: list) -> None:
+    # Сводки по агрегатам совпадают со сводками по DataFrame
+    df = pd.DataFrame(transactions)
+    db.append(df)
+    assert db.expenses_summary() == get_expenses_summary(df)
+    assert db.incomes_summary() == get_incomes_summary(df)
+
+
+def test_summary_month_range(db: OperationsDB) -> None:
+    # Учитываются только успешные операции за выбранные месяцы
+    db.append(
+        pd.DataFrame(
+            {
+                "Дата операции": ["01.01.2021 10:00:00", "02.01.2021 10:00:00", "01.02.2021 10:00:00"],
+                "Номер карты": ["*1", "*1", "*1"],
+                "Статус": ["OK", "FAILED", "OK"],
+                "Сумма операции": [-100.0, -50.0, -30.0],
+                "Категория": ["Кафе", "Кафе", "Кафе"],
+                "Описание": ["a", "b", "c"],
+            }
+        )
+    )
+    assert db.expenses_summary("2021-01", "2021-01")["expenses"]["Общая сумма"] == 100.0
+    assert db.expenses_summary("2021-01")["expenses"]["Общая сумма"] == 130.0
+    assert db.incomes_summary() == {"incomes": {"Общая сумма": 0.0, "Основные": {}}}
+
+
+def test_to_store(db: OperationsDB, transactions: list) -> None:
+    # Загруженные операции доступны как хранилище в памяти
+    db.append(pd.DataFrame(transactions))
+    assert db.to_store().records == transactions
+
+
+def test_load_store(db: OperationsDB, transactions: list) -> None:
+    # Точки входа загружают хранилище из существующей базы; пустая база не создается
+    db.append(pd.DataFrame(transactions))
+    assert load_store(db.path).records == transactions
+
+    with pytest.raises(FileNotFoundError):
+        load_store(db.path.parent / "missing.sqlite")
+    assert not (db.path.parent / "missing.sqlite").exists()
+
+
+def test_ingest_cli(tmp_path: Path, transactions: list, capsys: Any) -> None:
+    # Команда добавляет новые операции из файлов и пропускает уже загруженные
+    csv_path = tmp_path / "export.csv"
+    pd.DataFrame(transactions).to_csv(csv_path, index=False)
+    db_path = tmp_path / "cli.sqlite"
+
+    main([str(csv_path), "--db", str(db_path)])
+    main([str(csv_path), "--db", str(db_path)])
+
+    output = capsys.readouterr().out
+    assert f"добавлено операций: {len(transactions)}" in output
+    assert f"Всего добавлено: 0, операций в хранилище: {len(transactions)}" in output
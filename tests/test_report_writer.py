@@ -0,0 +1,81 @@
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src.report_writer import HAS_PARQUET, JSON, JSONL, PARQUET, ReportWriter, write_report_file
+from src.serialization import COMPACT
+
+
+@pytest.fixture
+def report_df() -> pd.DataFrame:
+    return pd.DataFrame({"Категория": ["Супермаркет", "Развлечения"], "ИТОГО": [7200.0, 13000.0]})
+
+
+def test_write_report_file_json(tmp_path: Path, report_df: pd.DataFrame) -> None:
+    path = write_report_file(report_df, tmp_path / "out" / "report.json")
+    assert json.loads(path.read_text(encoding="utf-8")) == report_df.to_dict(orient="records")
+    # Временные файлы после записи не остаются
+    assert [p.name for p in path.parent.iterdir()] == ["report.json"]
+
+
+def test_write_report_file_jsonl(tmp_path: Path, report_df: pd.DataFrame) -> None:
+    path = write_report_file(report_df, tmp_path / "report.jsonl", JSONL)
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == report_df.to_dict(orient="records")
+
+
+def test_write_report_file_atomic(tmp_path: Path, report_df: pd.DataFrame) -> None:
+    # Ошибка при записи не портит прежний файл и не оставляет временных файлов
+    path = write_report_file(report_df, tmp_path / "out" / "report.json")
+    before = path.read_text(encoding="utf-8")
+    with patch("src.report_writer.write_report_json", side_effect=OSError("диск заполнен")):
+        with pytest.raises(OSError):
+            write_report_file(report_df.head(1), path)
+    assert path.read_text(encoding="utf-8") == before
+    assert [p.name for p in path.parent.iterdir()] == ["report.json"]
+
+
+@pytest.mark.skipif(HAS_PARQUET, reason="pyarrow установлен")
+def test_parquet_requires_pyarrow(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        ReportWriter(tmp_path, fmt=PARQUET)
+
+
+def test_unknown_format(tmp_path: Path, report_df: pd.DataFrame) -> None:
+    with pytest.raises(ValueError):
+        write_report_file(report_df, tmp_path / "report.xml", "xml")
+
+
+def test_background_submit_and_flush(tmp_path: Path, report_df: pd.DataFrame) -> None:
+    writer = ReportWriter(tmp_path)
+    paths = [writer.submit(report_df, f"report_{i}") for i in range(5)]
+    # Вызывающий код изменяет DataFrame после постановки в очередь — в файл попадает исходный отчет
+    report_df.loc[0, "ИТОГО"] = 0.0
+    writer.flush()
+    assert [p.name for p in paths] == [f"report_{i}.{JSON}" for i in range(5)]
+    assert all(json.loads(p.read_text(encoding="utf-8"))[0]["ИТОГО"] == 7200.0 for p in paths)
+    assert writer.written == 5
+    writer.close()
+
+
+def test_write_errors_are_logged(tmp_path: Path, report_df: pd.DataFrame) -> None:
+    # Ошибка записи не прерывает обработку очереди
+    writer = ReportWriter(tmp_path)
+    with patch("src.report_writer.write_report_file", side_effect=[OSError("нет доступа"), tmp_path]):
+        writer.submit(report_df, "first")
+        writer.submit(report_df, "second")
+        writer.flush()
+    assert (writer.errors, writer.written) == (1, 1)
+    writer.close()
+
+
+def test_synchronous_writer(tmp_path: Path, report_df: pd.DataFrame) -> None:
+    writer = ReportWriter(tmp_path, fmt=JSONL, json_mode=COMPACT, background=False)
+    path = writer.submit(report_df, "report")
+    assert path == tmp_path / "report.jsonl"
+    assert path.exists()
+    # Явное расширение в имени сохраняется
+    assert writer.submit(report_df, "report.json", fmt=JSON).suffix == ".json"
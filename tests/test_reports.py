@@ -1,6 +1,11 @@
+import json
+
 import pandas as pd
+import pytest
 
+from src.report_writer import ReportWriter
 from src.reports import spending_by_category
+from src.store import TransactionStore
 
 
 # Тест 1: Базовый случай с категорией "Супермаркет"
@@ -27,3 +32,37 @@ def test_spending_by_category_empty(df_transactions: pd.DataFrame) -> None:
     df = pd.DataFrame(df_transactions)
     result = spending_by_category(df, "Транспорт")
     assert result.empty
+
+
+# Тест 4: Хранилище транзакций дает тот же отчет, что и DataFrame
+@pytest.mark.parametrize("category", ["Супермаркет", "развл", "Транспорт"])
+def test_spending_by_category_store(df_transactions: dict, category: str) -> None:
+    expected = spending_by_category(pd.DataFrame(df_transactions), category, "30.09.2025")
+    result = spending_by_category(TransactionStore(pd.DataFrame(df_transactions)), category, "30.09.2025")
+    pd.testing.assert_frame_equal(result, expected)
+
+
+# Тест 5: Переданный DataFrame не изменяется
+def test_spending_by_category_does_not_mutate(df_transactions: dict) -> None:
+    df = pd.DataFrame(df_transactions)
+    original = df.copy()
+    spending_by_category(df, "Супермаркет", "30.09.2025")
+    pd.testing.assert_frame_equal(df, original)
+
+
+# Тест 6: Отчет сохраняется общим объектом записи в фоне
+def test_spending_by_category_report_file(df_transactions: dict, report_writer: ReportWriter) -> None:
+    result = spending_by_category(pd.DataFrame(df_transactions), "Супермаркет", "30.09.2025", json_mode="compact")
+    report_writer.flush()
+
+    (path,) = report_writer.directory.glob("report_spending_by_category_*.json")
+    content = path.read_text(encoding="utf-8")
+    assert "\n" not in content
+    assert len(json.loads(content)) == len(result)
+
+
+# Тест 7: Без сохранения файла отчета
+def test_spending_by_category_without_report(df_transactions: dict, report_writer: ReportWriter) -> None:
+    spending_by_category(pd.DataFrame(df_transactions), "Супермаркет", "30.09.2025", save_report=False)
+    report_writer.flush()
+    assert not report_writer.directory.exists()
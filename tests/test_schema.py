@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+
+from src.schema import Transaction, apply_schema, as_record, to_transactions
+
+
+def test_apply_schema_types(transactions: list) -> None:
+    # Низкокардинальные столбцы становятся категориальными, целые — int32
+    df = pd.DataFrame(transactions)
+    typed = apply_schema(df)
+
+    for column in ("Категория", "Статус", "Валюта операции", "Валюта платежа", "Номер карты"):
+        assert isinstance(typed[column].dtype, pd.CategoricalDtype)
+    assert typed["Бонусы (включая кэшбэк)"].dtype == "int32"
+    assert typed["MCC"].dtype == "float32"
+    assert typed["Сумма операции"].dtype == "float64"
+    # Исходный DataFrame не изменяется
+    assert df["Категория"].dtype == object
+
+
+def test_apply_schema_keeps_values(transactions: list) -> None:
+    # Значения и словари записей после приведения типов не меняются
+    df = pd.DataFrame(transactions)
+    assert apply_schema(df).to_dict("records") == df.to_dict("records")
+
+
+def test_apply_schema_skips_unsafe_narrowing() -> None:
+    # Пропуски и большие значения не сужаются
+    df = pd.DataFrame({"Бонусы (включая кэшбэк)": [1.0, None], "Округление на инвесткопилку": [2**40, 0]})
+    typed = apply_schema(df)
+    assert typed["Бонусы (включая кэшбэк)"].dtype == "float64"
+    assert typed["Округление на инвесткопилку"].dtype == "int64"
+
+
+def test_transaction_round_trip(transactions: list) -> None:
+    # Запись хранит поля в слотах и восстанавливает словарь
+    transaction = Transaction.from_dict(transactions[0])
+
+    assert not hasattr(transaction, "__dict__")
+    assert transaction.category == "Топливо"
+    assert transaction["Описание"] == "Pskov AZS 12 K2"
+    assert transaction.get("Нет такого поля", "-") == "-"
+    assert transaction.to_dict() == transactions[0]
+    with pytest.raises(KeyError):
+        transaction["Нет такого поля"]
+
+
+def test_to_transactions(transactions: list) -> None:
+    # Записи по DataFrame совпадают с записями по словарям
+    records = to_transactions(pd.DataFrame(transactions))
+    assert records == [Transaction.from_dict(transaction) for transaction in transactions]
+    assert [as_record(record) for record in records] == transactions
@@ -0,0 +1,60 @@
+import io
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.serialization import COMPACT, ORJSON, PRETTY, dumps, write_report_json
+
+
+@pytest.fixture
+def payload() -> dict:
+    return {"Категория": "Супермаркеты", "Сумма": -1025.5, "Список": [1, 2], "Пусто": None}
+
+
+def test_dumps_pretty_unchanged(payload: dict) -> None:
+    # Режим по умолчанию совпадает с прежним json.dumps побайтно
+    assert dumps(payload) == json.dumps(payload, ensure_ascii=False, indent=4)
+    assert dumps(payload, sort_keys=True) == json.dumps(payload, ensure_ascii=False, indent=4, sort_keys=True)
+
+
+@pytest.mark.parametrize("mode", [COMPACT, ORJSON])
+def test_dumps_compact(payload: dict, mode: str) -> None:
+    # Компактные режимы без пробелов, с теми же данными и порядком ключей
+    result = dumps(payload, mode, sort_keys=True)
+    assert "\n" not in result and ": " not in result
+    assert json.loads(result) == payload
+    assert list(json.loads(result)) == sorted(payload)
+
+
+@pytest.mark.parametrize("mode", [COMPACT, ORJSON])
+def test_dumps_numpy_and_timestamps(mode: str) -> None:
+    # Значения numpy и Timestamp сериализуются в компактных режимах
+    result = json.loads(dumps({"a": np.int64(3), "b": np.float32(1.5), "c": pd.Timestamp("2021-12-31 16:44")}, mode))
+    assert result == {"a": 3, "b": 1.5, "c": "2021-12-31T16:44:00"}
+
+
+def test_dumps_unknown_mode(payload: dict) -> None:
+    with pytest.raises(ValueError):
+        dumps(payload, "yaml")
+
+
+def test_write_report_json_modes() -> None:
+    # Отчет: прежний формат в режиме PRETTY, DataFrame.to_json с датами ISO — в компактном
+    df = pd.DataFrame({"Дата": pd.to_datetime(["2021-12-31 16:44:00"]), "ИТОГО": [10.5]})
+
+    pretty = io.StringIO()
+    write_report_json(df, pretty)
+    assert pretty.getvalue() == json.dumps(
+        [{"Дата": "2021-12-31 16:44:00", "ИТОГО": 10.5}], ensure_ascii=False, indent=4
+    )
+
+    compact = io.StringIO()
+    write_report_json(df, compact, COMPACT)
+    assert json.loads(compact.getvalue()) == [{"Дата": "2021-12-31T16:44:00.000", "ИТОГО": 10.5}]
+
+
+def test_write_report_json_unknown_mode() -> None:
+    with pytest.raises(ValueError):
+        write_report_json(pd.DataFrame(), io.StringIO(), PRETTY + "!")
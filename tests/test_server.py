@@ -0,0 +1,166 @@
+import asyncio
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from unittest.mock import Mock, patch
+from urllib.parse import quote
+
+import pandas as pd
+import pytest
+
+from src.server import ApiServer, Response
+from src.store import TransactionStore
+
+
+@pytest.fixture
+def api(transactions: List[Dict[str, Any]]) -> Iterator[ApiServer]:
+    server = ApiServer(TransactionStore(pd.DataFrame(transactions)), max_workers=2)
+    yield server
+    server.close()
+
+
+def respond(api: ApiServer, target: str, method: str = "GET", headers: Optional[Dict[str, str]] = None) -> Response:
+    return asyncio.run(api.respond(method, target, headers or {}))
+
+
+def test_search(api: ApiServer) -> None:
+    response = respond(api, "/search?q=" + quote("Супер"))
+    assert response.status == 200
+    assert response.headers["Cache-Control"] == "max-age=300"
+    assert len(json.loads(response.body)) == 2
+
+
+def test_responses_are_cached(api: ApiServer) -> None:
+    # Повторный запрос (в том числе в другом регистре) отдается из кэша ответов
+    first = respond(api, "/search?q=" + quote("супер"))
+    with patch("src.services.simple_search") as mock_search:
+        second = respond(api, "/search?q=" + quote("СУПЕР"))
+    mock_search.assert_not_called()
+    assert second.body == first.body
+    assert api.responses.info()["hits"] == 1
+
+
+def test_conditional_request(api: ApiServer) -> None:
+    etag = respond(api, "/transfers").headers["ETag"]
+    response = respond(api, "/transfers", headers={"if-none-match": etag})
+    assert (response.status, response.body) == (304, b"")
+    assert response.headers["ETag"] == etag
+    assert respond(api, "/transfers", headers={"if-none-match": '"другой"'}).status == 200
+
+
+def test_spending(df_transactions: dict) -> None:
+    api = ApiServer(TransactionStore(pd.DataFrame(df_transactions)))
+    try:
+        response = respond(api, "/spending?category=" + quote("развл") + "&date=30.09.2025")
+        report = json.loads(response.body)
+        assert report[-1]["ИТОГО"] == 8000.0
+    finally:
+        api.close()
+
+
+@patch("src.views.get_sp500_quotes", return_value={"stock_prices": []})
+@patch("src.views.get_exchange_rates", return_value={"currency_rates": []})
+def test_events(mock_rates: Mock, mock_quotes: Mock, api: ApiServer) -> None:
+    response = respond(api, "/events?date=2018-01-04&range=w")
+    assert response.headers["Cache-Control"] == "max-age=60"
+    assert set(json.loads(response.body)) == {"Расходы", "Поступления", "Курс валют", "Стоимость акций S&P 500"}
+
+    # Курсы и котировки запрашиваются заново, сводки берутся из кэша get_events
+    respond(api, "/events?date=04.01.2018&range=W")
+    assert mock_rates.call_count == 2
+
+
+@patch("src.server.get_events_async")
+def test_events_error_payload(mock_events: Mock, api: ApiServer) -> None:
+    # Ошибка get_events в теле ответа отдается как 500 без кэширования
+    mock_events.return_value = json.dumps({"error": "Нет файла"}, ensure_ascii=False)
+    response = respond(api, "/events?date=04.01.2018")
+    assert response.status == 500
+    assert response.headers["Cache-Control"] == "no-store"
+    assert "ETag" not in response.headers
+
+
+@pytest.mark.parametrize(
+    "method, target, status",
+    [
+        ("GET", "/search", 400),
+        ("GET", "/spending?category=x&date=2021-12-31", 400),
+        ("GET", "/spending?category=x&date=01.01.2020%2012:00", 400),
+        ("GET", "/spending?category=" + quote("(") + "&date=01.01.2020", 400),
+        ("GET", "/events?range=D", 400),
+        ("GET", "/events?date=notadate", 400),
+        ("GET", "/unknown", 404),
+        ("POST", "/search?q=a", 405),
+    ],
+)
+def test_errors(api: ApiServer, method: str, target: str, status: int) -> None:
+    response = respond(api, target, method)
+    assert response.status == status
+    assert "error" in json.loads(response.body)
+
+
+def test_handler_failure(api: ApiServer) -> None:
+    with patch("src.services.search_physical_person_transfers", side_effect=RuntimeError("сбой")):
+        assert respond(api, "/transfers").status == 500
+
+
+async def _roundtrip(api: ApiServer, requests: List[bytes]) -> List[Tuple[bytes, bytes]]:
+    """Запросы по одному соединению к запущенному серверу: (строка статуса, тело)"""
+    server = await api.serve("127.0.0.1", 0)
+    host, port = server.sockets[0].getsockname()[:2]
+    reader, writer = await asyncio.open_connection(host, port)
+    responses = []
+    try:
+        for request in requests:
+            writer.write(request)
+            status = await reader.readline()
+            headers = {}
+            while (line := await reader.readline()) != b"\r\n":
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.lower()] = value.strip()
+            body = await reader.readexactly(int(headers["content-length"]))
+            responses.append((status.strip(), body))
+    finally:
+        writer.close()
+        server.close()
+        await server.wait_closed()
+    return responses
+
+
+def test_keep_alive_connection(api: ApiServer) -> None:
+    # Несколько запросов по одному соединению, включая цель в UTF-8 без кодирования
+    responses = asyncio.run(
+        _roundtrip(
+            api,
+            [
+                "GET /search?q=Топливо HTTP/1.1\r\nHost: localhost\r\n\r\n".encode("utf-8"),
+                b"GET /health HTTP/1.1\r\nHost: localhost\r\n\r\n",
+            ],
+        )
+    )
+    assert [status for status, _ in responses] == [b"HTTP/1.1 200 OK"] * 2
+    assert len(json.loads(responses[0][1])) == 1
+    assert json.loads(responses[1][1])["records"] == 6
+
+
+@pytest.mark.parametrize("length", [b"abc", b"-1"])
+def test_bad_content_length(api: ApiServer, length: bytes) -> None:
+    request = b"GET /health HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n"
+    responses = asyncio.run(_roundtrip(api, [request]))
+    assert responses[0][0] == b"HTTP/1.1 400 Bad Request"
+
+
+def test_body_too_large(api: ApiServer) -> None:
+    # Тело больше MAX_BODY_SIZE не читается: ответ 413 и закрытие соединения
+    request = b"GET /health HTTP/1.1\r\nContent-Length: 1000000000\r\n\r\n"
+    responses = asyncio.run(_roundtrip(api, [request]))
+    assert responses[0][0] == b"HTTP/1.1 413 Request Entity Too Large"
+
+
+def test_spending_with_time(df_transactions: dict) -> None:
+    # Дата со временем в формате ДД.ММ.ГГГГ ЧЧ:ММ:СС принимается
+    api = ApiServer(TransactionStore(pd.DataFrame(df_transactions)))
+    try:
+        response = respond(api, "/spending?category=" + quote("развл") + "&date=" + quote("30.09.2025 23:59:59"))
+        assert response.status == 200
+    finally:
+        api.close()
@@ -2,14 +2,21 @@ import json
 from typing import Any, Dict, List, Union
 from unittest.mock import Mock, patch
 
+import pandas as pd
 import pytest
 
+from src.schema import Transaction as TransactionRecord
+from src.schema import to_transactions
 from src.services import (
+    filter_transfers_frame,
     filter_transfers_to_physical_persons,
     is_physical_person_transfer,
     search_physical_person_transfers,
+    search_physical_person_transfers_chunked,
     simple_search,
+    simple_search_chunked,
 )
+from src.store import TransactionStore
 
 
 def test_simple_search_success(transactions: List[Dict[str, str]]) -> None:
@@ -113,3 +120,82 @@ def test_mock_with_invalid_input() -> None:
         data = json.loads(result)
 
         assert data == {"Итого": 0, "transactions": []}
+
+
+@pytest.mark.parametrize("search", ["", "а", "ер", "супермаркеты", "Pskov", "OOO BALID", "отсутствует"])
+@pytest.mark.parametrize("use_index", [False, True])
+def test_simple_search_store_same_as_list(transactions: List[Dict[str, Any]], search: str, use_index: bool) -> None:
+    # Векторный поиск и поиск по индексу совпадают с поиском по списку
+    transactions = transactions + [{**transactions[0], "Описание": None, "Категория": 5411}]
+    store = TransactionStore(pd.DataFrame(transactions))
+
+    expected = simple_search(search, transactions)
+    assert simple_search(search, store, use_index=use_index) == expected
+
+
+def test_simple_search_store_index_reused(transactions: List[Dict[str, Any]]) -> None:
+    # Индекс строится один раз и переиспользуется
+    store = TransactionStore(pd.DataFrame(transactions))
+    simple_search("красота", store, use_index=True)
+    index = store.search_index()
+    result = simple_search("балид", store, use_index=True)
+
+    assert store.search_index() is index
+    assert json.loads(result) == []
+
+
+def test_filter_transfers_store_same_as_list(test_physical_transactions: list[dict[Any, Any]]) -> None:
+    # Векторный отбор переводов совпадает с построчным
+    transactions = test_physical_transactions + [{"Категория": "Переводы", "Описание": None}]
+    store = TransactionStore(pd.DataFrame(transactions))
+
+    expected = search_physical_person_transfers(pd.DataFrame(transactions).to_dict("records"))
+    assert search_physical_person_transfers(store) == expected
+
+
+def test_filter_transfers_frame(test_physical_transactions: list[dict[Any, Any]]) -> None:
+    # Результат в виде DataFrame
+    result = filter_transfers_frame(pd.DataFrame(test_physical_transactions))
+    assert list(result["Описание"]) == ["Иванов И.", "Сидоров С."]
+
+
+@pytest.mark.parametrize("search", ["", "супермаркеты", "balid", "отсутствует"])
+def test_simple_search_chunked(transactions: List[Dict[str, Any]], search: str) -> None:
+    # Поиск по частям совпадает с поиском по всем данным
+    df = pd.DataFrame(transactions)
+    chunks = [chunk for _, chunk in df.groupby(df.index // 4)]
+    assert simple_search_chunked(search, chunks) == simple_search(search, transactions)
+
+
+def test_search_physical_person_transfers_chunked(test_physical_transactions: list[dict[Any, Any]]) -> None:
+    # Поиск переводов по частям совпадает с поиском по всем данным
+    df = pd.DataFrame(test_physical_transactions)
+    chunks = [chunk for _, chunk in df.groupby(df.index // 2)]
+    expected = search_physical_person_transfers(df.to_dict("records"))
+    assert search_physical_person_transfers_chunked(chunks) == expected
+
+
+@pytest.mark.parametrize("search", ["", "супермаркеты", "Pskov", "отсутствует"])
+def test_simple_search_transaction_records(transactions: List[Dict[str, Any]], search: str) -> None:
+    # Поиск по записям Transaction совпадает с поиском по словарям
+    records = to_transactions(pd.DataFrame(transactions))
+    assert simple_search(search, records) == simple_search(search, transactions)
+
+
+def test_search_transfers_transaction_records(test_physical_transactions: list[dict[Any, Any]]) -> None:
+    # Поиск переводов по записям Transaction совпадает с поиском по словарям
+    records = [TransactionRecord.from_dict(transaction) for transaction in test_physical_transactions]
+    expected = search_physical_person_transfers(
+        [TransactionRecord.from_dict(transaction).to_dict() for transaction in test_physical_transactions]
+    )
+    assert search_physical_person_transfers(records) == expected
+
+
+@pytest.mark.parametrize("json_mode", ["compact", "orjson"])
+def test_search_json_modes(transactions: List[Dict[str, Any]], json_mode: str) -> None:
+    # Компактные режимы содержат те же данные, что и режим по умолчанию
+    store = TransactionStore(pd.DataFrame(transactions))
+    assert json.loads(simple_search("а", store, json_mode=json_mode)) == json.loads(simple_search("а", store))
+    assert json.loads(search_physical_person_transfers(transactions, json_mode=json_mode)) == json.loads(
+        search_physical_person_transfers(transactions)
+    )
@@ -0,0 +1,66 @@
+import json
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.settings import SettingsManager, get_settings_manager, validate_settings
+
+
+def test_settings_loaded_once(mock_settings_file: Path) -> None:
+    # Файл читается один раз, пока не изменится
+    manager = SettingsManager(mock_settings_file)
+    with patch("src.settings.json.load", wraps=json.load) as mock_load:
+        first = manager.get()
+        second = manager.get()
+
+    assert first == {"user_currencies": ["USD", "EUR"], "user_stocks": ["AAPL", "AMZN"]}
+    assert second is first
+    mock_load.assert_called_once()
+
+
+def test_settings_reloaded_on_change(mock_settings_file: Path) -> None:
+    # Изменение файла приводит к перечитыванию
+    manager = SettingsManager(mock_settings_file)
+    manager.get()
+    version = manager.version
+
+    mock_settings_file.write_text(json.dumps({"user_currencies": ["USD"], "user_stocks": ["TSLA"]}), encoding="utf-8")
+    stat = os.stat(mock_settings_file)
+    os.utime(mock_settings_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert manager.get()["user_stocks"] == ["TSLA"]
+    assert manager.version != version
+
+
+def test_validate_settings() -> None:
+    # Проверка структуры настроек
+    assert validate_settings({"user_currencies": [" usd "]}) == {"user_currencies": ["USD"], "user_stocks": []}
+    with pytest.raises(ValueError):
+        validate_settings(["USD"])
+    with pytest.raises(ValueError):
+        validate_settings({"user_stocks": "AAPL"})
+
+
+def test_missing_file(tmp_path: Path) -> None:
+    # Отсутствие файла — ошибка
+    with pytest.raises(FileNotFoundError):
+        SettingsManager(tmp_path / "user_settings.json").get()
+
+
+def test_shared_manager(mock_settings_file: Path) -> None:
+    # Для одного файла используется один менеджер
+    assert get_settings_manager(mock_settings_file) is get_settings_manager(str(mock_settings_file))
+
+
+def test_file_version(mock_settings_file: Path, tmp_path: Path) -> None:
+    # Версия файла определяется без чтения; для отсутствующего файла — None
+    manager = SettingsManager(mock_settings_file)
+    with patch("src.settings.json.load") as mock_load:
+        version = manager.file_version()
+
+    stat = os.stat(mock_settings_file)
+    assert version == (stat.st_mtime_ns, stat.st_size)
+    mock_load.assert_not_called()
+    assert SettingsManager(tmp_path / "missing.json").file_version() is None
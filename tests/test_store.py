@@ -0,0 +1,81 @@
+from unittest.mock import Mock, patch
+
+import pandas as pd
+
+from src.store import TransactionStore
+
+
+@patch("src.store.read_operations")
+def test_from_file_loads_once(mock_read: Mock, transactions: list) -> None:
+    # Данные читаются один раз и заполняются пропуски
+    df = pd.DataFrame(transactions)
+    df.loc[0, "Номер карты"] = None
+    mock_read.return_value = df
+
+    store = TransactionStore.from_file("operations.xlsx")
+
+    mock_read.assert_called_once_with("operations.xlsx")
+    assert len(store) == len(transactions)
+    assert store.records[0]["Номер карты"] == "Нет данных"
+
+
+def test_records_materialized_lazily(transactions: list) -> None:
+    # Список словарей создается один раз и переиспользуется
+    store = TransactionStore(pd.DataFrame(transactions))
+    assert store.records is store.records
+    assert store.records == transactions
+
+
+def test_dates_parsed_once(transactions: list) -> None:
+    # Даты преобразуются один раз и не изменяют исходный DataFrame
+    store = TransactionStore(pd.DataFrame(transactions))
+    dates = store.dates
+    assert dates is store.dates
+    assert pd.api.types.is_datetime64_any_dtype(dates)
+    assert store.df["Дата операции"].iloc[0] == "04.01.2018 15:00:41"
+
+
+def test_view_isolated_from_store(transactions: list) -> None:
+    # Изменение столбцов представления не затрагивает хранилище
+    store = TransactionStore(pd.DataFrame(transactions))
+    view = store.view()
+    view["Дата операции"] = pd.to_datetime(view["Дата операции"], dayfirst=True)
+    view["Новый столбец"] = 1
+
+    assert "Новый столбец" not in store.df.columns
+    assert store.df["Дата операции"].iloc[0] == "04.01.2018 15:00:41"
+
+
+@patch("src.store.read_operations")
+def test_from_file_applies_schema(mock_read: Mock, transactions: list) -> None:
+    # Хранилище использует компактные типы, словари записей не меняются
+    mock_read.return_value = pd.DataFrame(transactions)
+
+    store = TransactionStore.from_file("operations.xlsx")
+
+    assert isinstance(store.df["Категория"].dtype, pd.CategoricalDtype)
+    assert store.records == transactions
+
+
+def test_daily_rollup(transactions: list) -> None:
+    # Сводная таблица по дням сохраняет суммы и количество ненулевых операций
+    df = pd.DataFrame(transactions)
+    store = TransactionStore(df)
+    rollup = store.daily_rollup()
+
+    assert rollup is store.daily_rollup()
+    assert rollup["day"].is_monotonic_increasing
+    assert rollup["total"].sum() == df["Сумма операции"].sum()
+    assert rollup["count"].sum() == (df["Сумма операции"] != 0).sum()
+
+
+def test_rollup_days_and_timeline_window(transactions: list) -> None:
+    # Строки выбираются по полуоткрытому интервалу дней и закрытому интервалу дат
+    store = TransactionStore(pd.DataFrame(transactions))
+
+    days = store.rollup_days(pd.Timestamp("2018-01-03"), pd.Timestamp("2018-01-04"))
+    assert set(days["day"]) == {pd.Timestamp("2018-01-03")}
+
+    window = store.timeline_window(pd.Timestamp("2018-01-04 14:05:08"), pd.Timestamp("2018-01-04 15:00:41"))
+    assert list(window["date"].dt.strftime("%H:%M:%S")) == ["14:05:08", "15:00:41"]
+    assert list(window["rows"]) == [1, 1]
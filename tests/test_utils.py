@@ -1,4 +1,5 @@
 import json
+import time
 from typing import Any
 from unittest.mock import MagicMock, Mock, patch
 
@@ -6,6 +7,7 @@ import pandas as pd
 import pytest
 
 import src.utils as utils
+from src.store import TransactionStore
 from src.utils import filter_by_range, get_expenses_summary, get_incomes_summary, get_sp500_quotes
 
 
@@ -71,9 +73,9 @@ def test_get_expenses_summary_with_error(monkeypatch: Any) -> None:
     assert result["expenses"]["Общая сумма"] == 0.0
 
 
-@patch("src.utils.requests.get")
+@patch("src.utils.http_get")
 def test_get_exchange_rates(mock_get: Mock, tmp_path: Any) -> None:
-    # Тест получения курсов валют с мокированным requests.get.
+    # Тест получения курсов валют с мокированным http_get.
 
     # === 1. Создание временной структуры ===
     src_dir = tmp_path / "src"
@@ -125,7 +127,7 @@ def test_get_exchange_rates(mock_get: Mock, tmp_path: Any) -> None:
     assert "https://api.apilayer.com/exchangerates_data/" in called_url
 
 
-@patch("requests.get")
+@patch("src.utils.http_get")
 def test_get_sp500_quotes(mock_get: Mock, tmp_path: Any) -> None:
     # Тест получения котировок S&P 500.
 
@@ -165,3 +167,197 @@ def test_get_sp500_quotes(mock_get: Mock, tmp_path: Any) -> None:
     assert "stock_prices" in result
     assert any(s["stock"] == "AAPL" for s in result["stock_prices"])
     assert all("stock" in s and "price" in s for s in result["stock_prices"])
+
+
+@pytest.mark.parametrize("range_type", ["W", "M", "Y", "ALL", "UNKNOWN"])
+@pytest.mark.parametrize("date_str", ["2025-10-01", "03.10.2025", "2025-09-30"])
+def test_filter_by_range_store(sample_df: pd.DataFrame, range_type: str, date_str: str) -> None:
+    # Фильтрация по хранилищу совпадает с фильтрацией DataFrame
+    expected = filter_by_range(sample_df.copy(), date_str, range_type)
+    result = filter_by_range(TransactionStore(sample_df), date_str, range_type)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_filter_by_range_store_error(sample_df: pd.DataFrame) -> None:
+    # Некорректная дата — пустой результат
+    result = filter_by_range(TransactionStore(sample_df), "не дата", "M")
+    assert result.empty
+
+
+def test_filter_by_range_does_not_mutate(sample_df: pd.DataFrame) -> None:
+    # Исходный DataFrame не изменяется при фильтрации
+    original = sample_df.copy()
+    filter_by_range(sample_df, "2025-10-02", "M")
+    pd.testing.assert_frame_equal(sample_df, original)
+
+
+@patch("src.utils.http_get")
+def test_get_sp500_quotes_concurrent(mock_get: Mock, tmp_path: Any) -> None:
+    # Тикеры запрашиваются параллельно, порядок сохраняется, ошибки изолированы.
+
+    src_dir = tmp_path / "src"
+    data_dir = tmp_path / "data"
+    src_dir.mkdir()
+    data_dir.mkdir()
+    dummy_file = src_dir / "utils.py"
+    dummy_file.write_text("")
+
+    tickers = [f"T{i}" for i in range(10)]
+    (data_dir / "user_settings.json").write_text(json.dumps({"user_stocks": tickers}), encoding="utf-8")
+    utils.__file__ = str(dummy_file)
+
+    def fake_get(url: str, headers: Any = None, params: Any = None) -> MagicMock:
+        time.sleep(0.2)
+        if params["ticker"] == "T3":
+            raise ConnectionError("нет соединения")
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = {"price": float(params["ticker"][1:])}
+        return response
+
+    mock_get.side_effect = fake_get
+
+    started = time.monotonic()
+    result = get_sp500_quotes("2025-10-22", max_workers=10)
+    elapsed = time.monotonic() - started
+
+    assert [s["stock"] for s in result["stock_prices"]] == tickers
+    assert result["stock_prices"][3]["price"] is None
+    assert result["stock_prices"][5]["price"] == 5.0
+    assert elapsed < 1.0
+
+
+def _write_settings(tmp_path: Any, settings: dict) -> None:
+    # Временные src/ и data/user_settings.json, на которые указывает utils.__file__
+    src_dir = tmp_path / "src"
+    data_dir = tmp_path / "data"
+    src_dir.mkdir()
+    data_dir.mkdir()
+    dummy_file = src_dir / "utils.py"
+    dummy_file.write_text("")
+    (data_dir / "user_settings.json").write_text(json.dumps(settings), encoding="utf-8")
+    utils.__file__ = str(dummy_file)
+
+
+@patch("src.utils.http_get")
+def test_get_exchange_rates_cached(mock_get: Mock, tmp_path: Any, api_cache: Any) -> None:
+    # Курсы за прошедшую дату повторно не запрашиваются.
+
+    _write_settings(tmp_path, {"user_currencies": ["USD", "EUR"]})
+    mock_response = MagicMock()
+    mock_response.json.return_value = {"rates": {"USD": 0.0137, "EUR": 0.0115}}
+    mock_get.return_value = mock_response
+
+    first = utils.get_exchange_rates("20-05-2019")
+    second = utils.get_exchange_rates("20-05-2019")
+
+    assert first == second
+    mock_get.assert_called_once()
+    assert api_cache.stats()["hits"] == 2
+
+
+@patch("src.utils.http_get")
+def test_get_sp500_quotes_cached(mock_get: Mock, tmp_path: Any, api_cache: Any) -> None:
+    # Исторические цены кэшируются бессрочно, текущие — с коротким TTL.
+
+    _write_settings(tmp_path, {"user_stocks": ["AAPL", "AMZN"]})
+
+    def fake_get(url: str, headers: Any = None, params: Any = None) -> MagicMock:
+        response = MagicMock()
+        if params["ticker"] == "AAPL":
+            response.status_code = 200
+            response.json.return_value = [{"close": 183.09}]
+        else:
+            response.status_code = 400 if url == utils.STOCK_HISTORY_URL else 200
+            response.json.return_value = {"price": 217.95}
+        return response
+
+    mock_get.side_effect = fake_get
+
+    first = get_sp500_quotes("2019-05-20")
+    calls = mock_get.call_count
+    second = get_sp500_quotes("2019-05-20")
+
+    assert first == second
+    assert mock_get.call_count == calls
+    with api_cache._connection:
+        rows = dict(api_cache._connection.execute("SELECT symbol, expires_at FROM api_cache").fetchall())
+    assert rows["AAPL"] is None
+    assert rows["AMZN"] is not None
+
+
+@patch("src.utils.http_get")
+def test_get_exchange_rates_batch(mock_get: Mock, tmp_path: Any) -> None:
+    # Курсы на несколько дат получаются одним запросом и затем берутся из кэша.
+
+    _write_settings(tmp_path, {"user_currencies": ["USD", "EUR"]})
+    mock_response = MagicMock()
+    mock_response.json.return_value = {
+        "rates": {
+            "2019-05-20": {"USD": 0.0155, "EUR": 0.0139},
+            "2019-05-21": {"USD": 0.0156, "EUR": 0.0140},
+            "2019-05-22": {"USD": 0.0157, "EUR": 0.0141},
+        }
+    }
+    mock_get.return_value = mock_response
+
+    table = utils.get_exchange_rates_batch(["20.05.2019", "2019-05-22", "21-05-2019"])
+
+    mock_get.assert_called_once()
+    assert "timeseries" in mock_get.call_args[0][0]
+    assert mock_get.call_args[1]["params"]["start_date"] == "2019-05-20"
+    assert mock_get.call_args[1]["params"]["end_date"] == "2019-05-22"
+    assert list(table.columns) == ["USD", "EUR"]
+    assert table.loc["2019-05-21", "USD"] == pytest.approx(64.10, abs=0.005)
+
+    # Повторные запросы обслуживаются из таблицы курсов
+    assert utils.get_exchange_rates("21.05.2019")["currency_rates"][0] == {"currency": "USD", "rate": 64.1}
+    utils.get_exchange_rates_batch(["2019-05-20", "2019-05-22"])
+    mock_get.assert_called_once()
+
+
+@patch("src.utils.http_get")
+def test_get_exchange_rates_batch_long_range(mock_get: Mock) -> None:
+    # Период длиннее года разбивается на несколько запросов.
+
+    mock_response = MagicMock()
+    mock_response.json.return_value = {"rates": {}}
+    mock_get.return_value = mock_response
+
+    table = utils.get_exchange_rates_batch(["2019-01-01", "2019-06-01", "2020-03-01"], currencies=["USD"])
+
+    assert mock_get.call_count == 2
+    assert len(table) == 3
+    assert table["USD"].isna().all()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5])
+def test_summaries_chunked(sample_df: pd.DataFrame, chunk_size: int) -> None:
+    # Агрегация по частям совпадает с агрегацией всего DataFrame.
+
+    df = pd.concat([sample_df, sample_df.assign(**{"Категория": ["Зарплата", "Переводы", "Наличные"]})])
+    df = df.astype({"Сумма операции": float}).reset_index(drop=True)
+    chunks = [chunk for _, chunk in df.groupby(df.index // chunk_size)]
+
+    assert utils.get_expenses_summary_chunked(chunks) == get_expenses_summary(df)
+    assert utils.get_incomes_summary_chunked(chunks) == get_incomes_summary(df)
+
+
+def test_summaries_chunked_error() -> None:
+    # Ошибка в части данных — пустой результат.
+
+    assert utils.get_expenses_summary_chunked([pd.DataFrame()])["expenses"]["Общая сумма"] == 0.0
+    assert utils.get_incomes_summary_chunked([pd.DataFrame()])["incomes"]["Общая сумма"] == 0.0
+
+
+@pytest.mark.parametrize("range_type", ["W", "M", "Y", "ALL", "UNKNOWN"])
+@pytest.mark.parametrize("date_str", ["04.01.2018", "2018-01-04 14:30:00", "31.12.2018", "2017-12-01", "не дата"])
+def test_get_range_summaries(transactions: list, range_type: str, date_str: str) -> None:
+    # Сводки по сводной таблице совпадают со сводками по отфильтрованным строкам,
+    # включая неполные дни на границах диапазона.
+
+    store = TransactionStore(pd.DataFrame(transactions))
+    df_filtered = filter_by_range(store, date_str, range_type)
+
+    expected = (get_expenses_summary(df_filtered), get_incomes_summary(df_filtered))
+    assert utils.get_range_summaries(store, date_str, range_type) == expected
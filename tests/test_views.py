@@ -1,23 +1,36 @@
+import asyncio
 import json
+import time
+from datetime import datetime
+from typing import Any, Callable, Tuple
 from unittest.mock import Mock, patch
 
 import pandas as pd
+import pytest
 
-from src.views import get_events
+from src import utils
+from src.api_cache import SHORT_TTL
+from src.store import TransactionStore
+from src.utils import get_range_summaries
+from src.views import (
+    CACHE_LOCAL,
+    CACHE_NONE,
+    EventsCache,
+    clear_events_cache,
+    events_cache,
+    get_events,
+    get_events_async,
+)
 
 # Успешный сценарий
 
 
-@patch("src.views.pd.read_excel")
+@patch("src.store.read_operations")
 @patch("src.views.get_exchange_rates")
 @patch("src.views.get_sp500_quotes")
-@patch("src.views.get_expenses_summary")
-@patch("src.views.get_incomes_summary")
-@patch("src.views.filter_by_range")
+@patch("src.views.get_range_summaries")
 def test_get_events_success(
-    mock_filter_by_range: Mock,
-    mock_get_incomes_summary: Mock,
-    mock_get_expenses_summary: Mock,
+    mock_get_range_summaries: Mock,
     mock_get_sp500_quotes: Mock,
     mock_get_exchange_rates: Mock,
     mock_read_excel: Mock,
@@ -34,11 +47,12 @@ def test_get_events_success(
         }
     )
     mock_read_excel.return_value = df
-    mock_filter_by_range.return_value = df
 
     # Возвращаем предопределённые данные из зависимостей
-    mock_get_incomes_summary.return_value = {"incomes": {"Общая сумма": 100, "Основные": {"Зарплата": 100}}}
-    mock_get_expenses_summary.return_value = {"expenses": {"Общая сумма": 50, "Основные": {"Еда": 50}}}
+    mock_get_range_summaries.return_value = (
+        {"expenses": {"Общая сумма": 50, "Основные": {"Еда": 50}}},
+        {"incomes": {"Общая сумма": 100, "Основные": {"Зарплата": 100}}},
+    )
     mock_get_exchange_rates.return_value = {"currency_rates": [{"currency": "USD", "rate": 74.2}]}
     mock_get_sp500_quotes.return_value = {"stock_prices": [{"stock": "AAPL", "price": 150.0}]}
 
@@ -60,7 +74,7 @@ def test_get_events_success(
 # НЕ УДАЛОСЬ ПРОЧИТАТЬ EXCEL
 
 
-@patch("src.views.pd.read_excel", side_effect=FileNotFoundError("Нет файла"))
+@patch("src.store.read_operations", side_effect=FileNotFoundError("Нет файла"))
 def test_get_events_excel_not_found(mock_read_excel: Mock) -> None:
     # Тест — Excel не найден.
 
@@ -73,12 +87,12 @@ def test_get_events_excel_not_found(mock_read_excel: Mock) -> None:
 # ОШИБКА ВО ВРЕМЯ ПОЛУЧЕНИЯ ЗНАЧЕНИЙ ИЗ API
 
 
-@patch("src.views.pd.read_excel")
-@patch("src.views.filter_by_range")
+@patch("src.store.read_operations")
+@patch("src.views.get_sp500_quotes")
 @patch("src.views.get_exchange_rates", side_effect=Exception("Ошибка API"))
 def test_get_events_error_in_exchange_api(
     mock_get_ex: Mock,
-    mock_filter_by_range: Mock,
+    mock_get_sp500_quotes: Mock,
     mock_read_excel: Mock,
 ) -> None:  # Тест — исключение при получении курсов валют.
 
@@ -86,9 +100,292 @@ def test_get_events_error_in_exchange_api(
         {"Дата операции": ["2025-10-01"], "Сумма операции": [100], "Категория": ["Зарплата"], "Статус": ["OK"]}
     )
     mock_read_excel.return_value = df
-    mock_filter_by_range.return_value = df
 
     result_str = get_events("2025-10-22")
     result = json.loads(result_str)
     assert "error" in result
     assert "Ошибка API" in result["error"]
+
+
+# ПАРАЛЛЕЛЬНОЕ ВЫПОЛНЕНИЕ
+
+
+def _slow(value: dict) -> Callable[..., dict]:
+    def wrapper(*args: Any) -> dict:
+        time.sleep(0.3)
+        return value
+
+    return wrapper
+
+
+def _delayed(func: Callable[..., Any]) -> Callable[..., Any]:
+    def wrapper(*args: Any) -> Any:
+        time.sleep(0.3)
+        return func(*args)
+
+    return wrapper
+
+
+@patch("src.views.get_sp500_quotes", side_effect=_slow({"stock_prices": []}))
+@patch("src.views.get_exchange_rates", side_effect=_slow({"currency_rates": []}))
+@patch("src.views.get_range_summaries", side_effect=_delayed(get_range_summaries))
+def test_get_events_parallel(
+    mock_expenses: Mock, mock_rates: Mock, mock_quotes: Mock, sample_df: pd.DataFrame
+) -> None:
+    # Запросы к API выполняются одновременно с локальной агрегацией.
+
+    store = TransactionStore(sample_df.astype({"Сумма операции": float}))
+    started = time.monotonic()
+    result = json.loads(get_events("2025-10-02", "M", store=store))
+    elapsed = time.monotonic() - started
+
+    assert result["Поступления"]["incomes"]["Общая сумма"] == 1000.0
+    assert elapsed < 0.6
+
+
+@patch("src.views.get_sp500_quotes", side_effect=_slow({"stock_prices": []}))
+@patch("src.views.get_exchange_rates", side_effect=_slow({"currency_rates": [{"currency": "USD", "rate": 74.2}]}))
+def test_get_events_async(mock_rates: Mock, mock_quotes: Mock, sample_df: pd.DataFrame) -> None:
+    # Асинхронный вариант возвращает тот же результат.
+
+    store = TransactionStore(sample_df.astype({"Сумма операции": float}))
+    started = time.monotonic()
+    result = asyncio.run(get_events_async("2025-10-02", "M", store=store))
+    elapsed = time.monotonic() - started
+
+    assert result == get_events("2025-10-02", "M", store=store)
+    assert elapsed < 0.6
+
+
+def slow_rates(date_str: str) -> dict:
+    time.sleep(1)
+    return {"currency_rates": [{"currency": "USD", "rate": 80.0}]}
+
+
+async def timed_events_async(*args: Any, **kwargs: Any) -> Tuple[float, str]:
+    # Время внутри цикла событий: asyncio.run при выходе дожидается потоков пула
+    started = time.monotonic()
+    result = await get_events_async(*args, **kwargs)
+    return time.monotonic() - started, result
+
+
+@patch("src.views.EVENTS_TIMEOUT", 0.2)
+@patch("src.views.get_sp500_quotes", return_value={"stock_prices": [{"stock": "AAPL", "price": 150.0}]})
+@patch("src.views.get_exchange_rates", side_effect=slow_rates)
+def test_get_events_api_deadline(mock_rates: Mock, mock_quotes: Mock, sample_df: pd.DataFrame) -> None:
+    # Зависший запрос к API не задерживает ответ дольше EVENTS_TIMEOUT: курсы пустые, ответ не кэшируется.
+
+    store = TransactionStore(sample_df.astype({"Сумма операции": float}))
+    started = time.monotonic()
+    result = get_events("2025-10-02", "M", store=store)
+    elapsed = time.monotonic() - started
+    elapsed_async, result_async = asyncio.run(timed_events_async("2025-10-02", "M", store=store))
+
+    assert elapsed < 0.8 and elapsed_async < 0.8
+    assert result == result_async
+    assert json.loads(result)["Курс валют"] == {"currency_rates": []}
+    assert json.loads(result)["Стоимость акций S&P 500"]["stock_prices"][0]["price"] == 150.0
+    assert mock_rates.call_count == 2
+
+
+@patch("src.store.read_operations", side_effect=FileNotFoundError("Нет файла"))
+def test_get_events_async_excel_not_found(mock_read_operations: Mock) -> None:
+    # Ошибка загрузки в асинхронном варианте.
+
+    result = json.loads(asyncio.run(get_events_async("2025-10-22")))
+    assert "Нет файла" in result["error"]
+
+
+# КЭШ СТРАНИЦЫ «СОБЫТИЯ»
+
+RATES = {"currency_rates": [{"currency": "USD", "rate": 80.0}]}
+QUOTES = {"stock_prices": [{"stock": "AAPL", "price": 150.0}]}
+
+
+@patch("src.views.get_sp500_quotes", return_value=QUOTES)
+@patch("src.views.get_exchange_rates", return_value=RATES)
+def test_get_events_cached(mock_rates: Mock, mock_quotes: Mock, sample_df: pd.DataFrame) -> None:
+    # Повторный запрос с той же датой (в любом формате) отдается из кэша.
+
+    store = TransactionStore(sample_df.astype({"Сумма операции": float}))
+    first = get_events("2025-10-02", "M", store=store)
+
+    assert get_events("02.10.2025", "M", store=store) == first
+    assert mock_rates.call_count == 1
+    assert mock_quotes.call_count == 1
+
+    # Другой диапазон и другие данные — новый расчет
+    get_events("2025-10-02", "Y", store=store)
+    get_events("2025-10-02", "M", store=TransactionStore(sample_df.astype({"Сумма операции": float})))
+    assert mock_rates.call_count == 3
+
+
+@pytest.mark.parametrize(
+    "rates, quotes",
+    [
+        ({"currency_rates": []}, QUOTES),
+        (RATES, {"stock_prices": []}),
+        (RATES, {"stock_prices": [{"stock": "AAPL", "price": None}]}),
+    ],
+    ids=["no_rates", "no_quotes", "no_price"],
+)
+def test_get_events_incomplete_not_cached(rates: dict, quotes: dict, sample_df: pd.DataFrame) -> None:
+    # Ответ с пустыми курсами или котировками (сбой API) целиком не запоминается, сводки — запоминаются.
+
+    store = TransactionStore(sample_df.astype({"Сумма операции": float}))
+    with patch("src.views.get_exchange_rates", return_value=rates) as mock_rates, patch(
+        "src.views.get_sp500_quotes", return_value=quotes
+    ), patch("src.views.get_range_summaries", side_effect=get_range_summaries) as mock_summaries:
+        get_events("2025-10-02", "M", store=store)
+        get_events("2025-10-02", "M", store=store)
+
+    assert mock_rates.call_count == 2
+    assert mock_summaries.call_count == 1
+    assert events_cache.info()["size"] == 1
+
+
+@patch("src.views.SHORT_TTL", -1)
+@patch("src.views.get_range_summaries", side_effect=get_range_summaries)
+@patch("src.views.get_sp500_quotes", return_value=QUOTES)
+@patch("src.views.get_exchange_rates", return_value=RATES)
+def test_get_events_cache_expires(
+    mock_rates: Mock, mock_quotes: Mock, mock_summaries: Mock, sample_df: pd.DataFrame
+) -> None:
+    # Весь ответ хранится не дольше SHORT_TTL (за текущий и за прошедшие дни), сводки — без срока.
+
+    store = TransactionStore(sample_df.astype({"Сумма операции": float}))
+    for date_str in (datetime.now().strftime("%Y-%m-%d"), "2025-10-02"):
+        get_events(date_str, "M", store=store)
+        get_events(date_str, "M", store=store)
+    assert mock_rates.call_count == 4
+    assert mock_summaries.call_count == 2
+
+
+def test_get_events_current_price_fallback_expires(sample_df: pd.DataFrame) -> None:
+    # Для прошедшей даты без исторической котировки в ответе текущая цена:
+    # после SHORT_TTL ответ собирается заново с новой текущей ценой.
+
+    prices = iter([150.0, 160.0])
+
+    def fake_get(url: str, **kwargs: Any) -> Mock:
+        if url == utils.STOCK_HISTORY_URL:
+            return Mock(status_code=400)
+        response = Mock(status_code=200)
+        response.json.return_value = {"price": next(prices)}
+        return response
+
+    store = TransactionStore(sample_df.astype({"Сумма операции": float}))
+    now = time.time()
+    with patch("src.utils.http_get", side_effect=fake_get), patch(
+        "src.utils.load_user_settings", return_value={"user_stocks": ["AAPL"]}
+    ), patch("src.views.get_exchange_rates", return_value=RATES):
+        first = json.loads(get_events("2025-10-02", "M", store=store))
+        assert json.loads(get_events("2025-10-02", "M", store=store)) == first
+        with patch("time.time", return_value=now + SHORT_TTL + 1):
+            second = json.loads(get_events("2025-10-02", "M", store=store))
+
+    assert first["Стоимость акций S&P 500"]["stock_prices"] == [{"stock": "AAPL", "price": 150.0}]
+    assert second["Стоимость акций S&P 500"]["stock_prices"] == [{"stock": "AAPL", "price": 160.0}]
+
+
+@patch("src.views.settings_version")
+@patch("src.views.get_sp500_quotes", return_value=QUOTES)
+@patch("src.views.get_exchange_rates", return_value=RATES)
+def test_get_events_cache_settings_version(
+    mock_rates: Mock, mock_quotes: Mock, mock_version: Mock, sample_df: pd.DataFrame
+) -> None:
+    # Изменение настроек делает ответ из кэша неактуальным.
+
+    store = TransactionStore(sample_df.astype({"Сумма операции": float}))
+    mock_version.return_value = (1, 10)
+    get_events("2025-10-02", "M", store=store)
+    get_events("2025-10-02", "M", store=store)
+    mock_version.return_value = (2, 10)
+    get_events("2025-10-02", "M", store=store)
+
+    assert mock_rates.call_count == 2
+
+
+@patch("src.views.get_range_summaries", side_effect=get_range_summaries)
+@patch("src.views.get_sp500_quotes", return_value={"stock_prices": []})
+@patch("src.views.get_exchange_rates", return_value={"currency_rates": []})
+def test_get_events_cache_local(
+    mock_rates: Mock, mock_quotes: Mock, mock_summaries: Mock, sample_df: pd.DataFrame
+) -> None:
+    # В режиме CACHE_LOCAL сводки берутся из кэша, курсы и котировки запрашиваются заново.
+
+    store = TransactionStore(sample_df.astype({"Сумма операции": float}))
+    first = get_events("2025-10-02", "M", store=store, cache_mode=CACHE_LOCAL)
+    second = asyncio.run(get_events_async("2025-10-02", "M", store=store, cache_mode=CACHE_LOCAL))
+
+    assert first == second
+    assert mock_summaries.call_count == 1
+    assert mock_rates.call_count == 2
+    assert mock_quotes.call_count == 2
+
+
+@patch("src.views.get_sp500_quotes", return_value=QUOTES)
+@patch("src.views.get_exchange_rates", return_value=RATES)
+def test_get_events_cache_disabled_and_cleared(mock_rates: Mock, mock_quotes: Mock, sample_df: pd.DataFrame) -> None:
+    # Без кэша и после очистки ответ рассчитывается заново.
+
+    store = TransactionStore(sample_df.astype({"Сумма операции": float}))
+    get_events("2025-10-02", "M", store=store, cache_mode=CACHE_NONE)
+    get_events("2025-10-02", "M", store=store)
+    clear_events_cache()
+    get_events("2025-10-02", "M", store=store)
+
+    assert mock_rates.call_count == 3
+    assert events_cache.info()["size"] == 2
+
+
+@patch("src.views.get_sp500_quotes", return_value={"stock_prices": []})
+@patch("src.views.get_exchange_rates", side_effect=Exception("Ошибка API"))
+def test_get_events_errors_not_cached(mock_rates: Mock, mock_quotes: Mock, sample_df: pd.DataFrame) -> None:
+    # Ответ с ошибкой не запоминается.
+
+    store = TransactionStore(sample_df.astype({"Сумма операции": float}))
+    get_events("2025-10-02", "M", store=store)
+    get_events("2025-10-02", "M", store=store)
+
+    assert mock_rates.call_count == 2
+
+
+def test_events_cache_bounded() -> None:
+    # Самые давно использованные записи вытесняются.
+
+    cache = EventsCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.info() == {"size": 2, "maxsize": 2, "hits": 2, "misses": 1}
+
+
+def test_events_cache_ttl() -> None:
+    # Устаревшие записи не отдаются и удаляются.
+
+    cache = EventsCache()
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=-1)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.info()["size"] == 1
+
+
+@patch("src.views.get_sp500_quotes", return_value={"stock_prices": []})
+@patch("src.views.get_exchange_rates", return_value={"currency_rates": []})
+def test_get_events_json_mode(mock_rates: Mock, mock_quotes: Mock, sample_df: pd.DataFrame) -> None:
+    # Режим сериализации входит в ключ кэша: компактный ответ не подменяет форматированный.
+
+    store = TransactionStore(sample_df.astype({"Сумма операции": float}))
+    pretty = get_events("2025-10-02", "M", store=store)
+    compact = get_events("2025-10-02", "M", store=store, json_mode="compact")
+
+    assert "\n" not in compact
+    assert json.loads(compact) == json.loads(pretty)
+    assert get_events("2025-10-02", "M", store=store) == pretty